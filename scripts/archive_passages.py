@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+
+from tqdm import tqdm
+
+from ucca.archive import Archive, write_archive, SUFFIX
+from ucca.ioutil import get_passages_with_progress_bar, write_passage, external_write_mode
+
+desc = """Packs passage files and directories into a single archive file with random access by passage ID,
+or unpacks an archive into a directory of passage files."""
+
+
+def pack(args):
+    with external_write_mode():
+        print("Writing archive '%s'..." % args.archive, file=sys.stderr)
+    passage_ids = write_archive(get_passages_with_progress_bar(args.filenames, desc="Packing"), args.archive)
+    with external_write_mode():
+        print("Wrote %d passages." % len(passage_ids), file=sys.stderr)
+
+
+def unpack(args):
+    with Archive(args.archive) as archive:
+        passage_ids = args.ids or list(archive)
+        for passage_id in tqdm(passage_ids, desc="Unpacking", unit=" passages"):
+            write_passage(archive[passage_id], output_format=args.format,
+                          binary=args.binary or args.format == "pickle", outdir=args.outdir, prefix=args.prefix,
+                          verbose=args.verbose)
+
+
+def main(args):
+    if args.unpack:
+        unpack(args)
+    else:
+        if os.path.splitext(args.archive)[1] != SUFFIX:
+            print("Warning: archive file name does not have the '%s' suffix" % SUFFIX, file=sys.stderr)
+        pack(args)
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser(description=desc)
+    argparser.add_argument("archive", help="archive file name to write (or to read, with --unpack)")
+    argparser.add_argument("filenames", nargs="*", help="passage file names or directories to pack")
+    argparser.add_argument("-u", "--unpack", action="store_true", help="unpack the archive rather than packing")
+    argparser.add_argument("-i", "--ids", nargs="+", help="IDs of passages to unpack (default: all)")
+    argparser.add_argument("-o", "--outdir", default=".", help="output directory for unpacking")
+    argparser.add_argument("-p", "--prefix", default="", help="output filename prefix for unpacking")
+    argparser.add_argument("-b", "--binary", action="store_true", help="unpack in pickle binary format (.pickle)")
+    argparser.add_argument("-f", "--format", choices=("xml", "pickle", "frozen"),
+                           help="output format for unpacking (default: xml, or pickle with --binary)")
+    argparser.add_argument("-v", "--verbose", action="store_true", help="verbose output")
+    parsed_args = argparser.parse_args()
+    if not parsed_args.unpack and not parsed_args.filenames:
+        argparser.error("passage file names or directories to pack are required")
+    main(parsed_args)
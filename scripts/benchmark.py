@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+import argparse
+import gc
+import io
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from ucca import archive as archive_, convert, frozen as frozen_, layer1, textutil, validation
+from ucca.ioutil import file2passage, gen_files, read_files_and_dirs, write_passage
+
+desc = """Benchmarks the time and memory used by core UCCA operations on the given passage files."""
+
+
+def memory(filenames, repeat):
+    """Measures the memory held by loaded passages, per node."""
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    passages = [file2passage(filename) for _ in range(repeat) for filename in filenames]
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_nodes = sum(len(passage.nodes) for passage in passages)
+    num_edges = sum(len(node) for passage in passages for node in passage.nodes.values())
+    print("Loaded %d nodes and %d edges in %d passages" % (num_nodes, num_edges, len(passages)))
+    print("Memory: %d bytes, %.1f bytes per node" % (end - start, (end - start) / max(num_nodes, 1)))
+
+
+def terminals(filenames, repeat):
+    """Measures the time taken by repeated span queries on all foundational nodes."""
+    passages = [file2passage(filename) for filename in filenames]
+    nodes = [node for passage in passages for node in passage.layer(layer1.LAYER_ID).all
+             if node.tag == layer1.NodeTags.Foundational]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for node in nodes:
+            node.get_terminals(punct=False)
+            node.start_position, node.end_position, node.discontiguous
+    print("Queried %d nodes %d times: %.3fs" % (len(nodes), repeat, time.perf_counter() - start))
+
+
+def copy(filenames, repeat):
+    """Measures the time taken to copy passages, compared to an XML round-trip."""
+    passages = [file2passage(filename) for filename in filenames]
+    for name, clone in (("Passage.copy", lambda p: p.copy()),
+                        ("XML round-trip", lambda p: convert.from_standard(convert.to_standard(p)))):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for passage in passages:
+                clone(passage)
+        print("%s: %.3fs for %d passages" % (name, time.perf_counter() - start, repeat * len(passages)))
+
+
+def validate(filenames, repeat):
+    """Measures the time taken to validate passages, which visits every node and edge."""
+    passages = [file2passage(filename) for filename in filenames]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for passage in passages:
+            list(validation.validate(passage))
+    print("Validated %d passages: %.3fs" % (repeat * len(passages), time.perf_counter() - start))
+
+
+def frozen(filenames, repeat):
+    """Measures the memory held by frozen passages, compared to loaded passages, and the time to freeze and thaw."""
+    for name, load in (("Passage", file2passage), ("FrozenPassage", lambda f: frozen_.freeze(file2passage(f)))):
+        gc.collect()
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        passages = [load(filename) for _ in range(repeat) for filename in filenames]
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        num_nodes = sum(len(passage.node_tag if name == "FrozenPassage" else passage.nodes) for passage in passages)
+        print("%s: %d bytes, %.1f bytes per node" % (name, end - start, (end - start) / max(num_nodes, 1)))
+    passages = [file2passage(filename) for filename in filenames]
+    frozen_passages = [frozen_.freeze(passage) for passage in passages]
+    for name, convert_passage, inputs in (("freeze", frozen_.freeze, passages),
+                                          ("thaw", frozen_.FrozenPassage.thaw, frozen_passages)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for passage in inputs:
+                convert_passage(passage)
+        print("%s: %.3fs for %d passages" % (name, time.perf_counter() - start, repeat * len(inputs)))
+
+
+def load(filenames, repeat):
+    """Measures the time and peak memory of reading standard XML files, by element tree, by streaming and after
+    converting them to the compact binary format, both as passages and as frozen passages."""
+    filenames = [filename for filename in filenames if filename.endswith(".xml")]
+    with tempfile.TemporaryDirectory() as tmp:
+        compact_filenames = []
+        for filename in filenames:
+            compact_filenames.append(os.path.join(tmp, str(len(compact_filenames)) + frozen_.SUFFIX))
+            frozen_.save(file2passage(filename), compact_filenames[-1])
+        for name, read, inputs in (("element tree", lambda f: convert.from_standard(ET.parse(f).getroot()), filenames),
+                                   ("streaming", convert.from_standard_file, filenames),
+                                   ("compact", file2passage, compact_filenames),
+                                   ("compact frozen", frozen_.load, compact_filenames)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for filename in inputs:
+                    read(filename)
+            duration = time.perf_counter() - start
+            tracemalloc.start()
+            for filename in inputs:
+                read(filename)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print("%s: %.3fs for %d passages, peak memory %d bytes" % (name, duration, repeat * len(inputs), peak))
+
+
+def save(filenames, repeat):
+    """Measures the time and peak memory of writing passages as indented standard XML, by element tree and directly."""
+    passages = [file2passage(filename) for filename in filenames]
+    for name, write in (("element tree", lambda p, f: f.write(textutil.indent_xml(
+                            ET.tostring(convert.to_standard(p)).decode()))),
+                        ("streaming", convert.write_standard)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for passage in passages:
+                write(passage, io.StringIO())
+        duration = time.perf_counter() - start
+        tracemalloc.start()
+        for passage in passages:
+            write(passage, io.StringIO())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("%s: %.3fs for %d passages, peak memory %d bytes" % (name, duration, repeat * len(passages), peak))
+
+
+def transfer(filenames, repeat):
+    """Measures the size and the time to serialize and read passages, by pickling and as frozen passage buffers."""
+    passages = [file2passage(filename) for filename in filenames]
+    frozen_passages = [frozen_.freeze(passage) for passage in passages]
+    for name, inputs, dump, load in (
+            ("pickle", passages, lambda p: pickle.dumps(p, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+            ("frozen", frozen_passages, frozen_.FrozenPassage.to_bytes, frozen_.FrozenPassage.from_buffer)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            buffers = [dump(passage) for passage in inputs]
+        dumped = time.perf_counter()
+        for _ in range(repeat):
+            for buffer in buffers:
+                load(buffer)
+        print("%s: %d bytes, dump %.3fs, load %.3fs for %d passages" % (
+            name, sum(map(len, buffers)), dumped - start, time.perf_counter() - dumped, repeat * len(inputs)))
+
+
+def archive(filenames, repeat):
+    """Measures the time to read all passages from a directory of files and from a single archive file,
+    and to read one passage by its ID."""
+    passages = list({passage.ID: passage for passage in map(file2passage, filenames)}.values())
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "passages")
+        for passage in passages:
+            write_passage(passage, binary=True, outdir=directory, verbose=False)
+        archive_filename = os.path.join(tmp, "passages" + archive_.SUFFIX)
+        archive_.write_archive(passages, archive_filename)
+        print("directory: %d bytes, archive: %d bytes" % (
+            sum(os.path.getsize(f) for f in gen_files(directory)), os.path.getsize(archive_filename)))
+        passage_id = passages[-1].ID
+        for name, read_all, read_one in (
+                ("directory", lambda: list(read_files_and_dirs(directory)),
+                 lambda: file2passage(os.path.join(directory, passage_id + ".pickle"))),
+                ("archive", lambda: list(read_files_and_dirs(archive_filename)),
+                 lambda: archive_.Archive(archive_filename)[passage_id])):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                read_all()
+            read = time.perf_counter()
+            for _ in range(repeat):
+                read_one()
+            print("%s: all %.3fs for %d passages, by ID %.3fs for %d passages" % (
+                name, read - start, repeat * len(passages), time.perf_counter() - read, repeat))
+
+
+def cache(filenames, repeat):
+    """Measures the time to read standard XML files without a cache, and from a filled cache."""
+    filenames = [filename for filename in filenames if filename.endswith(".xml")]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, kwargs in (("no cache", {}), ("cache", dict(cache_dir=cache_dir))):
+            for filename in filenames:
+                file2passage(filename, **kwargs)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for filename in filenames:
+                    file2passage(filename, **kwargs)
+            print("%s: %.3fs for %d passages" % (name, time.perf_counter() - start, repeat * len(filenames)))
+
+
+BENCHMARKS = {f.__name__: f for f in (memory, terminals, copy, validate, load, save, frozen, transfer, archive, cache)}
+
+
+def main(args):
+    filenames = list(gen_files(args.filenames))
+    for name in args.benchmarks or BENCHMARKS:
+        print("== %s ==" % name)
+        BENCHMARKS[name](filenames, args.repeat)
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser(description=desc)
+    argparser.add_argument("filenames", nargs="+", help="passage file names or directories to benchmark on")
+    argparser.add_argument("-b", "--benchmarks", nargs="+", choices=BENCHMARKS, help="benchmarks to run (default: all)")
+    argparser.add_argument("-r", "--repeat", type=int, default=10, help="number of times to repeat each operation")
+    main(argparser.parse_args())
@@ -1,16 +1,43 @@
 #!/usr/bin/env python3
 
 import argparse
-from collections import Counter
 
+import numpy as np
 import pandas as pd
 
 from ucca import layer0, layer1
+from ucca.frozen import FrozenPassage, freeze
 from ucca.ioutil import get_passages_with_progress_bar
 
 desc = """Prints statistics on UCCA passages"""
 
 
+def count(passage):
+    """Counts the units and edges of a passage, vectorized over the arrays of its frozen form.
+
+    :param passage: Passage or FrozenPassage
+
+    :return: dictionary of column name to count
+    """
+    f = passage if isinstance(passage, FrozenPassage) else freeze(passage)
+    l1 = f.layer(layer1.LAYER_ID)
+    in_l1 = f.node_layer == f.layers.index(l1)
+    edge_parent = f.edge_parent
+    has_l1_parent = np.zeros(len(in_l1), dtype=bool)  # the other Layer 1 nodes are its heads
+    has_l1_parent[f.edge_child[in_l1[edge_parent]]] = True
+    has_remote_parent = np.zeros(len(in_l1), dtype=bool)
+    has_remote_parent[f.edge_child[f.edge_remote]] = True
+    non_terminals = in_l1 & has_l1_parent & (f.span_size > 1)
+    edges = non_terminals[edge_parent]
+    remote = f.edge_remote[edges]
+    return dict(sentences=1, tokens=len(f.layer(layer0.LAYER_ID).all), nodes=int(non_terminals.sum()),
+                discontinuous=int((non_terminals & (f.span_size > 0) &
+                                   (f.span_end - f.span_start + 1 != f.span_size)).sum()),
+                reentrant=int((non_terminals & has_remote_parent).sum()),
+                implicit=int((in_l1 & f.node_implicit).sum()),
+                edges=len(remote), primary=int((~remote).sum()), remote=int(remote.sum()))
+
+
 def main(args):
     df = pd.DataFrame(index=args.directories, columns=["sentences", "tokens", "nodes", "discontinuous", "reentrant",
                                                        "implicit", "edges", "primary", "remote"])
@@ -18,19 +45,8 @@ def main(args):
     for i, directory in enumerate(args.directories):
         row = df.loc[directory]
         for passage in get_passages_with_progress_bar(directory, desc=directory):
-            l1 = passage.layer(layer1.LAYER_ID)
-            non_terminals = [n for n in l1.all if n not in l1.heads and len(n.get_terminals()) > 1]
-            edges = {e for n in non_terminals for e in n}
-            remote_counter = Counter(e.attrib.get("remote", False) for e in edges)
-            row["sentences"] += 1
-            row["tokens"] += len(passage.layer(layer0.LAYER_ID).all)
-            row["nodes"] += len(non_terminals)
-            row["discontinuous"] += sum(1 for n in non_terminals if n.discontiguous)
-            row["reentrant"] += sum(1 for n in non_terminals if any(e.attrib.get("remote") for e in n.incoming))
-            row["edges"] += len(edges)
-            row["primary"] += remote_counter[False]
-            row["remote"] += remote_counter[True]
-            row["implicit"] += sum(1 for n in l1.all if n.attrib.get("implicit"))
+            for column, value in count(passage).items():
+                row[column] += value
 
     # Change to percentages
     df["discontinuous"] *= 100. / df["nodes"]
@@ -25,8 +25,8 @@ def main(args):
         p = core.Passage(args.format % i)
         l0 = layer0.Layer0(p)
         layer1.Layer1(p)
-        for tok in line.split():
-            l0.add_terminal(text=tok, punct=PUNCTUATION.issuperset(tok))
+        tokens = line.split()
+        l0.add_terminals(tokens, [PUNCTUATION.issuperset(tok) for tok in tokens])
         write_passage(p, outdir=args.out_dir, binary=args.binary, verbose=False)
 
 
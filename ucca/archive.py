@@ -0,0 +1,180 @@
+"""Single-file archive of many passages, with random access by passage ID.
+
+A corpus archive holds passages in the compact binary format of
+:mod:`ucca.frozen`, one after the other, followed by an index from passage ID
+to the position of each passage in the file. It replaces a directory of many
+small files, which are slow to list and open on network file systems and with
+cold caches, by a single file that is memory-mapped and read only where needed.
+
+Use :func:`write_archive` to create an archive, and :class:`Archive` to read
+passages from it, either by ID or in order. :func:`ioutil.read_files_and_dirs`
+reads all passages of any archive it is given as an input file.
+
+The layout, with all numbers little-endian, is:
+
+    MAGIC (8 bytes), format version (uint32), reserved (uint32, 0),
+    index offset (uint64), index size (uint64), passages, index
+
+Each passage is stored as written by :meth:`frozen.FrozenPassage.to_bytes`,
+starting at a multiple of 8 bytes from the start of the file. The index is a
+UTF-8 JSON object whose "passages" field lists [ID, offset, size] for each
+passage, in the order they were written, with offset and size in bytes.
+
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+from ucca import frozen
+
+MAGIC = b"\x89UCCA\x1aA\n"
+VERSION = 1
+SUFFIX = ".corpus"
+PREAMBLE = struct.Struct("<8sIIQQ")  # magic, version, reserved, index offset, index size
+ALIGNMENT = frozen.ALIGNMENT
+
+
+class Archive(Mapping):
+    """Read-only mapping from passage ID to the passages in an archive file.
+
+    The file is memory-mapped, and each passage is only read when it is accessed.
+    Getting an item returns a new :class:`core`.Passage, and :meth:`frozen`
+    returns a :class:`frozen.FrozenPassage` reading directly from the mapped file.
+    Iteration is over the passage IDs, in the order the passages were written.
+
+    Attributes:
+        filename: name of the archive file
+
+    """
+
+    def __init__(self, filename):
+        """Opens an archive file for reading.
+
+        :param filename: name of the archive file, as written by :func:`write_archive`
+
+        :raise ValueError: if the file is not an archive, or of a newer version
+        """
+        self.filename = filename
+        with open(filename, "rb") as f:
+            if not is_archive(f.read(len(MAGIC))):
+                raise ValueError("Not a passage archive: '%s'" % filename)
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _, version, _, index_offset, index_size = PREAMBLE.unpack_from(self._buffer)
+            if version > VERSION:
+                raise ValueError("Archive format version %d is newer than the supported version %d" % (
+                    version, VERSION))
+            index = json.loads(self._buffer[index_offset:index_offset + index_size].decode("utf-8"))
+            self._index = {passage_id: (offset, size) for passage_id, offset, size in index["passages"]}
+        except (struct.error, KeyError, TypeError, ValueError) as e:
+            self.close()
+            raise ValueError("Invalid passage archive '%s': %s" % (filename, e)) from e
+
+    def frozen(self, passage_id):
+        """Reads a passage without creating its Node objects.
+
+        The FrozenPassage refers to the mapped file, which stays open as long as it is used,
+        even after the Archive is closed.
+
+        :param passage_id: ID of the passage to read
+
+        :return: a new FrozenPassage
+
+        :raise KeyError: if there is no passage with this ID in the archive
+        """
+        offset, size = self._index[passage_id]
+        return frozen.FrozenPassage.from_buffer(memoryview(self._buffer)[offset:offset + size])
+
+    def passages(self, thaw=True):
+        """Iterates over all passages, in the order they were written.
+
+        :param thaw: whether to return Passage objects rather than FrozenPassage objects
+
+        :return: generator of passages
+        """
+        for passage_id in self._index:
+            yield self[passage_id] if thaw else self.frozen(passage_id)
+
+    def close(self):
+        """Releases the mapped file, unless any FrozenPassage still refers to it."""
+        self._buffer = None
+        self._index = {}
+
+    def __getitem__(self, passage_id):
+        return self.frozen(passage_id).thaw()
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, passage_id):
+        return passage_id in self._index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.filename)
+
+
+def write_archive(passages, filename):
+    """Writes passages to an archive file, one at a time.
+
+    :param passages: iterable of :class:`core`.Passage or :class:`frozen.FrozenPassage` objects, with unique IDs
+    :param filename: name of the file to write, usually with the SUFFIX extension
+
+    :return: list of the IDs of the passages written
+
+    :raise ValueError: if a passage ID repeats, or a passage cannot be written in the binary format,
+            in which case the file is removed
+    """
+    index = []
+    ids = set()
+    try:
+        with open(filename, "wb") as f:
+            f.write(bytes(PREAMBLE.size))  # written again when the index offset is known
+            offset = PREAMBLE.size
+            for passage in passages:
+                if passage.ID in ids:
+                    raise ValueError("Duplicate passage ID in archive: '%s'" % passage.ID)
+                ids.add(passage.ID)
+                data = (passage if isinstance(passage, frozen.FrozenPassage) else frozen.freeze(passage)).to_bytes()
+                f.write(data + bytes(-len(data) % ALIGNMENT))
+                index.append((passage.ID, offset, len(data)))
+                offset += len(data) + (-len(data) % ALIGNMENT)
+            data = json.dumps(dict(passages=index), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            f.write(data)
+            f.seek(0)
+            f.write(PREAMBLE.pack(MAGIC, VERSION, 0, offset, len(data)))
+    except BaseException:  # do not leave an archive without an index
+        os.remove(filename)
+        raise
+    return [passage_id for passage_id, _, _ in index]
+
+
+def is_archive(buffer):
+    """Returns whether a buffer (e.g. the beginning of a file) starts like an archive file.
+
+    :param buffer: bytes-like object
+    """
+    return bytes(buffer[:len(MAGIC)]) == MAGIC
+
+
+def is_archive_file(filename):
+    """Returns whether a file is an archive file, judging by its first bytes.
+
+    :param filename: name of the file to check
+    """
+    try:
+        with open(filename, "rb") as f:
+            return is_archive(f.read(len(MAGIC)))
+    except OSError:
+        return False
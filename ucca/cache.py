@@ -0,0 +1,179 @@
+"""On-disk cache of parsed passages, to avoid parsing the same XML files again.
+
+The cache is a directory of passages in the compact binary format of
+:mod:`ucca.frozen`, each named by a hash of the absolute path, size and
+modification time of the file it was parsed from, and of the UCCA version.
+A file that changes therefore gets a new entry, and the old one is eventually
+evicted. Entries are evicted least recently used first, when the total size
+of the directory exceeds a maximum.
+
+The cache may be used by several processes at once, even on a shared file
+system: each entry is written to a temporary file and renamed, so it appears
+whole or not at all, and an entry that disappears or cannot be read is just
+a miss. No locks are needed.
+
+It is opt-in: :func:`convert.file2passage` uses it when given a cache
+directory, or when the CACHE_DIR_ENV_VAR environment variable is set, and
+:func:`ioutil.read_files_and_dirs` passes its cache directory on.
+
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from logging import warning
+
+from ucca import frozen
+
+CACHE_DIR_ENV_VAR = "UCCA_CACHE_DIR"  # Determines the default cache directory, if set
+CACHE_SIZE_ENV_VAR = "UCCA_CACHE_SIZE"  # Determines the default maximum cache size, in bytes
+DEFAULT_MAX_SIZE = 2 ** 30
+EVICTION_RATIO = 0.9  # Evict down to this fraction of the maximum size, to evict less often
+TEMPORARY_TIMEOUT = 3600  # Seconds after which temporary files left by crashed writers are removed
+TEMPORARY_SUFFIX = ".tmp"
+
+
+class PassageCache:
+    """Directory of parsed passages, keyed by the files they were parsed from.
+
+    Attributes:
+        directory: path of the cache directory, created if it does not exist
+        max_size: maximum total size of the entries, in bytes
+
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        from ucca.__version__ import VERSION  # not at module level, since it runs git
+        self.directory = directory
+        self.max_size = max_size
+        self._version = VERSION
+        os.makedirs(directory, exist_ok=True)
+        self._size = None  # total size at the last eviction, plus the entries this process added since
+
+    def get(self, filename):
+        """Reads a passage parsed from a file earlier, if the file has not changed since.
+
+        :param filename: name of the file the passage was parsed from
+
+        :return: a new Passage, or None if there is no entry for the file as it is now
+        """
+        entry = None
+        try:
+            entry = self._entry(filename)
+            passage = frozen.load_passage(entry)
+            os.utime(entry)  # mark as recently used
+            return passage
+        except OSError:  # no entry, evicted by another process, or no such file
+            return None
+        except ValueError:  # unreadable entry, e.g. written by a newer version of the format
+            self._remove(entry)
+            return None
+
+    def put(self, filename, passage, key=None):
+        """Adds a passage parsed from a file, evicting old entries if the cache is full.
+
+        :param filename: name of the file the passage was parsed from
+        :param passage: Passage parsed from the file
+        :param key: key of the file as returned by :meth:`key` before parsing it, if given;
+                    the passage is not added if the file has changed since
+
+        :return: whether the passage was added
+        """
+        if key is not None and key != self.key(filename):
+            return False
+        try:
+            data = frozen.freeze(passage).to_bytes()
+        except (TypeError, ValueError):  # cannot be written in the binary format
+            return False
+        temporary = None
+        try:
+            fd, temporary = tempfile.mkstemp(suffix=TEMPORARY_SUFFIX, dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary, self._entry(filename))
+        except OSError:  # e.g. the file system is full or read-only, which should not fail reading the passage
+            if temporary is not None:
+                self._remove(temporary)
+            return False
+        if self._size is None or self._size + len(data) > self.max_size:
+            self.evict()
+        else:
+            self._size += len(data)
+        return True
+
+    def key(self, filename):
+        """Returns a string that changes whenever a file or the UCCA version change.
+
+        :param filename: name of the file
+        """
+        stat = os.stat(filename)
+        return json.dumps([os.path.abspath(filename), stat.st_size, stat.st_mtime_ns, self._version, frozen.VERSION])
+
+    def evict(self, max_size=None):
+        """Removes least recently used entries until the total size is at most a fraction of the maximum.
+
+        :param max_size: maximum total size to evict down to, defaults to EVICTION_RATIO of max_size
+        """
+        if max_size is None:
+            max_size = EVICTION_RATIO * self.max_size
+        entries = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.endswith(frozen.SUFFIX):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith(TEMPORARY_SUFFIX) and now - stat.st_mtime > TEMPORARY_TIMEOUT:
+                self._remove(entry.path)
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._size <= max_size:
+                break
+            if self._remove(path):
+                self._size -= size
+
+    def clear(self):
+        """Removes all entries."""
+        self.evict(max_size=0)
+
+    def _entry(self, filename):
+        return os.path.join(self.directory, hashlib.sha1(self.key(filename).encode("utf-8")).hexdigest() +
+                            frozen.SUFFIX)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:  # already removed by another process, or in use
+            return False
+
+
+def get_cache(directory=None):
+    """Returns the cache in a directory, or in the directory set by the CACHE_DIR_ENV_VAR environment variable.
+
+    The maximum size is set by the CACHE_SIZE_ENV_VAR environment variable, in bytes, or DEFAULT_MAX_SIZE.
+    The same PassageCache object is returned for the same directory, to keep track of its size.
+
+    :param directory: path of the cache directory
+
+    :return: PassageCache, or None if no directory is given or set, or if the cache cannot be used
+    """
+    directory = directory or os.environ.get(CACHE_DIR_ENV_VAR)
+    if not directory:
+        return None
+    return _get_cache(os.path.abspath(directory), os.environ.get(CACHE_SIZE_ENV_VAR))
+
+
+@lru_cache(maxsize=None)  # also warns only once per directory and size
+def _get_cache(directory, max_size):
+    try:
+        return PassageCache(directory, int(max_size or DEFAULT_MAX_SIZE))
+    except (OSError, ValueError) as e:  # e.g. the directory cannot be created, which should not fail reading passages
+        warning("Not caching passages in '%s': %s" % (directory, e))
+        return None
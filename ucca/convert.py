@@ -17,11 +17,11 @@ import re
 import sys
 import xml.etree.ElementTree as ET
 import xml.sax.saxutils
-from collections import defaultdict
+from collections import defaultdict, deque
 from itertools import repeat, groupby
 from operator import attrgetter, itemgetter
 
-from ucca import textutil, core, layer0, layer1
+from ucca import textutil, cache, core, frozen, layer0, layer1
 from ucca.layer1 import EdgeTags
 from ucca.normalization import attach_punct, COORDINATED_MAIN_REL
 
@@ -185,7 +185,8 @@ def _from_site_terminals(elem, passage, elem2node):
             created UCCA Nodes which are equivalent. This function updates the
             dictionary by mapping each word wrapper to a UCCA Terminal.
     """
-    layer0.Layer0(passage)
+    l0 = layer0.Layer0(passage)
+    pairs, paragraphs = [], []
     for para_num, paragraph in enumerate(elem.iterfind(
             SiteCfg.Paths.Paragraphs)):
         words = list(paragraph.iter(SiteCfg.Tags.Terminal))
@@ -194,14 +195,16 @@ def _from_site_terminals(elem, passage, elem2node):
             # the list added has only one element, because XML is hierarchical
             wrappers += [x for x in paragraph.iter(SiteCfg.Tags.Unit)
                          if word in list(x)]
-        for word, wrapper in zip(words, wrappers):
-            punct = (wrapper.get(SiteCfg.Attr.ElemTag) == SiteCfg.Types.Punct)
-            text = SiteUtil.unescape(word.text)
-            # Paragraphs start at 1 and enumeration at 0, so add +1 to para_num
-            t = passage.layer(layer0.LAYER_ID).add_terminal(text, punct,
-                                                            para_num + 1)
-            SiteUtil.set_id(word, t.ID)
-            SiteUtil.set_node(wrapper, t, elem2node)
+        pairs += zip(words, wrappers)
+        # Paragraphs start at 1 and enumeration at 0, so add +1 to para_num
+        paragraphs += [para_num + 1] * (len(pairs) - len(paragraphs))
+    terminals = l0.add_terminals(
+        [SiteUtil.unescape(word.text) for word, _ in pairs],
+        [wrapper.get(SiteCfg.Attr.ElemTag) == SiteCfg.Types.Punct for _, wrapper in pairs],
+        paragraphs)
+    for (word, wrapper), t in zip(pairs, terminals):
+        SiteUtil.set_id(word, t.ID)
+        SiteUtil.set_node(wrapper, t, elem2node)
 
 
 def _parse_site_units(elem, parent, passage, groups, elem2node):
@@ -372,8 +375,9 @@ def from_site(elem):
     attrib = elem.find(SiteCfg.Paths.Attrib)
     passage = core.Passage(pid, attrib=None if attrib is None else attrib.attrib)
     elem2node = {}
-    _from_site_terminals(elem, passage, elem2node)
-    _from_site_annotation(elem, passage, elem2node)
+    with passage.bulk_build():
+        _from_site_terminals(elem, passage, elem2node)
+        _from_site_annotation(elem, passage, elem2node)
     return passage
 
 
@@ -603,19 +607,13 @@ def to_standard(passage):
     :return: the root element of the standard XML structure
     """
 
-    # This utility stringifies the Unit's attributes for proper XML
-    # we don't need to escape the character - the serializer of the XML element
-    # will do it (e.g. tostring())
-    def _dumps(dic):
-        return {str(k): str(v) if type(v) in (str, bool) else json.dumps(v) for k, v in dic.items()}
-
     # Utility to add an extra element if exists in the object
     def _add_extra(obj, elem):
-        return obj.extra and ET.SubElement(elem, 'extra', _dumps(obj.extra))
+        return obj.extra and ET.SubElement(elem, 'extra', _dumps_standard(obj.extra))
 
     # Adds attributes element (even if empty)
     def _add_attrib(obj, elem):
-        return ET.SubElement(elem, 'attributes', _dumps(obj.attrib))
+        return ET.SubElement(elem, 'attributes', _dumps_standard(obj.attrib))
 
     root = ET.Element('root', passageID=str(passage.ID), annotationID='0')
     _add_attrib(passage, root)
@@ -636,102 +634,329 @@ def to_standard(passage):
                 _add_attrib(edge, edge_elem)
                 _add_extra(edge, edge_elem)
                 for category in edge:
-                    attrs = {}
-                    if category.tag:
-                        attrs["tag"] = category.tag
-                    if category.slot:
-                        attrs["slot"] = str(category.slot)
-                    if category.layer:
-                        attrs["layer_name"] = category.layer
-                    if category.parent:
-                        attrs["parent_name"] = category.parent
-                    category_elem = ET.SubElement(edge_elem, "category", **attrs)
+                    category_elem = ET.SubElement(edge_elem, "category", _category_standard_attrib(category))
                     _add_extra(category, category_elem)
     return root
 
 
+# This utility stringifies the Unit's attributes for proper XML
+# we don't need to escape the character - the serializer of the XML element
+# will do it (e.g. tostring())
+def _dumps_standard(dic):
+    return {str(k): str(v) if type(v) in (str, bool) else json.dumps(v) for k, v in dic.items()}
+
+
+def _category_standard_attrib(category):
+    attrs = {}
+    if category.tag:
+        attrs["tag"] = category.tag
+    if category.slot:
+        attrs["slot"] = str(category.slot)
+    if category.layer:
+        attrs["layer_name"] = category.layer
+    if category.parent:
+        attrs["parent_name"] = category.parent
+    return attrs
+
+
+# ElementTree writes the attributes of each element sorted by name before Python 3.8, and in their order since
+_SORT_XML_ATTRIBUTES = sys.version_info < (3, 8)
+
+# Entities ElementTree replaces in attribute values besides &, < and >: carriage returns and tabs only since Python 3.9
+_XML_ATTRIB_ENTITIES = {'"': "&quot;", "\n": "&#10;"}
+if sys.version_info >= (3, 9):
+    _XML_ATTRIB_ENTITIES.update({"\r": "&#13;", "\t": "&#09;"})
+
+# Maximal number of elements written to the file at once by write_standard
+_WRITE_BUFFER_SIZE = 1000
+
+
+def write_standard(passage, file, indent=True):
+    """Writes a Passage as standard XML to a text file object, a few elements at a time.
+
+    The output is the same as that of ET.tostring(to_standard(passage)), indented by
+    textutil.indent_xml if indent is True, but neither the element tree nor the
+    whole XML string are created.
+
+    :param passage: the passage to write
+    :param file: text file object to write to
+    :param indent: whether to write each element in its own line, indented by its depth
+    """
+    def _tag(name, attrib, empty=True):
+        items = sorted(attrib.items()) if _SORT_XML_ATTRIBUTES else attrib.items()
+        # escape like the ElementTree serializer does, always quoting with " rather than as quoteattr does
+        return "<" + name + "".join(' %s="%s"' % (k, xml.sax.saxutils.escape(v, _XML_ATTRIB_ENTITIES))
+                                    for k, v in items) + \
+               (" />" if empty else ">")
+
+    def _add_attrib_and_extra(obj, lines):
+        lines.append(_tag('attributes', _dumps_standard(obj.attrib)))
+        if obj.extra:
+            lines.append(_tag('extra', _dumps_standard(obj.extra)))
+
+    tabs = 0
+
+    def _write(lines):
+        nonlocal tabs
+        # ET.tostring escapes any character which is not ASCII, and indent_xml splits the lines between elements
+        text = ("\n" if indent else "").join(lines).encode("ascii", "xmlcharrefreplace").decode("ascii")
+        lines.clear()
+        if not indent:
+            file.write(text)
+            return
+        indented = []
+        for line in text.splitlines():  # the same as in indent_xml
+            if line.startswith('</'):
+                tabs -= 1
+            indented.append(("  " * tabs) + line + '\n')
+            if not (line.endswith('/>') or line.startswith('</')):
+                tabs += 1
+        file.write("".join(indented))
+
+    lines = [_tag('root', {"passageID": str(passage.ID), "annotationID": '0'}, empty=False)]
+    _add_attrib_and_extra(passage, lines)
+    for layer in sorted(passage.layers, key=attrgetter('ID')):
+        lines.append(_tag('layer', {"layerID": layer.ID}, empty=False))
+        _add_attrib_and_extra(layer, lines)
+        for node in layer.all:
+            lines.append(_tag('node', {"ID": node.ID, "type": node.tag}, empty=False))
+            _add_attrib_and_extra(node, lines)
+            for edge in node:
+                lines.append(_tag('edge', {"toID": edge.child.ID, "type": edge.tag}, empty=False))
+                _add_attrib_and_extra(edge, lines)
+                for category in edge:
+                    if category.extra:
+                        lines.append(_tag('category', _category_standard_attrib(category), empty=False))
+                        lines.append(_tag('extra', _dumps_standard(category.extra)))
+                        lines.append('</category>')
+                    else:
+                        lines.append(_tag('category', _category_standard_attrib(category)))
+                lines.append('</edge>')
+            lines.append('</node>')
+            if len(lines) >= _WRITE_BUFFER_SIZE:
+                _write(lines)
+        lines.append('</layer>')
+    lines.append('</root>')
+    _write(lines)
+
+
 def from_standard(root, extra_funcs=None):
+    """Converts a standard XML root element to a Passage object.
+
+    :param root: the root element of the standard XML structure
+    :param extra_funcs: dictionary of extra keys to functions for converting their values from strings
+
+    :return: the Passage object
+    """
+    def _feed(elem):
+        builder.start(elem.tag, elem.attrib)
+        for child in elem:
+            _feed(child)
+        builder.end(elem.tag)
+
+    with _StandardBuilder(extra_funcs=extra_funcs) as builder:
+        _feed(root)
+        return builder.close()
+
+
+def from_standard_file(source, extra_funcs=None):
+    """Reads a standard XML file to a Passage object, without building its element tree.
+
+    The file is parsed incrementally, and the Passage is built from each element as soon as it is parsed.
+
+    :param source: file name or file object of the standard XML file
+    :param extra_funcs: dictionary of extra keys to functions for converting their values from strings
+
+    :return: the Passage object
+    """
+    with _StandardBuilder(extra_funcs=extra_funcs) as builder:
+        return ET.ElementTree().parse(source, parser=ET.XMLParser(target=builder))
+
+
+class _StandardBuilder:
+    """Parser target (see ET.XMLParser) building a Passage from the elements of the standard XML structure.
+
+    Each element is handled when it starts and nothing is kept of it after it ends, except for the edges,
+    which are added in order once all nodes exist, when closed, and for elements preceding the attributes
+    of their parent, which are kept until the attributes are read.
+    As in from_standard, elements other than those of the standard XML structure are ignored, with all of their
+    descendants, but a layer, node or edge directly in the wrong element of the structure is an error.
+    The Passage is built in bulk until closed, so the builder should be used as a context manager,
+    which also finishes building it if parsing fails before that.
+    """
+
+    @staticmethod
     def _str2bool(x):
         return x == "True"
 
-    attribute_converters = {
+    ATTRIBUTE_CONVERTERS = {
         'paragraph': int,
         'paragraph_position': int,
-        'remote': _str2bool,
-        'implicit': _str2bool,
-        'uncertain': _str2bool,
-        'suggest': _str2bool,
+        'remote': _str2bool.__func__,
+        'implicit': _str2bool.__func__,
+        'uncertain': _str2bool.__func__,
+        'suggest': _str2bool.__func__,
         None: str,
     }
 
-    def _loads(x):
-        try:
-            return False if x == "False" else x == "True" or json.loads(x)
-        except JSONDecodeError:
-            return x
-
-    layer_objs = {layer0.LAYER_ID: layer0.Layer0,
+    LAYER_OBJS = {layer0.LAYER_ID: layer0.Layer0,
                   layer1.LAYER_ID: layer1.Layer1}
 
-    node_objs = {layer0.NodeTags.Word: layer0.Terminal,
+    PARENT_TAGS = {"layer": "root", "node": "layer", "edge": "node"}  # the element each must be directly in
+
+    ID_ATTRIBUTES = {"root": "passageID", "layer": "layerID", "node": "ID", "edge": "toID"}  # for error messages
+
+    NODE_OBJS = {layer0.NodeTags.Word: layer0.Terminal,
                  layer0.NodeTags.Punct: layer0.Terminal,
                  layer1.NodeTags.Foundational: layer1.FoundationalNode,
                  layer1.NodeTags.Linkage: layer1.Linkage,
                  layer1.NodeTags.Punctuation: layer1.PunctNode}
 
-    def _get_attrib(elem):
-        try:
-            return {k: attribute_converters.get(k, str)(v)
-                    for k, v in elem.find('attributes').items()}
-        except AttributeError as e:
-            raise core.UCCAError("Element %s has no attributes" % elem.get("ID")) from e
+    def __init__(self, extra_funcs=None):
+        self.extra_funcs = extra_funcs or {}
+        self.passage = None
+        self._bulk_build = None  # context of building the passage in bulk, from its creation until closed
+        self._created_nodes = None  # nodes created automatically with the current layer
+        self._open = []  # [tag, attrib, object created, extra attrib, pending] of each element not ended yet
+        self._pending = None  # (method, arguments) of the calls for the children of an element without attributes
+        self._pending_depth = 0  # depth of the current element under the element whose children are pending
+        self._ignored_depth = 0  # depth of the current element under the outermost element being ignored
+        self._edges = []  # [parent node, child ID, categories, attrib, extra attrib] of each edge, in order
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._finish()
+
+    def _finish(self):
+        """Exits building the Passage in bulk, if it is still being built, whether or not it is complete."""
+        if self._bulk_build is not None:
+            bulk_build, self._bulk_build = self._bulk_build, None
+            bulk_build.__exit__(None, None, None)
 
-    def _add_extra(obj, elem):
-        if elem.find('extra') is not None:
-            for k, v in elem.find('extra').items():
-                obj.extra[k] = (extra_funcs or {}).get(k, _loads)(v)
+    @staticmethod
+    def _loads(x):
+        try:
+            return False if x == "False" else x == "True" or json.loads(x)
+        except JSONDecodeError:
+            return x
 
-    passage = core.Passage(root.get('passageID'), attrib=_get_attrib(root))
-    _add_extra(passage, root)
-    edge_elems = []
-    for layer_elem in root.findall('layer'):
-        layer_id = layer_elem.get('layerID')
-        layer = layer_objs[layer_id](passage, attrib=_get_attrib(layer_elem))
-        _add_extra(layer, layer_elem)
-        # some nodes are created automatically, skip creating them when found
-        # in the XML (they should have 'constant' IDs) but take their edges
-        # and attributes/extra from the XML (may have changed from the default)
-        created_nodes = {x.ID: x for x in layer.all}
-        for node_elem in layer_elem.findall('node'):
-            node_id = node_elem.get('ID')
-            tag = node_elem.get('type')
-            node = created_nodes.get(node_id)
+    def _describe(self, tag, attrib):
+        key = self.ID_ATTRIBUTES[tag]
+        return '%s %s="%s"' % (tag, key, attrib.get(key))
+
+    def _no_attrib(self, tag, attrib):
+        return core.UCCAError("Element %s has no attributes" % self._describe(tag, attrib))
+
+    def _add_extra(self, obj, extra):
+        for k, v in (extra or {}).items():
+            obj.extra[k] = self.extra_funcs.get(k, self._loads)(v)
+
+    def start(self, tag, attrib):
+        if self._pending_depth:
+            self._pending.append((self.start, (tag, attrib)))
+            self._pending_depth += 1
+            return
+        if self._ignored_depth:
+            self._ignored_depth += 1
+            return
+        parent = self._open[-1] if self._open else None
+        obj = None
+        if parent is None:
+            tag = "root"  # whatever its name is, as in from_standard
+        elif parent[0] not in ("root", "layer", "node", "edge"):  # e.g. in attributes or in an unknown element
+            self._ignored_depth = 1
+            return
+        elif tag == "attributes":
+            # only the first attributes element counts
+            if parent[2] is None or parent[0] == "edge" and parent[2][3] is None:
+                self._create(parent, {k: self.ATTRIBUTE_CONVERTERS.get(k, str)(v) for k, v in attrib.items()})
+                pending, parent[4] = parent[4], None
+                for method, args in pending or ():  # the children preceding the attributes
+                    method(*args)
+        elif tag == "extra":
+            if parent[3] is None:
+                parent[3] = attrib
+        elif tag == "category":
+            if parent[0] == "edge":
+                parent[2][2].append((attrib.get('tag'), attrib.get('slot'), attrib.get('layer_name'),
+                                     attrib.get('parent_name')))
+        elif tag in self.PARENT_TAGS:
+            if parent[0] != self.PARENT_TAGS[tag]:
+                raise core.UCCAError("Element %s must be directly in a %s element, not in %s" % (
+                    self._describe(tag, attrib), self.PARENT_TAGS[tag], self._describe(*parent[:2])))
+            if parent[2] is None:  # the attributes of the parent are needed to create it, so wait for them
+                if parent[4] is None:
+                    parent[4] = []
+                self._pending = parent[4]
+                self._pending.append((self.start, (tag, attrib)))
+                self._pending_depth = 1
+                return
+            if tag == "edge":
+                obj = [parent[2], attrib.get('toID'), [], None, None]
+        else:
+            self._ignored_depth = 1
+            return
+        self._open.append([tag, attrib, obj, None, None])
+
+    def _create(self, frame, attrib):
+        tag, elem_attrib = frame[:2]
+        if tag == "root":
+            self.passage = frame[2] = core.Passage(elem_attrib.get('passageID'), attrib=attrib)
+            self._bulk_build = self.passage.bulk_build()
+            self._bulk_build.__enter__()
+        elif tag == "layer":
+            layer = frame[2] = self.LAYER_OBJS[elem_attrib.get('layerID')](self.passage, attrib=attrib)
+            # some nodes are created automatically, skip creating them when found
+            # in the XML (they should have 'constant' IDs) but take their edges
+            # and attributes/extra from the XML (may have changed from the default)
+            self._created_nodes = {x.ID: x for x in layer.all}
+        elif tag == "node":
+            node_id = elem_attrib.get('ID')
+            node_tag = elem_attrib.get('type')
+            node = self._created_nodes.get(node_id)
             if node is None:
-                node = node_objs[tag](root=passage, ID=node_id, tag=tag, attrib=_get_attrib(node_elem))
+                node = self.NODE_OBJS[node_tag](root=self.passage, ID=node_id, tag=node_tag, attrib=attrib)
             else:
-                for key, value in _get_attrib(node_elem).items():
+                for key, value in attrib.items():
                     node.attrib[key] = value
-            _add_extra(node, node_elem)
-            edge_elems += [(node, x) for x in node_elem.findall('edge')]
-
-    # Adding edges (must have all nodes before doing so)
-    for from_node, edge_elem in edge_elems:
-        to_node = passage.nodes[edge_elem.get('toID')]
-        categories_elems = edge_elem.findall('category')
-        categories = []
-        for c in categories_elems:
-            tag = c.get('tag')
-            slot = c.get('slot')
-            layer = c.get('layer_name')
-            parent = c.get('parent_name')
-            categories.append((tag, slot, layer, parent))
-        if not categories:  # an old xml format
-            tag = edge_elem.get('type')
-            categories.append((tag, "", "", ""))
-        edge = from_node.add_multiple(categories, to_node, edge_attrib=_get_attrib(edge_elem))
-        _add_extra(edge, edge_elem)
-
-    return passage
+            frame[2] = node
+        elif tag == "edge":
+            frame[2][3] = attrib
+
+    def end(self, tag):
+        if self._pending_depth:
+            self._pending.append((self.end, (tag,)))
+            self._pending_depth -= 1
+            return
+        if self._ignored_depth:
+            self._ignored_depth -= 1
+            return
+        tag, attrib, obj, extra, _ = self._open.pop()
+        if tag == "edge":
+            if not obj[2]:  # an old xml format
+                obj[2].append((attrib.get('type'), "", "", ""))
+            if obj[3] is None:
+                raise self._no_attrib(tag, attrib)
+            obj[4] = extra
+            self._edges.append(obj)
+        elif tag in ("root", "layer", "node"):
+            if obj is None:
+                raise self._no_attrib(tag, attrib)
+            self._add_extra(obj, extra)
+
+    def close(self):
+        if self.passage is None:
+            raise core.UCCAError("No standard XML root element found")
+        try:
+            # Adding edges (must have all nodes before doing so)
+            for from_node, to_id, categories, attrib, extra in self._edges:
+                edge = from_node.add_multiple(categories, self.passage.nodes[to_id], edge_attrib=attrib)
+                self._add_extra(edge, extra)
+        finally:
+            self._finish()
+        return self.passage
 
 
 def from_text(text, passage_id="1", tokenized=False, one_per_line=False, extra_format=None, lang="en",
@@ -768,8 +993,8 @@ def from_text(text, passage_id="1", tokenized=False, one_per_line=False, extra_f
                 l0 = layer0.Layer0(p)
                 layer1.Layer1(p)
                 paragraph = 1
-            for lex in textutil.get_tokenizer(tokenized, lang=lang)(line):
-                l0.add_terminal(text=lex.orth_, punct=lex.is_punct, paragraph=paragraph)
+            tokens = list(textutil.get_tokenizer(tokenized, lang=lang)(line))
+            l0.add_terminals([lex.orth_ for lex in tokens], [lex.is_punct for lex in tokens], repeat(paragraph))
             paragraph += 1
             passage_lines.append(line)
         if p and (not line or one_per_line):
@@ -909,97 +1134,98 @@ def from_json(lines, *args, skip_category_mapping=False, by_external_id=False, *
         passage_id = external_id
     passage = core.Passage(str(passage_id), attrib=attrib)
 
-    # Create terminals
-    l0 = layer0.Layer0(passage)
-    token_id_to_terminal = {token["id"]: l0.add_terminal(
-        text=token["text"], punct=not token["require_annotation"], paragraph=1)
-        for token in sorted(d["tokens"], key=itemgetter("index_in_task"))}
-
-    # Create non-terminals
-    l1 = layer1.Layer1(passage)
-    tree_id_to_node = {}
-    token_id_to_preterminal = {}
-    category_name_to_edge_tag = {} if skip_category_mapping else EdgeTags.__dict__
-    # Assuming topological sort: parents always appear before children
-    for unit in sorted(d["annotation_units"], key=itemgetter("is_remote_copy")):  # Get non-remotes first
-        tree_id = unit["tree_id"]
-        remote = unit["is_remote_copy"]
-        cloned_from_tree_id = None
-        if remote:
-            cloned_from_tree_id = unit.get("cloned_from_tree_id")
-            if cloned_from_tree_id is None:
-                raise ValueError("Remote unit %s without cloned_from_tree_id" % tree_id)
-        elif tree_id in tree_id_to_node:
-            raise ValueError("Unit %s is repeated" % tree_id)
-        parent_tree_id = unit["parent_tree_id"]
-        if parent_tree_id is None:  # Root node: no need to create
-            tree_id_to_node[tree_id] = None
-            continue
-        try:
-            parent_node = tree_id_to_node[parent_tree_id]
-        except KeyError as e:
-            raise ValueError("Unit %s appears before its parent, %s" % (tree_id, parent_tree_id)) from e
-
-        unit_categories = []
-        for category in unit.get("categories", ()):
+    with passage.bulk_build():
+        # Create terminals
+        l0 = layer0.Layer0(passage)
+        tokens = sorted(d["tokens"], key=itemgetter("index_in_task"))
+        token_id_to_terminal = dict(zip(map(itemgetter("id"), tokens), l0.add_terminals(
+            [token["text"] for token in tokens], [not token["require_annotation"] for token in tokens])))
+
+        # Create non-terminals
+        l1 = layer1.Layer1(passage)
+        tree_id_to_node = {}
+        token_id_to_preterminal = {}
+        category_name_to_edge_tag = {} if skip_category_mapping else EdgeTags.__dict__
+        # Assuming topological sort: parents always appear before children
+        for unit in sorted(d["annotation_units"], key=itemgetter("is_remote_copy")):  # Get non-remotes first
+            tree_id = unit["tree_id"]
+            remote = unit["is_remote_copy"]
+            cloned_from_tree_id = None
+            if remote:
+                cloned_from_tree_id = unit.get("cloned_from_tree_id")
+                if cloned_from_tree_id is None:
+                    raise ValueError("Remote unit %s without cloned_from_tree_id" % tree_id)
+            elif tree_id in tree_id_to_node:
+                raise ValueError("Unit %s is repeated" % tree_id)
+            parent_tree_id = unit["parent_tree_id"]
+            if parent_tree_id is None:  # Root node: no need to create
+                tree_id_to_node[tree_id] = None
+                continue
             try:
-                category_name = category.get("name") or categories[category["id"]]['name']
+                parent_node = tree_id_to_node[parent_tree_id]
             except KeyError as e:
-                raise ValueError("Category missing from layer: " + category["id"]) from e
-            c_tag = category_name_to_edge_tag.get(category_name.replace(" ", ""), category_name.replace(" ", "_"))
-            c_slot = category.get("slot", "")
-            c_data = categories[category["id"]]
-            c_layer = c_data['layer']
-            if c_layer == base_layer:
-                base_slot = c_slot
-            c_parent = c_data['parent']
-            if c_parent:   # make sure it is not empty
-                c_parent = category_name_to_edge_tag.get(c_parent['name'].replace(" ", ""),
-                                                         c_parent['name'].replace(" ", "_"))
-            unit_categories.append((c_tag, c_slot, c_layer, c_parent))
-
-        if not unit_categories:
-            raise ValueError("Unit %s has no categories" % tree_id)
-
-        edge_attrib = {}
-        for unit_category, *_ in unit_categories:
-            if unit_category == EdgeTags.Uncertain:
-                edge_attrib["uncertain"] = True
-            elif unit_category == COORDINATED_MAIN_REL:
-                edge_attrib[COORDINATED_MAIN_REL] = True
-        if not edge_attrib:
-            edge_attrib = None
-        unit_categories = [uc for uc in unit_categories if uc[0] not in IGNORED_ABBREVIATIONS]
-        children_tokens = [] if unit["type"] == "IMPLICIT" else unit["children_tokens"]
-        try:
-            terminal = token_id_to_terminal[children_tokens[0]["id"]] if len(children_tokens) == 1 else None
-        except (IndexError, KeyError):
-            terminal = None
-        if remote:
+                raise ValueError("Unit %s appears before its parent, %s" % (tree_id, parent_tree_id)) from e
+
+            unit_categories = []
+            for category in unit.get("categories", ()):
+                try:
+                    category_name = category.get("name") or categories[category["id"]]['name']
+                except KeyError as e:
+                    raise ValueError("Category missing from layer: " + category["id"]) from e
+                c_tag = category_name_to_edge_tag.get(category_name.replace(" ", ""), category_name.replace(" ", "_"))
+                c_slot = category.get("slot", "")
+                c_data = categories[category["id"]]
+                c_layer = c_data['layer']
+                if c_layer == base_layer:
+                    base_slot = c_slot
+                c_parent = c_data['parent']
+                if c_parent:   # make sure it is not empty
+                    c_parent = category_name_to_edge_tag.get(c_parent['name'].replace(" ", ""),
+                                                             c_parent['name'].replace(" ", "_"))
+                unit_categories.append((c_tag, c_slot, c_layer, c_parent))
+
+            if not unit_categories:
+                raise ValueError("Unit %s has no categories" % tree_id)
+
+            edge_attrib = {}
+            for unit_category, *_ in unit_categories:
+                if unit_category == EdgeTags.Uncertain:
+                    edge_attrib["uncertain"] = True
+                elif unit_category == COORDINATED_MAIN_REL:
+                    edge_attrib[COORDINATED_MAIN_REL] = True
+            if not edge_attrib:
+                edge_attrib = None
+            unit_categories = [uc for uc in unit_categories if uc[0] not in IGNORED_ABBREVIATIONS]
+            children_tokens = [] if unit["type"] == "IMPLICIT" else unit["children_tokens"]
             try:
-                node = tree_id_to_node[cloned_from_tree_id]
-            except KeyError as e:
-                raise ValueError("Remote copy %s refers to nonexistent unit: %s" %
-                                 (tree_id, cloned_from_tree_id)) from e
-            l1.add_remote_multiple(parent_node, unit_categories, node, edge_attrib=edge_attrib)
-        elif not skip_category_mapping and terminal and layer0.is_punct(terminal):
-            tree_id_to_node[tree_id] = l1.add_punct(None, terminal, base_layer, base_slot, edge_attrib=edge_attrib)
-        elif tree_id not in tree_id_to_node:
-            node = tree_id_to_node[tree_id] = l1.add_fnode_multiple(parent_node, unit_categories,
-                                                                    implicit=unit["type"] == "IMPLICIT",
-                                                                    edge_attrib=edge_attrib)
-            node.extra['tree_id'] = tree_id
-            comment = unit.get("comment")
-            if comment:
-                node.extra['remarks'] = comment
-            for token in children_tokens:
-                token_id_to_preterminal[token["id"]] = node
-
-    # Attach terminals to non-terminals
-    for token_id, node in token_id_to_preterminal.items():
-        terminal = token_id_to_terminal[token_id]
-        if skip_category_mapping or not layer0.is_punct(terminal):
-            node.add(EdgeTags.Terminal, terminal)
+                terminal = token_id_to_terminal[children_tokens[0]["id"]] if len(children_tokens) == 1 else None
+            except (IndexError, KeyError):
+                terminal = None
+            if remote:
+                try:
+                    node = tree_id_to_node[cloned_from_tree_id]
+                except KeyError as e:
+                    raise ValueError("Remote copy %s refers to nonexistent unit: %s" %
+                                     (tree_id, cloned_from_tree_id)) from e
+                l1.add_remote_multiple(parent_node, unit_categories, node, edge_attrib=edge_attrib)
+            elif not skip_category_mapping and terminal and layer0.is_punct(terminal):
+                tree_id_to_node[tree_id] = l1.add_punct(None, terminal, base_layer, base_slot, edge_attrib=edge_attrib)
+            elif tree_id not in tree_id_to_node:
+                node = tree_id_to_node[tree_id] = l1.add_fnode_multiple(parent_node, unit_categories,
+                                                                        implicit=unit["type"] == "IMPLICIT",
+                                                                        edge_attrib=edge_attrib)
+                node.extra['tree_id'] = tree_id
+                comment = unit.get("comment")
+                if comment:
+                    node.extra['remarks'] = comment
+                for token in children_tokens:
+                    token_id_to_preterminal[token["id"]] = node
+
+        # Attach terminals to non-terminals
+        for token_id, node in token_id_to_preterminal.items():
+            terminal = token_id_to_terminal[token_id]
+            if skip_category_mapping or not layer0.is_punct(terminal):
+                node.add(EdgeTags.Terminal, terminal)
 
     yield passage
 
@@ -1071,9 +1297,9 @@ def to_json(passage, *args, return_dict=False, tok_task=None, all_categories=Non
                         key=attrgetter("child.ID")), start=1)]
 
         # (tree id elements, edges per child) for each edge
-        queue = _outgoing([], root_node)
+        queue = deque(_outgoing([], root_node))
         while queue:  # breadth-first search
-            tree_id_elements, edges = queue.pop(0)  # edges all have the same child but may differ by category
+            tree_id_elements, edges = queue.popleft()  # edges all have the same child but may differ by category
             edge = edges[0]
             node = edge.child
             remote = edge.attrib.get("remote", False)
@@ -1129,20 +1355,26 @@ def to_json(passage, *args, return_dict=False, tok_task=None, all_categories=Non
     return d if return_dict else json.dumps(d).splitlines()
 
 
-def file2passage(filename):
+def file2passage(filename, cache_dir=None):
     """Opens a file and returns its parsed Passage object
-    Tries to read both as a standard XML file and as a binary pickle
+    Tries to read both as a standard XML file and as a binary pickle,
+    unless it is in the compact binary format (see `ucca.frozen'), recognized by its first bytes
     :param filename: file name to write to
+    :param cache_dir: directory of parsed passages to read unchanged XML files from and to add newly parsed ones to
+                      (see `ucca.cache'), defaults to the directory set by the UCCA_CACHE_DIR environment variable
     """
     methods = [pickle2passage, xml2passage]
     _, ext = os.path.splitext(filename)
     ext = ext.lower()
     if ext == ".xml":
-        del methods[0]
+        passage_cache = cache.get_cache(cache_dir)
+        methods = [xml2passage if passage_cache is None else lambda f: _cached_xml2passage(f, passage_cache)]
+    elif _is_frozen_file(filename):
+        methods = [frozen2passage]
     elif ext == ".pickle":
         del methods[1]
     else:
-        raise IOError("file2passage accepts only 'xml' and 'pickle' files.")
+        raise IOError("file2passage accepts only 'xml', 'pickle' and '%s' files." % frozen.SUFFIX.lstrip("."))
     exception = None
     for method in methods:
         try:
@@ -1155,7 +1387,16 @@ def file2passage(filename):
 
 def xml2passage(filename):
     with open(filename, encoding="utf-8") as f:
-        return from_standard(ET.ElementTree().parse(f))
+        return from_standard_file(f)
+
+
+def _cached_xml2passage(filename, passage_cache):
+    passage = passage_cache.get(filename)
+    if passage is None:
+        key = passage_cache.key(filename)
+        passage = xml2passage(filename)
+        passage_cache.put(filename, passage, key=key)  # unless the file has changed while parsing
+    return passage
 
 
 def pickle2passage(filename):
@@ -1163,22 +1404,34 @@ def pickle2passage(filename):
         return pickle.load(h)
 
 
-def passage2file(passage, filename, indent=True, binary=False):
-    """Writes a UCCA passage as a standard XML file or a binary pickle
+def frozen2passage(filename):
+    return frozen.load_passage(filename)
+
+
+def _is_frozen_file(filename):
+    try:
+        with open(filename, "rb") as h:
+            return frozen.is_frozen(h.read(len(frozen.MAGIC)))
+    except OSError:
+        return False
+
+
+def passage2file(passage, filename, indent=True, binary=False, compact=False):
+    """Writes a UCCA passage as a standard XML file, a binary pickle or in the compact binary format
     :param passage: passage object to write
     :param filename: file name to write to
     :param indent: whether to indent each line
     :param binary: whether to write pickle format (or XML)
+    :param compact: whether to write the compact binary format (see `ucca.frozen'), regardless of `binary'
     """
-    if binary:
+    if compact:
+        frozen.save(passage, filename)
+    elif binary:
         with open(filename, "wb") as h:
             pickle.dump(passage, h)
     else:  # xml
-        root = to_standard(passage)
-        xml_string = ET.tostring(root).decode()
-        output = textutil.indent_xml(xml_string) if indent else xml_string
         with open(filename, "w", encoding="utf-8") as h:
-            h.write(output)
+            write_standard(passage, h, indent=indent)
 
 
 def split2sentences(passage, remarks=False, lang="en", ids=None):
@@ -1228,8 +1481,9 @@ def split_passage(passage, ends, remarks=False, ids=None, suffix_format="%03d",
         nodes = set()
         id_to_other = {}
         paragraphs = []
-        for terminal in l0.all[start:end]:
-            other_terminal = other_l0.add_terminal(terminal.text, terminal.punct, 1)
+        terminals = l0.all[start:end]
+        other_terminals = other_l0.add_terminals([t.text for t in terminals], [t.punct for t in terminals])
+        for terminal, other_terminal in zip(terminals, other_terminals):
             _copy_extra(terminal, other_terminal, remarks)
             other_terminal.extra["orig_paragraph"] = terminal.paragraph
             if terminal.paragraph not in paragraphs:
@@ -1272,18 +1526,19 @@ def join_passages(passages, passage_id=None, remarks=False):
     paragraph = 0
     for passage in passages:
         l0 = passage.layer(layer0.LAYER_ID)
-        paragraphs = set()
+        paragraphs = []
         for terminal in l0.all:
             if terminal.para_pos == 1:
                 paragraph += 1
             orig_paragraph = terminal.extra.get("orig_paragraph")
             if orig_paragraph is not None:
                 paragraph = orig_paragraph
-            paragraphs.add(paragraph)
-            other_terminal = other_l0.add_terminal(terminal.text, terminal.punct, paragraph)
+            paragraphs.append(paragraph)
+        other_terminals = other_l0.add_terminals([t.text for t in l0.all], [t.punct for t in l0.all], paragraphs)
+        for terminal, other_terminal in zip(l0.all, other_terminals):
             _copy_extra(terminal, other_terminal, remarks)
             id_to_other[terminal.ID] = other_terminal
-        for paragraph in paragraphs:
+        for paragraph in set(paragraphs):
             other_l0.doc(paragraph).extend(l0.doc(1))
         _copy_l1_nodes(passage, other, id_to_other, remarks=remarks)
     return other
@@ -1304,56 +1559,57 @@ def _copy_l1_nodes(passage, other, id_to_other, include=None, remarks=False):
     linkages = []
     remotes = []
     heads = []
-    while queue:
-        node, other_node = queue.pop()
-        if node.tag == layer1.NodeTags.Linkage:
-            if include is None or include.issuperset(node.children):
-                linkages.append(node)
-            continue
-        if other_node is None:
-            heads.append(node)
-            other_node = other_l1.heads[0]
-        for edge in node:
-            is_remote = edge.attrib.get("remote", False)
-            if include is None or edge.child in include or _unanchored(edge.child):
-                if is_remote:
-                    remotes.append((edge, other_node))
-                    continue
-                if edge.child.layer.ID == layer0.LAYER_ID:
-                    edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
-                    other_node.add_multiple(edge_categories, id_to_other[edge.child.ID])
-                    continue
-                if edge.child.tag == layer1.NodeTags.Punctuation:
-                    grandchild = edge.child.children[0]
-                    other_child = other_l1.add_punct(other_node, id_to_other[grandchild.ID])
-                    other_child.incoming[0].categories = edge.categories
-                else:
+    with other.bulk_build():
+        while queue:
+            node, other_node = queue.pop()
+            if node.tag == layer1.NodeTags.Linkage:
+                if include is None or include.issuperset(node.children):
+                    linkages.append(node)
+                continue
+            if other_node is None:
+                heads.append(node)
+                other_node = other_l1.heads[0]
+            for edge in node:
+                is_remote = edge.attrib.get("remote", False)
+                if include is None or edge.child in include or _unanchored(edge.child):
+                    if is_remote:
+                        remotes.append((edge, other_node))
+                        continue
+                    if edge.child.layer.ID == layer0.LAYER_ID:
+                        edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
+                        other_node.add_multiple(edge_categories, id_to_other[edge.child.ID])
+                        continue
+                    if edge.child.tag == layer1.NodeTags.Punctuation:
+                        grandchild = edge.child.children[0]
+                        other_child = other_l1.add_punct(other_node, id_to_other[grandchild.ID])
+                        other_child.incoming[0].categories = [core.Category(*c) for c in edge.categories]
+                    else:
+                        edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
+                        other_child = other_l1.add_fnode_multiple(other_node, edge_categories,
+                                                                  implicit=edge.child.attrib.get("implicit"))
+                        queue.append((edge.child, other_child))
+                    id_to_other[edge.child.ID] = other_child
+                    _copy_extra(edge.child, other_child, remarks)  # Add remotes
+                elif is_remote:  # Cross-paragraph remote edge -> create implicit child instead
                     edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
-                    other_child = other_l1.add_fnode_multiple(other_node, edge_categories,
-                                                              implicit=edge.child.attrib.get("implicit"))
-                    queue.append((edge.child, other_child))
-                id_to_other[edge.child.ID] = other_child
-                _copy_extra(edge.child, other_child, remarks)  # Add remotes
-            elif is_remote:  # Cross-paragraph remote edge -> create implicit child instead
-                edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
-                other_l1.add_fnode_multiple(other_node, edge_categories, implicit=True)
-    for edge, parent in remotes:
-        other_child = id_to_other.get(edge.child.ID)
-        edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
-        if other_child is None:  # Promote remote edge to primary if the original primary parent is gone due to split
-            id_to_other[edge.child.ID] = other_child = \
-                other_l1.add_fnode_multiple(parent, edge_categories, implicit=edge.child.attrib.get("implicit"))
-            _copy_extra(edge.child, other_child, remarks)
-        else:
-            other_l1.add_remote_multiple(parent, edge_categories, other_child)
-    # Add linkages
-    for linkage in linkages:
-        try:
-            arguments = [id_to_other[argument.ID] for argument in linkage.arguments]
-            other_linkage = other_l1.add_linkage(id_to_other[linkage.relation.ID], *arguments)
-            _copy_extra(linkage, other_linkage, remarks)
-        except layer1.MissingRelationError:
-            pass
+                    other_l1.add_fnode_multiple(other_node, edge_categories, implicit=True)
+        for edge, parent in remotes:
+            other_child = id_to_other.get(edge.child.ID)
+            edge_categories = [(c.tag, c.slot, c.layer, c.parent) for c in edge.categories]
+            if other_child is None:  # Promote remote edge to primary if the original primary parent is gone due to split
+                id_to_other[edge.child.ID] = other_child = \
+                    other_l1.add_fnode_multiple(parent, edge_categories, implicit=edge.child.attrib.get("implicit"))
+                _copy_extra(edge.child, other_child, remarks)
+            else:
+                other_l1.add_remote_multiple(parent, edge_categories, other_child)
+        # Add linkages
+        for linkage in linkages:
+            try:
+                arguments = [id_to_other[argument.ID] for argument in linkage.arguments]
+                other_linkage = other_l1.add_linkage(id_to_other[linkage.relation.ID], *arguments)
+                _copy_extra(linkage, other_linkage, remarks)
+            except layer1.MissingRelationError:
+                pass
     for head, other_head in zip(heads, other_l1.heads):
         _copy_extra(head, other_head, remarks)
 
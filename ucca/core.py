@@ -9,14 +9,30 @@ are connected between themselves and to Nodes in other layers using
 """
 
 import functools
-
-# Max number of digits allowed for a unique ID
-UNIQUE_ID_MAX_DIGITS = 5
+import hashlib
+import math
+from collections import Counter, deque
+from types import MappingProxyType
+from contextlib import contextmanager
 
 # Attribute to ignore when comparing entities
 IRRELEVANT_ATTRIBUTES = {"uncertain"}
 
 
+def _id_sortkey(ID):
+    """Computes the comparable sort key of a :class:`Node` ID.
+
+    :param ID: the Node ID, composed of the layer ID, a separator and a unique ID
+
+    :return: a (layer, int) tuple for numeric unique IDs, which are the usual
+        case, so that sorting is lexicographic by the layer ID and then numeric
+        by the unique ID. Non-numeric unique IDs are sorted after numeric ones.
+
+    """
+    layer, _, unique = ID.partition(Node.ID_SEPARATOR)
+    return (layer, int(unique)) if unique.isdigit() else (layer, math.inf, unique)
+
+
 # Used as the default ordering key function for ordered objects, namely
 # :class:`Layer` and :class:`Node` .
 def id_orderkey(node):
@@ -26,12 +42,12 @@ def id_orderkey(node):
         node: :class:`Node` which we will to sort according to its ID
 
     Returns:
-        a string with the layer and unique ID in such a way that sort will
-        first order lexicography the layer ID then numerically the unique ID.
+        a tuple with the layer and unique ID, precomputed when the Node is
+        created, such that sort will first order lexicography the layer ID
+        then numerically the unique ID.
 
     """
-    layer, unique = node.ID.split(Node.ID_SEPARATOR)
-    return "{} {:>{}}".format(layer, unique, UNIQUE_ID_MAX_DIGITS)
+    return node._sortkey
 
 
 def edge_id_orderkey(edge):
@@ -42,12 +58,58 @@ def edge_id_orderkey(edge):
         parent and children after using :func:`id_orderkey`.
 
     Returns:
-        a string with the layer and unique ID in such a way that sort will
-        first order lexicography the layer ID then numerically the unique ID.
+        a tuple of the parent and child keys, such that sort will first order
+        by the parent and then by the child.
+
+    """
+    return edge._parent._sortkey, edge._child._sortkey
+
+
+def _setstate(obj, state, renamed=None):
+    """Restores the pickled state of an object with __slots__.
+
+    Supports both the (__dict__, __slots__) state pickled for slotted objects
+    and the plain dictionary state of objects pickled before __slots__ were used.
+
+    :param renamed: optional dictionary from old attribute names to their current names
 
     """
-    return Edge.ID_FORMAT.format(id_orderkey(edge.parent),
-                                 id_orderkey(edge.child))
+    if isinstance(state, tuple):
+        dict_state, slots_state = state
+        state = dict(dict_state or (), **(slots_state or {}))
+    for key, value in state.items():
+        setattr(obj, renamed.get(key, key) if renamed else key, value)
+
+
+def _insort(edges, edge, key):
+    """Adds an Edge to a list of Edges sorted by key, keeping it sorted.
+
+    Edges are usually added in order, in which case they are just appended.
+
+    """
+    edges.append(edge)
+    if len(edges) > 1 and key(edge) < key(edges[-2]):
+        edges.sort(key=key)
+
+
+class _ReadOnlyList(list):
+    """A list that cannot be modified, used as a view of internal lists without copying them each time."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("'%s' object is read-only" % type(self).__name__)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _digest(data):
+    """Returns a fixed-size digest of the given bytes, for structural hashing."""
+    return hashlib.blake2b(data, digest_size=16).digest()
 
 
 class UCCAError(Exception):
@@ -81,7 +143,7 @@ class UnimplementedMethodError(UCCAError):
     pass
 
 
-class ModifyPassage:
+def ModifyPassage(fn):
     """Decorator for changing a :class:`Passage` or any member of it.
 
     This decorator is mandatory for anything which causes the elements in
@@ -89,6 +151,8 @@ class ModifyPassage:
     an attribute.
 
     It validates that the Passage is not frozen before allowing the change.
+    The check is done by a single wrapper function created once per decorated
+    method, so calling a decorated method does not allocate anything.
 
     The decorator can't be used for __init__ calls, as at the stage of the
     check there are no instance attributes to check. So in such cases,
@@ -96,37 +160,21 @@ class ModifyPassage:
     decorated instead (and should be called after the instance attributes
     are set).
 
-    Attributes:
-        fn: the function object to decorate
-
+    :param fn: the function object to decorate, whose first argument is the
+            object which modifies :class:`Passage`, and it has an attribute root
+            which points to the Passage it is part of.
+    :return: The decorated function.
+    :raise FrozenPassageError: when the decorated function is called, if the
+            :class:`Passage` is frozen and can't be modified.
     """
 
-    def __init__(self, fn):
-        self.fn = fn
-
-    def __get__(self, obj, cls):
-        """Used to bind the function to the instance (add 'self')."""
-        return functools.partial(self.__call__, obj)
-
-    def __call__(self, *args, **kwargs):
-        """Decorating functions which modify :class:`Passage` elements.
-
-        :param args: list of all arguments, assuming the first is the object
-                which modifies :class:`Passage`, and it has an attribute root
-                which points to the Passage it is part of.
-        :param kwargs: list of all keyword arguments
-        :return: The decorated function result.
-        :raise FrozenPassageError: if the :class:`Passage` is frozen and can't be
-                modified.
-        """
-
-        @functools.wraps(self.fn)
-        def decorated(*args, **kwargs):
-            if args[0].root.frozen:
-                raise FrozenPassageError(args[0].root.ID)
-            return self.fn(*args, **kwargs)
+    @functools.wraps(fn)
+    def decorated(self, *args, **kwargs):
+        if self.root.frozen:
+            raise FrozenPassageError(self.root.ID)
+        return fn(self, *args, **kwargs)
 
-        return decorated(*args, **kwargs)
+    return decorated
 
 
 class _AttributeDict:
@@ -139,18 +187,28 @@ class _AttributeDict:
 
     Attributes:
         root: the Passage this object is linked with
+        owner: the element whose attributes these are, which is notified when they change
 
     """
 
-    def __init__(self, root, mapping=None):
-        self._root = root
-        self._dict = mapping.copy() if mapping is not None else dict()
+    __slots__ = ("_owner", "_dict")
+
+    # Shared by all empty dictionaries, which only create their own dict when written to
+    _EMPTY = {}
+
+    def __init__(self, owner, mapping=None):
+        self._owner = owner
+        self._dict = mapping.copy() if mapping else None
+
+    def __setstate__(self, state):
+        # Dictionaries pickled before the owner was kept only had the root, which is re-owned by the owner
+        _setstate(self, state, renamed={"_root": "_owner"})
 
     def __getitem__(self, key):
-        return self._dict[key]
+        return (self._dict or self._EMPTY)[key]
 
     def get(self, key, default=None):
-        return self._dict.get(key, default)
+        return (self._dict or self._EMPTY).get(key, default)
 
     def equals(self, other):
         """True iff the two objects are equal (only dicts, w.o.r.t Passage).
@@ -160,48 +218,102 @@ class _AttributeDict:
         """
 
         def omit_irrelevant(d):
-            return {k: v for k, v in d.items() if k not in IRRELEVANT_ATTRIBUTES}
+            return {k: v for k, v in d.items() if k not in IRRELEVANT_ATTRIBUTES} if d else {}
 
         return omit_irrelevant(self._dict) == omit_irrelevant(other._dict)
 
+    def _digest_key(self):
+        """Returns a canonical string of the dictionary items, omitting irrelevant ones, for structural hashing."""
+        return repr(sorted((k, v) for k, v in self.items() if k not in IRRELEVANT_ATTRIBUTES))
+
     @property
     def root(self):
-        return self._root
+        return self._owner.root
+
+    @property
+    def owner(self):
+        return self._owner
 
     def copy(self):
-        return self._dict.copy()
+        return self._dict.copy() if self._dict else {}
 
     @ModifyPassage
     def __setitem__(self, key, value):
+        if self._dict is None:
+            self._dict = {}
         self._dict[key] = value
+        self._changed()
 
     @ModifyPassage
     def update(self, values):
+        if self._dict is None:
+            self._dict = {}
         self._dict.update(values)
+        self._changed()
 
     @ModifyPassage
     def __delitem__(self, key):
+        if self._dict is None:
+            raise KeyError(key)
         del self._dict[key]
+        self._changed()
+
+    def _changed(self):
+        self._owner._attrib_changed()
+        root = self._owner.root
+        if root._listeners:
+            root._notify("attrib_changed", self._owner)
 
     def __len__(self):
-        return len(self._dict)
+        return len(self._dict) if self._dict else 0
 
     def items(self):
-        return self._dict.items()
+        return (self._dict or self._EMPTY).items()
+
+    def view(self):
+        """Returns a read-only view of the dictionary, which is not copied."""
+        return MappingProxyType(self._dict if self._dict is not None else self._EMPTY)
+
 
+class _Extra:
+    """Base class for elements with an extra dictionary, which is only created when first accessed.
 
-class Category:
+    Most elements never use their extra dictionary, so this saves a dictionary per element.
+
+    """
+
+    __slots__ = ("_extra",)
+
+    @property
+    def extra(self):
+        if self._extra is None:
+            self._extra = {}
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value
+
+
+class Category(_Extra):
     """when considering refinement layers, each edge can have multiple tags sorted in a certain hierarchy.
     for this reason, a category must include not only the tag information but also the layer and hierarchy
     information.
     """
 
+    __slots__ = ("_tag", "_slot", "_layer", "_parent", "_edge")
+
     def __init__(self, tag, slot=None, layer=None, parent=None):
         self._tag = tag
         self._slot = slot if slot else ""
         self._layer = layer if layer else ""
         self._parent = parent if parent else ""
-        self.extra = {}
+        self._extra = None
+        self._edge = None  # the Edge this category belongs to, set by the Edge
+
+    def __setstate__(self, state):
+        self._edge = None  # pickled before categories referred to their Edge, which will set it
+        _setstate(self, state)
 
     @property
     def tag(self):
@@ -209,7 +321,11 @@ class Category:
 
     @tag.setter
     def tag(self, new_tag):
+        edge = self._edge
+        old_tag = None if edge is None else edge.tag
         self._tag = new_tag
+        if edge is not None:
+            edge._categories_changed(old_tag)
 
     @property
     def slot(self):
@@ -234,7 +350,7 @@ class Category:
         return iter((self.tag, self.slot, self.layer, self.parent))
 
 
-class Edge:
+class Edge(_Extra):
     """Labeled edge between two :class:`Node` objects in UCCA annotation graph.
 
     An edge between Nodes in a :class:`Passage` is a simple object; it is a
@@ -260,6 +376,8 @@ class Edge:
 
     ID_FORMAT = "{}->{}"
 
+    __slots__ = ("_root", "_parent", "_child", "_attrib", "_categories", "_tags")
+
     def __init__(self, root, parent, child, tag=None, attrib=None):
         """Creates a new :class:`Edge` object.
 
@@ -274,9 +392,19 @@ class Edge:
         self._root = root
         self._parent = parent
         self._child = child
-        self._attrib = _AttributeDict(root, attrib)
-        self._categories = [Category(tag)] if tag else []
-        self.extra = {}
+        self._attrib = _AttributeDict(self, attrib)
+        self._categories = []
+        self._tags = None
+        self._extra = None
+        if tag:
+            self._own(Category(tag))
+
+    def __setstate__(self, state):
+        _setstate(self, state)
+        self._attrib._owner = self  # pickled before attributes were owned by their element
+        self._tags = None
+        for category in getattr(self, "_categories", ()):  # pickled before categories referred to their Edge
+            category._edge = self
 
     @property
     def tag(self):
@@ -285,13 +413,14 @@ class Edge:
     @tag.setter
     @ModifyPassage
     def tag(self, new_tag):
-        old_tag = self.tag
-        self.categories[0].tag = new_tag
-        self._root._change_edge_tag(self, old_tag)
+        self.categories[0].tag = new_tag  # which updates the Passage with the change
 
     @property
     def tags(self):
-        return [category.tag for category in self.categories]
+        """A tuple of the tags of all categories of the Edge, computed once until they change."""
+        if self._tags is None:
+            self._tags = tuple(category.tag for category in self.categories)
+        return self._tags
 
     @property
     def root(self):
@@ -311,7 +440,11 @@ class Edge:
 
     @categories.setter
     def categories(self, new_categories):
-        self._categories = new_categories
+        old_tag = self._primary_tag()
+        self._categories = []
+        for category in new_categories:
+            self._own(category)
+        self._categories_changed(old_tag)
 
     @property
     def child(self):
@@ -344,6 +477,9 @@ class Edge:
         :return: True iff the Edges are equal.
 
         """
+        if recursive and not ordered:
+            return self.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) == \
+                   other.digest(ignore_node=ignore_node, ignore_edge=ignore_edge)
         return self.tag == other.tag and \
                self._attrib.equals(other._attrib) and \
                (not recursive or
@@ -351,17 +487,64 @@ class Edge:
                                   ordered=ordered,
                                   ignore_node=ignore_node, ignore_edge=ignore_edge))
 
+    def digest(self, ignore_node=None, ignore_edge=None):
+        """Returns a structural hash of the Edge and the subgraph under its child.
+
+        Edges have the same digest iff they are recursively Edge-equal (unordered).
+        Digests are cached by the :class:`Passage` until it is modified.
+
+        :param ignore_node: function that returns whether to ignore a given node
+        :param ignore_edge: function that returns whether to ignore a given edge
+
+        :return: a bytes object
+        """
+        return _digest(_digest(repr((self.tag, self._attrib._digest_key())).encode()) +
+                       self._child.digest(ignore_node=ignore_node, ignore_edge=ignore_edge))
+
     @ModifyPassage
     def add(self, tag, slot="", layer="", parent=""):
         """ adds a new category to the edge"""
+        old_tag = self._primary_tag()
+        c = self._add(tag, slot, layer, parent)
+        self._categories_changed(old_tag)
+        return c
+
+    def _add(self, tag, slot="", layer="", parent=""):
+        """Adds a new category to the Edge, like :meth:`add`, but without updating the Passage with the change,
+        since the Edge is not added to it yet."""
         c = Category(tag, slot, layer, parent)
-        self.categories.append(c)
-        if c.tag not in self.root.categories:
-            self.root._update_categories(c)
+        self._own(c)
+        self._tags = None
+        if c.tag not in self._root._categories:
+            self._root._update_categories(c)
         if c.parent and c.parent not in self.root.refined_categories:
             self.root._update_refined_categories(c.parent)
         return c
 
+    def _own(self, category):
+        """Appends a :class:`Category` to the Edge, which it then refers to."""
+        category._edge = self
+        self.categories.append(category)
+
+    def _primary_tag(self):
+        """Returns the tag of the Edge, or None if it has no categories."""
+        return self._categories[0].tag if self._categories else None
+
+    def _categories_changed(self, old_tag):
+        """Called when the categories of the Edge change, or their tags.
+
+        :param old_tag: the tag of the Edge before the change, or None if it had no categories
+        """
+        self._tags = None
+        self._parent._tag_index = None
+        self._root._change_edge_tag(self, old_tag)
+
+    def _attrib_changed(self):
+        """Called when the attributes of the Edge change, e.g. whether it is remote."""
+        self._root._modified()
+        self._parent.layer._invalidate(self._parent)
+        self._child._parents_changed()
+
     def __repr__(self):
         return self.ID
 
@@ -369,7 +552,7 @@ class Edge:
         return self.categories[index]
 
 
-class Node:
+class Node(_Extra):
     """Labeled Node in UCCA annotation graph.
 
     A Node in :class:`Passage` UCCA annotation is an vertex in the annotation
@@ -398,6 +581,9 @@ class Node:
 
     ID_SEPARATOR = '.'
 
+    __slots__ = ("_tag", "_root", "_ID", "_sortkey", "_layer", "_attrib", "_outgoing", "_incoming", "_orderkey",
+                 "_tag_index")
+
     def __init__(self, ID, root, tag, attrib=None, *,
                  orderkey=edge_id_orderkey):
         """Creates a new :class:`Node` object.
@@ -410,21 +596,37 @@ class Node:
         """
         if root.frozen:
             raise FrozenPassageError(root.ID)
+        sortkey = _id_sortkey(ID)
+        try:
+            layer = root._layers[sortkey[0]]
+        except KeyError as e:
+            raise ValueError("Invalid layer '%s' in node ID '%s'" % (sortkey[0], ID)) from e
         self._tag = tag
         self._root = root
         self._ID = ID
-        self._attrib = _AttributeDict(root, attrib)
-        self.extra = {}
+        self._sortkey = (layer.ID,) + sortkey[1:]  # share the layer's ID string rather than keep a copy per node
+        self._layer = layer
+        self._attrib = _AttributeDict(self, attrib)
+        self._extra = None
         self._outgoing = []
         self._incoming = []
         self._orderkey = orderkey
+        self._tag_index = None  # see _edges_by_tag
 
         # After properly initializing self, add it to the Passage/Layer
         root._add_node(self)
+        layer._add_node(self)
+        if root._listeners:
+            root._notify("node_added", self)
+
+    def __setstate__(self, state):
+        _setstate(self, state)
         try:
-            root.layer(self.layer.ID)._add_node(self)
-        except KeyError as e:
-            raise ValueError("Invalid layer '%s' in node ID '%s'" % (self.layer.ID, self._ID)) from e
+            self._sortkey
+        except AttributeError:  # pickled before sort keys were precomputed
+            self._sortkey = _id_sortkey(self._ID)
+        self._attrib._owner = self  # pickled before attributes were owned by their element
+        self._tag_index = None
 
     @property
     def tag(self):
@@ -451,7 +653,11 @@ class Node:
 
     @property
     def layer(self):
-        return self._root.layer(self._ID.split(Node.ID_SEPARATOR)[0])
+        try:
+            return self._layer
+        except AttributeError:  # pickled before the layer was kept in the node
+            self._layer = self._root.layer(self._sortkey[0])
+            return self._layer
 
     @property
     def incoming(self):
@@ -500,11 +706,11 @@ class Node:
         edge = Edge(root=self._root, parent=self,
                     child=node, attrib=edge_attrib)
         for category in edge_categories:
-            edge.add(*category)
-        self._outgoing.append(edge)
-        self._outgoing.sort(key=self._orderkey)
-        node._incoming.append(edge)
-        node._incoming.sort(key=node._orderkey)
+            edge._add(*category)
+        _insort(self._outgoing, edge, self._orderkey)
+        _insort(node._incoming, edge, node._orderkey)
+        self._tag_index = None
+        node._parents_changed()
         self.root._add_edge(edge)
         return edge
 
@@ -551,7 +757,9 @@ class Node:
 
         try:
             self._outgoing.remove(edge)
+            self._tag_index = None
             edge.child._incoming.remove(edge)
+            edge.child._parents_changed()
             self.root._remove_edge(edge)
         except ValueError as e:
             raise MissingNodeError(edge_or_node) from e
@@ -564,6 +772,7 @@ class Node:
     def orderkey(self, value):
         self._orderkey = value
         self._outgoing.sort(key=value)
+        self._tag_index = None
 
     @ModifyPassage
     def destroy(self):
@@ -602,10 +811,13 @@ class Node:
         :return: True iff the Nodes are equal in the terms given.
 
         """
+        if not recursive:
+            return self.tag == other.tag and self._attrib.equals(other._attrib)
+        if not ordered:
+            return self.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) == \
+                   other.digest(ignore_node=ignore_node, ignore_edge=ignore_edge)
         if self.tag != other.tag or not self._attrib.equals(other._attrib):
             return False
-        if not recursive:
-            return True
         edges, other_edges = [[edge for edge in node
                                if (ignore_node is None or
                                    not ignore_node(edge.child)) and (
@@ -614,23 +826,37 @@ class Node:
                               for node in (self, other)]
         if len(edges) != len(other_edges):
             return False  # not necessary, but gives better performance
-        if ordered:
-            return all(e1.equals(e2, ordered=True,
-                                 ignore_node=ignore_node, ignore_edge=ignore_edge)
-                       for e1, e2 in zip(edges, other_edges))
-        # For unordered equality, I try to find & remove an equivalent
-        # Edge + Node couple from other's Edges until exhausted.
-        # Because both Edge-equality and Node-equality are equivalence
-        # classes, I can just take the first I found and remove it w/o
-        # trying to iterate through possible orders.
-        try:
-            for e1 in edges:
-                other_edges.remove(next(e2 for e2 in other_edges
-                                        if e1.equals(e2, ignore_node=ignore_node,
-                                                     ignore_edge=ignore_edge)))
-        except StopIteration:
-            return False
-        return not other_edges
+        return all(e1.equals(e2, ordered=True,
+                             ignore_node=ignore_node, ignore_edge=ignore_edge)
+                   for e1, e2 in zip(edges, other_edges))
+
+    def digest(self, ignore_node=None, ignore_edge=None):
+        """Returns a structural (Merkle) hash of the Node and the subgraph under it.
+
+        The digest combines the Node's tag and relevant attributes with the
+        digests of its outgoing Edges, regardless of their order, so Nodes
+        have the same digest iff they are recursively Node-equal (unordered).
+        Digests are cached by the :class:`Passage` until it is modified.
+
+        :param ignore_node: function that returns whether to ignore a given node
+        :param ignore_edge: function that returns whether to ignore a given edge
+
+        :return: a bytes object
+        """
+        digests = self._root._digests(ignore_node, ignore_edge)
+        digest = digests.get(self)
+        if digest is None:
+            key = _digest(self._digest_key().encode())
+            digests[self] = key  # stands for the Node while computing, in case there is a cycle
+            digest = digests[self] = _digest(key + b"".join(sorted(
+                edge.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) for edge in self._outgoing
+                if (ignore_node is None or not ignore_node(edge.child)) and
+                (ignore_edge is None or not ignore_edge(edge)))))
+        return digest
+
+    def _digest_key(self):
+        """Returns a string identifying the Node itself for Node-equality, not including its Edges."""
+        return repr((self._tag, self._attrib._digest_key()))
 
     def missing_edges(self, other, ignore_node=None):
         """Returns edges present in this node but missing in the other.
@@ -645,7 +871,8 @@ class Node:
                                if ignore_node is None or
                                not ignore_node(edge.child)]
                               for node in (self, other)]
-        return sorted([e1 for e1 in edges if not any(e1.equals(e2) for e2 in other_edges)],
+        other_digests = {e2.digest() for e2 in other_edges}
+        return sorted([e1 for e1 in edges if e1.digest() not in other_digests],
                       key=edge_id_orderkey)
 
     def iter(self, obj="nodes", method="dfs", duplicates=False, key=None):
@@ -674,26 +901,46 @@ class Node:
         if obj not in ("nodes", "edges"):
             raise ValueError("obj can be either 'nodes' or 'edges'")
         processed = set()
+        # A queue for BFS, or a stack for DFS, whose top is its end so the next item is to_add[0]
+        bfs = method == "bfs"
         if obj == 'nodes':
-            waiting = [self]
+            waiting = deque([self])
         else:
-            waiting = self._outgoing[:]
-        while len(waiting):
-            curr = waiting.pop(0)
+            waiting = deque(self._outgoing if bfs else reversed(self._outgoing))
+        while waiting:
+            curr = waiting.popleft() if bfs else waiting.pop()
             if key is None or key(curr):
                 yield curr
             processed.add(curr)
             to_add = curr.children if obj == 'nodes' else list(curr.child)
             to_add = [x for x in to_add if duplicates or x not in processed]
-            if method == "bfs":
-                waiting.extend(to_add)
-            else:
-                waiting = to_add + waiting
+            waiting.extend(to_add if bfs else reversed(to_add))
 
     def get_terminals(self, *args, **kwargs):
         """Returns a list of all terminals under the span of this Node."""
         return [t for e in self._outgoing for t in e.child.get_terminals(*args, **kwargs)]
 
+    def _edges_by_tag(self):
+        """Returns a dictionary from each tag to the outgoing :class:`Edge` objects with it, in order.
+
+        Computed once, and kept until the outgoing Edges or their categories change.
+        """
+        if self._tag_index is None:
+            self._tag_index = {}
+            for edge in self._outgoing:
+                for tag in edge.tags:
+                    self._tag_index.setdefault(tag, []).append(edge)
+        return self._tag_index
+
+    def _attrib_changed(self):
+        """Called when the attributes of the Node change."""
+        self._root._modified()
+        self.layer._invalidate(self)
+
+    def _parents_changed(self):
+        """Called when the incoming Edges of the Node change, as well as their attributes or their parents' tags."""
+        pass  # meant to be overriden by subclasses
+
 
 class Layer:
     """Group of similar :class:`Node` objects in UCCA annotation graph.
@@ -714,12 +961,16 @@ class Layer:
             and Nodes outside the Layer (hence, the Edges are not in the Layer)
             the order will not be updated (because the Layer object won't know
             that something has changed).
-        all: a list of all the Nodes which are part of this Layer
-        heads: a list of all Nodes which have no incoming Edges in the subgraph
+        all: a read-only list of all the Nodes which are part of this Layer
+        heads: a read-only list of all Nodes which have no incoming Edges in the subgraph
             of the Layer (can have Edges from Nodes in other Layers).
 
     """
 
+    # Read-only views of all and heads, until they change (set at the class level for old pickles)
+    _all_view = None
+    _heads_view = None
+
     def __init__(self, ID, root, attrib=None, *, orderkey=id_orderkey):
         """Creates a new :class:`Layer` object.
 
@@ -733,13 +984,29 @@ class Layer:
             raise FrozenPassageError(root.ID)
         self._ID = ID
         self._root = root
-        self._attrib = _AttributeDict(root, attrib)
+        self._attrib = _AttributeDict(self, attrib)
         self.extra = {}
         self._all = []
         self._heads = []
+        self._head_set = set()
+        self._unsorted = False
         self._orderkey = orderkey
         root._add_layer(self)
 
+    def __setstate__(self, state):
+        # Layers pickled before ordering became lazy lack the bookkeeping fields
+        self.__dict__.update(state)
+        if "_head_set" not in state:
+            self._head_set = set(self._heads)
+            self._unsorted = False
+        self._attrib._owner = self  # pickled before attributes were owned by their element
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_all_view", None)  # views, not pickled
+        state.pop("_heads_view", None)
+        return state
+
     @property
     def ID(self):
         return self._ID
@@ -754,11 +1021,17 @@ class Layer:
 
     @property
     def all(self):
-        return self._all[:]
+        self._sort()
+        if self._all_view is None:
+            self._all_view = _ReadOnlyList(self._all)
+        return self._all_view
 
     @property
     def heads(self):
-        return self._heads[:]
+        self._sort()
+        if self._heads_view is None:
+            self._heads_view = _ReadOnlyList(self._heads)
+        return self._heads_view
 
     @property
     def orderkey(self):
@@ -767,8 +1040,23 @@ class Layer:
     @orderkey.setter
     def orderkey(self, value):
         self._orderkey = value
-        self._all.sort(key=value)
-        self._heads.sort(key=value)
+        self._unsorted = True
+
+    def _sort(self):
+        """Restores the order of the Nodes after mutations which may have broken it.
+
+        Mutations only mark the :class:`Layer` as unsorted (or the heads as
+        stale), so the actual sorting is done once, when the order is needed.
+
+        """
+        if self._unsorted:
+            self._all.sort(key=self._orderkey)
+            self._all_view = None
+            self._unsorted = False
+            self._heads = None
+        if self._heads is None:
+            self._heads = [node for node in self._all if node in self._head_set]
+            self._heads_view = None
 
     def equals(self, other, *, ordered=False, ignore_node=None, ignore_edge=None):
         """Returns whether two Layer objects are equal.
@@ -799,16 +1087,9 @@ class Layer:
             return all(x1.equals(x2, ordered=True,
                                  ignore_node=ignore_node, ignore_edge=ignore_edge)
                        for x1, x2 in zip(heads, other_heads))
-        # I can just find the first equal head in unordered search, as
-        # Node-equality is an equivalence class (see their for details).
-        try:
-            for h1 in heads:
-                other_heads.remove(next(h2 for h2 in other_heads
-                                        if h1.equals(h2, ignore_node=ignore_node,
-                                                     ignore_edge=ignore_edge)))
-        except StopIteration:
-            return False
-        return not other_heads
+        # Node-equality is an equivalence class, so compare the multisets of digests
+        return Counter(h.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) for h in heads) == \
+            Counter(h.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) for h in other_heads)
 
     def _add_edge(self, edge):
         """Alters self.heads if an :class:`Edge` has been added to the subgraph.
@@ -819,11 +1100,12 @@ class Layer:
         :param edge: the Edge added to the Layer subgraph
 
         """
-        if edge.child in self._heads:
-            self._heads.remove(edge.child)
-        # Order may depend on edges, so re-order
-        self._all.sort(key=self._orderkey)
-        self._heads.sort(key=self._orderkey)
+        if edge.child in self._head_set:
+            self._head_set.remove(edge.child)
+            self._heads = None
+        # Order may depend on edges, unless it is the default ID order
+        if self._orderkey is not id_orderkey:
+            self._unsorted = True
 
     def _remove_edge(self, edge):
         """Alters self.heads if an :class:`Edge` has been removed.
@@ -835,22 +1117,57 @@ class Layer:
 
         """
         if edge.child.layer == self and all(p.layer != self for p in edge.child.parents):
-            self._heads.append(edge.child)
-            self._heads.sort(key=self._orderkey)
-        # Order may depend on edges, so re-order
-        self._all.sort(key=self._orderkey)
-        self._heads.sort(key=self._orderkey)
+            self._head_set.add(edge.child)
+            self._heads = None
+        # Order may depend on edges, unless it is the default ID order
+        if self._orderkey is not id_orderkey:
+            self._unsorted = True
+
+    def _rebuild(self):
+        """Recomputes the heads of the :class:`Layer` from scratch, after a bulk build.
+
+        Heads are the Nodes without parents in this Layer.
+
+        """
+        children = {edge._child for node in self._all for edge in node._outgoing if edge._child._layer is self}
+        self._head_set = set(self._all).difference(children)
+        self._heads = None
+        # Order may depend on edges, unless it is the default ID order
+        if self._orderkey is not id_orderkey:
+            self._unsorted = True
 
     def _add_node(self, node):
         """Adds a :class:`node` to the :class:`Layer`.
 
         Assumes node has no incoming or outgoing :class:`Edge` objects.
+        Nodes are usually added in order, in which case they are just appended.
 
         """
+        if not self._unsorted and self._all and self._orderkey(node) < self._orderkey(self._all[-1]):
+            self._unsorted = True
         self._all.append(node)
-        self._all.sort(key=self._orderkey)
-        self._heads.append(node)
-        self._heads.sort(key=self._orderkey)
+        self._all_view = None
+        self._head_set.add(node)
+        if self._heads is not None:
+            self._heads.append(node)
+            self._heads_view = None
+
+    def _add_nodes(self, nodes):
+        """Adds many :class:`node` objects to the :class:`Layer` at once, as :meth:`_add_node` does for each.
+
+        Assumes the nodes have no incoming or outgoing :class:`Edge` objects.
+
+        """
+        if not self._unsorted:
+            keys = list(map(self._orderkey, self._all[-1:] + nodes))
+            self._unsorted = keys != sorted(keys)
+        self._all += nodes
+        self._all_view = None
+        if not self._root._bulk:  # otherwise the heads are recomputed when done
+            self._head_set.update(nodes)
+        if self._heads is not None:
+            self._heads += nodes
+            self._heads_view = None
 
     def _remove_node(self, node):
         """Removes a :class:`node` from the :class:`Layer`.
@@ -859,7 +1176,9 @@ class Layer:
 
         """
         self._all.remove(node)
-        self._heads.remove(node)
+        self._all_view = None
+        self._head_set.discard(node)
+        self._heads = None
 
     def _change_edge_tag(self, edge, old_tag):
         """Updates the :class:`Layer` objects with the change.
@@ -879,6 +1198,59 @@ class Layer:
         """
         pass  # meant to be overriden by subclasses
 
+    def _invalidate(self, node):
+        """Drops any data cached by the :class:`Layer` about the subgraph under a Node, which has changed.
+
+        Called even while the :class:`Passage` is built in bulk.
+
+        :param node: the Node of this Layer whose subgraph has changed
+
+        """
+        pass  # meant to be overriden by subclasses
+
+    def _attrib_changed(self):
+        """Called when the attributes of the Layer change."""
+        pass
+
+
+class PassageListener:
+    """Observer of the changes to a :class:`Passage`, to keep derived data up to date incrementally.
+
+    A listener is registered with :meth:`Passage.add_listener`, and is then
+    notified after each change, by calling the method named after it.
+    All methods do nothing, so subclasses override just the ones they need.
+    Changes to the extra dictionaries are not notified.
+
+    """
+
+    def node_added(self, node):
+        """Called after a :class:`Node` is created in the Passage and added to its :class:`Layer`."""
+        pass
+
+    def node_removed(self, node):
+        """Called after a :class:`Node` is destroyed, which is preceded by the removal of all its Edges."""
+        pass
+
+    def edge_added(self, edge):
+        """Called after an :class:`Edge` is added between two Nodes, with all its categories."""
+        pass
+
+    def edge_removed(self, edge):
+        """Called after an :class:`Edge` is removed."""
+        pass
+
+    def node_tag_changed(self, node, old_tag):
+        """Called after the tag of a :class:`Node` is set."""
+        pass
+
+    def edge_tag_changed(self, edge, old_tag):
+        """Called after the tag of an :class:`Edge` is set, or any of its categories change."""
+        pass
+
+    def attrib_changed(self, element):
+        """Called after the attributes of a :class:`Passage`, :class:`Layer`, :class:`Node` or :class:`Edge` change."""
+        pass
+
 
 class Passage:
     """An annotated text with UCCA annotation graph.
@@ -893,11 +1265,20 @@ class Passage:
         attrib: attribute dictionary of the Passage
         extra: temporary storage space for undocumented attributes and data
         layers: all Layers of the Passage, no order guaranteed
-        nodes: dictionary of ID-node pairs for all the nodes in the Passage
+        nodes: read-only dictionary of ID-node pairs for all the nodes in the Passage
         frozen: indicates whether the Passage can be modified or not, boolean.
 
     """
 
+    # Whether the Passage is being built in bulk (see bulk_build), set at the class level for old pickles
+    _bulk = False
+
+    # Cached structural hashes of the Nodes by the functions ignoring nodes and edges, until the next modification
+    _digest_cache = None
+
+    # Registered PassageListener objects, empty unless add_listener is called (so checking it is all changes cost)
+    _listeners = ()
+
     def __init__(self, ID, attrib=None):
         """Creates a new :class:`Passage` object.
 
@@ -931,7 +1312,7 @@ class Passage:
 
     @property
     def nodes(self):
-        return self._nodes.copy()
+        return MappingProxyType(self._nodes)
 
     @property
     def categories(self):
@@ -941,6 +1322,77 @@ class Passage:
     def refined_categories(self):
         return self._refined_categories
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_digest_cache", None)  # a cache, not pickled
+        state.pop("_listeners", None)  # listeners are not part of the annotation
+        return state
+
+    def add_listener(self, listener):
+        """Registers a :class:`PassageListener` to be notified of any change to the Passage.
+
+        Listeners are not copied or pickled with the Passage.
+
+        :param listener: the PassageListener object
+        """
+        self._listeners += (listener,)
+
+    def remove_listener(self, listener):
+        """Unregisters a :class:`PassageListener` registered by :meth:`add_listener`.
+
+        :param listener: the PassageListener object
+
+        :raise ValueError: if the listener is not registered
+        """
+        if listener not in self._listeners:
+            raise ValueError("Listener %s is not registered to passage '%s'" % (listener, self.ID))
+        self._listeners = tuple(x for x in self._listeners if x is not listener)
+
+    def _notify(self, event, *args):
+        """Calls the method named event of every registered listener, with the given arguments."""
+        for listener in self._listeners:
+            getattr(listener, event)(*args)
+
+    @contextmanager
+    def trusted(self):
+        """Context manager for trusted bulk modification of the Passage.
+
+        While in this context, the Passage is not checked for being frozen,
+        e.g. when a converter builds it from a trusted source. The frozen
+        status is restored when the context is exited.
+
+        :return: the Passage itself
+        """
+        frozen, self.frozen = self.frozen, False
+        try:
+            yield self
+        finally:
+            self.frozen = frozen
+
+    @contextmanager
+    def bulk_build(self):
+        """Context manager for building the Passage in bulk.
+
+        While in this context, adding and removing :class:`Edge` objects does not
+        update the :class:`Layer` objects, so heads (and any other derived data
+        maintained by the layers) are not up to date until the context is exited.
+        Then, each layer is finalized once, in linear time.
+        Also implies :meth:`trusted`. Nested calls have no effect.
+
+        :return: the Passage itself
+        """
+        if self._bulk:
+            yield self
+            return
+        self._bulk = True
+        try:
+            with self.trusted():
+                yield self
+        finally:
+            self._bulk = False
+            for layer in self._layers.values():
+                layer._rebuild()
+
     def layer(self, ID):
         """Returns the :class:`Layer` object whose ID is given.
 
@@ -997,12 +1449,34 @@ class Passage:
                                if ignore_node is None or
                                not ignore_node(node)]
                               for passage in (self, other)]
+        other_digests = {n2.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) for n2 in other_nodes}
         return sorted([n1 for n1 in nodes
-                       if not any(n1.equals(n2, ignore_node=ignore_node,
-                                            ignore_edge=ignore_edge)
-                                  for n2 in other_nodes)],
+                       if n1.digest(ignore_node=ignore_node, ignore_edge=ignore_edge) not in other_digests],
                       key=id_orderkey)
 
+    def _digests(self, ignore_node, ignore_edge):
+        """Returns the cached digests of the Nodes (see Node.digest) for the given ignore functions.
+
+        :param ignore_node: function that returns whether to ignore a given node
+        :param ignore_edge: function that returns whether to ignore a given edge
+
+        :return: dictionary from Node to digest, to fill in
+        """
+        key = (ignore_node, ignore_edge)
+        if self._digest_cache is None:
+            self._digest_cache = {}
+        digests = self._digest_cache.get(key)
+        if digests is None:
+            if key != (None, None):  # keep only the last other functions, since each call may pass new ones
+                for other in [k for k in self._digest_cache if k != (None, None)]:
+                    del self._digest_cache[other]
+            digests = self._digest_cache[key] = {}
+        return digests
+
+    def _modified(self):
+        """Drops the data cached about the Passage, called whenever it is modified."""
+        self._digest_cache = None
+
     def copy(self, layers=None):
         """Copies the Passage and specified layers to a new object.
 
@@ -1085,6 +1559,7 @@ class Passage:
         if node.ID in self._nodes:
             raise DuplicateIdError(node.ID)
         self._nodes[node.ID] = node
+        self._modified()
 
     def _remove_node(self, node):
         """Removes a :class:`Node` object from the :class:`Passage`.
@@ -1096,6 +1571,9 @@ class Passage:
 
         """
         del self._nodes[node.ID]
+        self._modified()
+        if self._listeners:
+            self._notify("node_removed", node)
 
     @ModifyPassage
     def _add_edge(self, edge):
@@ -1106,8 +1584,12 @@ class Passage:
         :param edge: the Edge object to add
 
         """
-        # Currently no work is done in the Passage level
-        edge.parent.layer._add_edge(edge)
+        self._modified()
+        edge.parent.layer._invalidate(edge.parent)
+        if not self._bulk:
+            edge.parent.layer._add_edge(edge)
+        if self._listeners:
+            self._notify("edge_added", edge)
 
     def _remove_edge(self, edge):
         """Removes a :class:`Edge` object from :class:`Passage`.
@@ -1117,8 +1599,12 @@ class Passage:
         :param edge: the Edge object to remove
 
         """
-        # Currently no work is done in the Passage level
-        edge.parent.layer._remove_edge(edge)
+        self._modified()
+        edge.parent.layer._invalidate(edge.parent)
+        if not self._bulk:
+            edge.parent.layer._remove_edge(edge)
+        if self._listeners:
+            self._notify("edge_removed", edge)
 
     def _change_edge_tag(self, edge, old_tag):
         """Updates the :class:`Passage` and :class:`Layer` objects with the change.
@@ -1127,8 +1613,11 @@ class Passage:
             old_tag: the Edge's tag before the change
 
         """
-        # Currently no work is done in the Passage level
-        edge.parent.layer._change_edge_tag(edge, old_tag)
+        self._modified()
+        if not self._bulk:
+            edge.parent.layer._change_edge_tag(edge, old_tag)
+        if self._listeners:
+            self._notify("edge_tag_changed", edge, old_tag)
 
     def _change_node_tag(self, node, old_tag):
         """Updates the :class:`Passage` and :class:`Layer` objects with the change.
@@ -1137,8 +1626,19 @@ class Passage:
             old_tag: the Node's tag before the change
 
         """
-        # Currently no work is done in the Passage level
-        node.layer._change_node_tag(node, old_tag)
+        self._modified()
+        for edge in node._incoming:  # the parents may depend on the tags of their children, e.g. punctuation
+            edge.parent.layer._invalidate(edge.parent)
+        for edge in node._outgoing:  # and the children on the tags of their parents
+            edge.child._parents_changed()
+        if not self._bulk:
+            node.layer._change_node_tag(node, old_tag)
+        if self._listeners:
+            self._notify("node_tag_changed", node, old_tag)
+
+    def _attrib_changed(self):
+        """Called when the attributes of the Passage change."""
+        pass
 
     def __str__(self):
         try:
@@ -329,7 +329,7 @@ def evaluate(guessed, ref, converter=None, verbose=False, constructions=DEFAULT,
              units=False, fscore=True, errors=False, normalize=True, eval_type=None, ref_yield_tags=None, **kwargs):
     """
     Compare two passages and return requested diagnostics and scores, possibly printing them too.
-    NOTE: since normalize=True by default, this method is destructive: it modifies the given passages before evaluation.
+    If normalize=True (the default), the passages are copied before being normalized, so they are not modified.
     :param guessed: Passage object to evaluate
     :param ref: reference Passage object to compare to
     :param converter: optional function to apply to passages before evaluation
@@ -338,7 +338,7 @@ def evaluate(guessed, ref, converter=None, verbose=False, constructions=DEFAULT,
     :param units: whether to evaluate common units
     :param fscore: whether to compute precision, recall and f1 score
     :param errors: whether to print the mistakes
-    :param normalize: flatten centers and move common functions to root before evaluation - modifies passages
+    :param normalize: flatten centers and move common functions to root before evaluation (on copies of the passages)
     :param eval_type: specific evaluation type(s) to limit to
     :param ref_yield_tags: reference passage for fine-grained evaluation
     :return: Scores object
@@ -347,7 +347,8 @@ def evaluate(guessed, ref, converter=None, verbose=False, constructions=DEFAULT,
     if converter is not None:
         guessed = converter(guessed)
         ref = converter(ref)
-    if normalize:  # FIXME clone passages to avoid modifying the original ones
+    if normalize:
+        guessed, ref = [passage.copy([layer0.LAYER_ID, layer1.LAYER_ID]) for passage in (guessed, ref)]
         for passage in (guessed, ref):
             normalization.normalize(passage)  # flatten Cs inside Cs
         move_functions(guessed, ref)  # move common Fs to be under the root, FIXME should be before normalize
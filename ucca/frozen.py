@@ -0,0 +1,971 @@
+"""Read-only, array-backed form of a :class:`core`.Passage, for memory-efficient analytics.
+
+A :class:`FrozenPassage` holds the whole annotation graph of a Passage in a
+handful of NumPy arrays, indexed by node (in the order of the Layers and of
+:attr:`core.Layer.all`), by edge (grouped by parent, in outgoing order) and by
+edge category: tag codes, CSR child and parent adjacency, remote and implicit
+flags, Terminal paragraphs and the spans of the FoundationalNodes. Node IDs and
+Terminal texts are stored in single string buffers, and tags in one table of
+strings. Rare attributes and extra data are kept in dictionaries by index.
+Terminal attributes are kept in the arrays if they have the usual keys, in
+the same order for all Terminals of the passage (kept in terminal_attrib_keys).
+
+The arrays may be used directly for vectorized computation over a corpus.
+A FrozenPassage takes about a tenth of the memory of a Passage with thousands
+of nodes, but only a third for a passage of a few dozen nodes: it has a fixed
+cost of about 4KB (mostly a NumPy array object per array), and extra data and
+non-default attributes are still kept as dictionaries.
+Node, Edge and Layer objects are only created on access, as light-weight
+:class:`FrozenNode`, :class:`FrozenEdge` and :class:`FrozenLayer` views, which
+support the read side of the :class:`core`.Node, :class:`core`.Edge,
+:class:`layer0`.Terminal and :class:`layer1`.FoundationalNode APIs.
+
+Use :func:`freeze` to create a FrozenPassage, and :meth:`FrozenPassage.thaw`
+to get back a regular Passage that can be modified. Use :func:`save` and
+:func:`load` to write and read it as a file, and :func:`load_passage` to read
+a file as a regular Passage.
+
+A FrozenPassage is also the compact binary file format of UCCA passages, written
+by :meth:`FrozenPassage.to_bytes` and read by :meth:`FrozenPassage.from_buffer`.
+Its layout, with all numbers little-endian, is:
+
+    MAGIC (8 bytes), format version (uint32), reserved (uint32, 0),
+    header size (uint64), header, array data
+
+The header is a UTF-8 JSON object with all fields of the FrozenPassage except
+the arrays, padded by spaces so that the array data starts at a multiple of 8
+bytes. Dictionaries (attributes and extra data) are stored as lists of [key,
+value] pairs, and classes by their names, out of CLASSES. The "arrays" field
+lists [name, dtype, length, offset] for each of ARRAYS, where dtype is one of
+DTYPES and offset is in bytes from the start of the array data, each array
+aligned to 8 bytes. The "terminal_attrib_keys" field was added without a new
+version, so it defaults to TERMINAL_ATTRIB_KEYS if missing. Nothing is
+unpickled or evaluated when reading, so files from untrusted sources may be
+read. Values in attributes and extra data must be JSON-serializable, and as in
+the standard XML format, tuples are read as lists and the keys of nested
+dictionaries as strings.
+
+"""
+
+import json
+import math
+import mmap
+import operator
+import struct
+from types import MappingProxyType
+
+import numpy as np
+
+from ucca import core, layer0, layer1
+
+# Names of the NumPy arrays of a FrozenPassage, which fully describe its graph structure together with the
+# string table, string buffers and sparse dictionaries
+NODE_ARRAYS = ("node_class", "node_tag", "node_id_offsets", "node_text_offsets", "node_paragraph", "node_para_pos",
+               "node_implicit", "span_start", "span_end", "span_size", "child_offsets", "parent_offsets")
+EDGE_ARRAYS = ("edge_child", "edge_tag", "edge_remote", "category_offsets", "parent_edges")
+CATEGORY_ARRAYS = ("category_tag", "category_slot", "category_layer", "category_parent")
+ARRAYS = ("layer_offsets",) + NODE_ARRAYS + EDGE_ARRAYS + CATEGORY_ARRAYS
+
+TERMINAL_ATTRIB_KEYS = layer0.ATTRIB_KEYS
+
+# The binary format, see the module documentation
+MAGIC = b"\x89UCCA\x1a\r\n"
+VERSION = 1
+SUFFIX = ".frozen"
+PREAMBLE = struct.Struct("<8sIIQ")  # magic, version, reserved, header size
+ALIGNMENT = 8
+CLASSES = (core.Layer, core.Node, layer0.Layer0, layer0.Terminal,
+           layer1.Layer1, layer1.FoundationalNode, layer1.PunctNode, layer1.Linkage)
+CLASS_NAMES = {cls: cls.__module__ + "." + cls.__qualname__ for cls in CLASSES}
+DTYPES = ("<i4", "<i8", "|b1")
+_CLASSES_BY_NAME = {name: cls for cls, name in CLASS_NAMES.items()}
+_NUMPY_DTYPES = {dtype: np.dtype(dtype) for dtype in DTYPES}  # parsed once rather than for each array read
+
+
+class FrozenPassage:
+    """Read-only annotated passage, with its graph stored in NumPy arrays.
+
+    Attributes:
+        ID: the ID of the Passage
+        attrib: read-only view of the attribute dictionary of the Passage
+        extra: the extra data of the Passage
+        frozen: always True
+        layers: the :class:`FrozenLayer` views of all the Layers
+        nodes: read-only dictionary of ID to :class:`FrozenNode` views, created on each access
+        classes: tuple of the Layer and Node classes, indexed by class codes,
+            used to create the objects when thawed
+        strings: tuple of all tags and category values, indexed by their codes in the arrays
+        layer_specs: tuple of (ID, class code, attrib, extra) for each Layer
+        terminal_attrib_keys: order of the keys of Terminal attributes stored in the arrays,
+            out of TERMINAL_ATTRIB_KEYS
+        node_ids: all node IDs, concatenated
+        texts: all Terminal texts, concatenated
+        node_attribs, node_extras, edge_attribs, edge_extras: dictionaries from
+            node/edge index to its attributes (unless they are stored in the
+            arrays, which is the usual case) or extra data (if it has any)
+        layer_offsets: node index range of each Layer, of length #layers + 1
+        node_class: class code of each node
+        node_tag: tag code of each node
+        node_id_offsets, node_text_offsets: ranges of the ID and text of each
+            node in node_ids and texts (the texts of non-Terminals are empty)
+        node_paragraph, node_para_pos: paragraph and position in the paragraph
+            of each Terminal, 0 for other nodes
+        node_implicit: whether each node is implicit
+        span_start, span_end, span_size: the first and last position, and the
+            number of Terminals in the span of each Terminal and FoundationalNode,
+            (-1, -1, 0) for other nodes and for nodes without Terminals
+        child_offsets: edge index range of the outgoing edges of each node
+        parent_offsets: range in parent_edges of the incoming edges of each node
+        edge_child: child node index of each edge
+        edge_tag: tag code of the first category of each edge, -1 if it has none
+        edge_remote: whether each edge is remote
+        category_offsets: category index range of each edge
+        parent_edges: edge indices of the incoming edges of all nodes, in order
+        category_tag, category_slot, category_layer, category_parent: codes of
+            the fields of each edge category
+
+    """
+
+    __slots__ = ("ID", "_attrib", "extra", "classes", "strings", "layer_specs", "node_ids", "texts", "node_attribs",
+                 "node_extras", "edge_attribs", "edge_extras", "terminal_attrib_keys", "_codes", "_index",
+                 "_layers") + ARRAYS
+
+    def __init__(self, ID, attrib, extra, classes, strings, layer_specs, node_ids, texts, arrays,
+                 node_attribs=None, node_extras=None, edge_attribs=None, edge_extras=None,
+                 terminal_attrib_keys=TERMINAL_ATTRIB_KEYS):
+        """Creates a FrozenPassage from its components, usually called by :func:`freeze`.
+
+        :param see :class:`FrozenPassage` documentation; arrays is a dictionary
+            of name to NumPy array, with all names in ARRAYS.
+
+        """
+        self.ID = ID
+        self._attrib = attrib
+        self.extra = extra
+        self.classes = tuple(classes)
+        self.strings = tuple(strings)
+        self.layer_specs = tuple(layer_specs)
+        self.node_ids = node_ids
+        self.texts = texts
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.node_attribs = node_attribs or {}
+        self.node_extras = node_extras or {}
+        self.edge_attribs = edge_attribs or {}
+        self.edge_extras = edge_extras or {}
+        self.terminal_attrib_keys = tuple(terminal_attrib_keys)
+        self._codes = None
+        self._index = None
+        self._layers = tuple(FrozenLayer(self, i) for i in range(len(self.layer_specs)))
+
+    @property
+    def attrib(self):
+        return MappingProxyType(self._attrib)
+
+    @property
+    def frozen(self):
+        return True
+
+    @property
+    def root(self):
+        return self
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @property
+    def nodes(self):
+        return MappingProxyType({node.ID: node for layer in self._layers for node in layer.all})
+
+    @property
+    def arrays(self):
+        """A dictionary of all the NumPy arrays, by name."""
+        return {name: getattr(self, name) for name in ARRAYS}
+
+    @property
+    def node_layer(self):
+        """Layer index of each node, computed from layer_offsets."""
+        return np.repeat(np.arange(len(self._layers), dtype=np.int32), np.diff(self.layer_offsets))
+
+    @property
+    def edge_parent(self):
+        """Parent node index of each edge, computed from child_offsets."""
+        return np.repeat(np.arange(len(self.node_tag), dtype=np.int32), np.diff(self.child_offsets))
+
+    def code(self, string):
+        """Returns the code of a tag or category value in the arrays, or -1 if it is not used in the passage."""
+        if self._codes is None:
+            self._codes = {s: i for i, s in enumerate(self.strings)}
+        return self._codes.get(string, -1)
+
+    def layer(self, ID):
+        """Returns the :class:`FrozenLayer` whose ID is given.
+
+        :param ID: ID of the Layer requested.
+
+        :raise KeyError: if no Layer with this ID is present
+
+        """
+        for layer in self._layers:
+            if layer.ID == ID:
+                return layer
+        raise KeyError("Layer '%s' not found in passage '%s'" % (ID, self.ID))
+
+    def by_id(self, ID):
+        """Returns the :class:`FrozenNode` whose ID is given.
+
+        :param ID: ID string
+        :return: the FrozenNode whose ID matches
+        :raise KeyError: if no node with this ID is found
+        """
+        if self._index is None:
+            self._index = {self._node_id(i): i for i in range(len(self.node_tag))}
+        try:
+            return FrozenNode(self, self._index[ID])
+        except KeyError as e:
+            raise KeyError("Node '%s' not found in passage '%s'" % (ID, self.ID)) from e
+
+    def thaw(self):
+        """Creates a regular :class:`core`.Passage with the same annotation.
+
+        Custom order key functions of Layers and Nodes are not kept, so they get the default ones.
+        Nodes and Edges are created directly from the arrays, in order, rather than added one by one by
+        the :class:`core`.Node constructor and :meth:`core.Node.add_multiple`, which would check and update
+        the Passage and its Layers on each addition.
+
+        :return: a new Passage, which may be modified
+        """
+        passage = core.Passage(self.ID, attrib=dict(self._attrib))
+        passage.extra = dict(self.extra)
+        # plain lists are much faster to index than NumPy arrays
+        (layer_offsets, node_class, node_tag, id_offsets, text_offsets, paragraphs, para_positions, implicit,
+         child_offsets, parent_offsets, edge_child, edge_remote, category_offsets, parent_edges) = (
+            getattr(self, name).tolist() for name in (
+                "layer_offsets", "node_class", "node_tag", "node_id_offsets", "node_text_offsets", "node_paragraph",
+                "node_para_pos", "node_implicit", "child_offsets", "parent_offsets", "edge_child", "edge_remote",
+                "category_offsets", "parent_edges"))
+        strings, classes, node_ids, texts = self.strings, self.classes, self.node_ids, self.texts
+        terminal_attrib_keys, terminal_attrib_values = self.terminal_attrib_keys, self._terminal_attrib_values
+        node_attribs, node_extras, edge_attribs, edge_extras = (
+            self.node_attribs, self.node_extras, self.edge_attribs, self.edge_extras)
+        categories = [(strings[tag], strings[slot], strings[layer_id], strings[parent])
+                      for tag, slot, layer_id, parent in zip(*(getattr(self, name).tolist()
+                                                              for name in CATEGORY_ARRAYS))]
+        nodes = []
+        edges = []
+        passage_nodes, separator, new = passage._nodes, core.Node.ID_SEPARATOR, object.__new__
+        with passage.bulk_build():  # the Layers are finalized once, when all Nodes and Edges are there
+            for layer_index, (layer_id, class_code, attrib, extra) in enumerate(self.layer_specs):
+                cls = classes[class_code]
+                layer = cls(ID=layer_id, root=passage, attrib=dict(attrib)) if cls is core.Layer else \
+                    cls(root=passage, attrib=dict(attrib))
+                layer.extra = dict(extra)
+                layer_id = layer.ID  # shared by the sort keys of its Nodes, as in the Node constructor
+                created_nodes = {node.ID: node for node in layer.all}  # some nodes are created with the layer
+                new_nodes = []
+                for i in range(layer_offsets[layer_index], layer_offsets[layer_index + 1]):
+                    ID = node_ids[id_offsets[i]:id_offsets[i + 1]]
+                    attrib = node_attribs.get(i)
+                    if attrib is not None:
+                        attrib = dict(attrib)
+                    elif paragraphs[i]:  # a Terminal
+                        attrib = dict(zip(terminal_attrib_keys, terminal_attrib_values(
+                            (texts[text_offsets[i]:text_offsets[i + 1]], paragraphs[i], para_positions[i]))))
+                    elif implicit[i]:
+                        attrib = {"implicit": True}
+                    node = created_nodes.get(ID)
+                    if node is None:
+                        cls = classes[node_class[i]]
+                        if cls.__init__ is not core.Node.__init__:
+                            node = cls(ID=ID, root=passage, tag=strings[node_tag[i]], attrib=attrib)
+                        else:  # as the constructor does, but without adding the Node to the Layer yet
+                            node_layer_id, _, unique = ID.partition(separator)
+                            if node_layer_id != layer_id:
+                                raise ValueError("Node '%s' is not in layer '%s'" % (ID, layer_id))
+                            if ID in passage_nodes:
+                                raise core.DuplicateIdError(ID)
+                            node = new(cls)
+                            node._tag = strings[node_tag[i]]
+                            node._root = passage
+                            node._ID = ID
+                            node._sortkey = (layer_id, int(unique)) if unique.isdigit() else \
+                                (layer_id, math.inf, unique)
+                            node._layer = layer
+                            node._attrib = core._AttributeDict(node)
+                            node._attrib._dict = attrib  # not copied, since it is new
+                            node._extra = None
+                            node._outgoing = []
+                            node._incoming = []
+                            node._orderkey = core.edge_id_orderkey
+                            node._tag_index = None
+                            passage_nodes[ID] = node
+                            new_nodes.append(node)
+                    elif attrib:
+                        node.attrib.update(attrib)
+                    extra = node_extras.get(i)
+                    if extra:
+                        node.extra = dict(extra)
+                    nodes.append(node)
+                layer._add_nodes(new_nodes)
+            # The outgoing Edges of each Node are stored in order, and so are the incoming ones (see freeze).
+            # They are created as the Edge constructor and Edge.add would, without updating the Passage each time.
+            for i, node in enumerate(nodes):
+                outgoing = node._outgoing
+                for e in range(child_offsets[i], child_offsets[i + 1]):
+                    edge = new(core.Edge)
+                    edge._root = passage
+                    edge._parent = node
+                    edge._child = nodes[edge_child[e]]
+                    edge._attrib = core._AttributeDict(edge)
+                    attrib = edge_attribs.get(e)
+                    if attrib is not None:
+                        edge._attrib._dict = dict(attrib)
+                    elif edge_remote[e]:
+                        edge._attrib._dict = {"remote": True}
+                    edge._categories = edge_categories = []
+                    for tag, slot, layer_id, parent in categories[category_offsets[e]:category_offsets[e + 1]]:
+                        category = new(core.Category)
+                        category._tag = tag
+                        category._slot = slot
+                        category._layer = layer_id
+                        category._parent = parent
+                        category._extra = None
+                        category._edge = edge
+                        edge_categories.append(category)
+                    edge._tags = None
+                    edge._extra = None
+                    extra = edge_extras.get(e)
+                    if extra:
+                        edge.extra = dict(extra)
+                    outgoing.append(edge)
+                    edges.append(edge)
+            for i, node in enumerate(nodes):
+                node._incoming += [edges[e] for e in parent_edges[parent_offsets[i]:parent_offsets[i + 1]]]
+            for tag, slot, layer_id, parent in dict.fromkeys(categories):  # as Edge.add does for each category
+                if tag not in passage._categories:
+                    passage._categories[tag] = {"layer": layer_id, "slot": slot, "parent": parent}
+                if parent and parent not in passage._refined_categories:
+                    passage._refined_categories.append(parent)
+            passage._modified()
+        return passage
+
+    def to_bytes(self):
+        """Serializes the FrozenPassage in the binary format (see the module documentation).
+
+        The array data can be read by :meth:`from_buffer` without copying, so the result may also be written
+        to shared memory or to a file and mapped by other processes.
+
+        :return: bytes object
+
+        :raise ValueError: if any Layer or Node class is not in CLASSES
+        :raise TypeError: if any attribute or extra value is not JSON-serializable
+        """
+        try:
+            classes = [CLASS_NAMES[cls] for cls in self.classes]
+        except KeyError as e:
+            raise ValueError("Class %s of passage '%s' cannot be written" % (e.args[0], self.ID)) from e
+        specs = []
+        chunks = []
+        offset = 0
+        for name in ARRAYS:
+            array = getattr(self, name)
+            array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+            specs.append((name, array.dtype.str, len(array), offset))
+            data = array.tobytes()
+            chunks.append(data + bytes(-len(data) % ALIGNMENT))
+            offset += len(chunks[-1])
+        header = json.dumps(dict(
+            ID=self.ID, attrib=_pairs(self._attrib), extra=_pairs(self.extra), classes=classes,
+            strings=self.strings, layer_specs=[(layer_id, class_code, _pairs(attrib), _pairs(extra))
+                                               for layer_id, class_code, attrib, extra in self.layer_specs],
+            node_ids=self.node_ids, texts=self.texts,
+            node_attribs=_indexed_pairs(self.node_attribs), node_extras=_indexed_pairs(self.node_extras),
+            edge_attribs=_indexed_pairs(self.edge_attribs), edge_extras=_indexed_pairs(self.edge_extras),
+            terminal_attrib_keys=self.terminal_attrib_keys, arrays=specs),
+            ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        header += b" " * (-(PREAMBLE.size + len(header)) % ALIGNMENT)
+        return b"".join([PREAMBLE.pack(MAGIC, VERSION, 0, len(header)), header] + chunks)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Reads a FrozenPassage in the binary format, as created by :meth:`to_bytes`.
+
+        The arrays of the FrozenPassage are read-only views of the buffer rather than copies, so the buffer
+        (e.g. an mmap object or a shared memory block) must stay open as long as the FrozenPassage is used.
+
+        :param buffer: object supporting the buffer protocol, such as bytes, memoryview or mmap
+
+        :return: a new FrozenPassage
+
+        :raise ValueError: if the buffer is not in the binary format, or of a newer version
+        """
+        buffer = memoryview(buffer).cast("B")
+        if not is_frozen(buffer):
+            raise ValueError("Not a frozen passage")
+        try:
+            _, version, _, header_size = PREAMBLE.unpack_from(buffer)
+        except struct.error as e:
+            raise ValueError("Invalid frozen passage: %s" % e) from e
+        if version > VERSION:
+            raise ValueError("Frozen passage format version %d is newer than the supported version %d" % (
+                version, VERSION))
+        start = PREAMBLE.size + header_size
+        try:
+            header = json.loads(bytes(buffer[PREAMBLE.size:start]).decode("utf-8"))
+            classes = [_CLASSES_BY_NAME[name] for name in header.pop("classes")]
+            specs = {name: (dtype, length, offset) for name, dtype, length, offset in header.pop("arrays")}
+            if set(specs) != set(ARRAYS) or any(dtype not in DTYPES for dtype, _, _ in specs.values()):
+                raise ValueError("Invalid arrays: %s" % specs)
+            terminal_attrib_keys = header.get("terminal_attrib_keys", TERMINAL_ATTRIB_KEYS)  # added later
+            if sorted(terminal_attrib_keys) != sorted(TERMINAL_ATTRIB_KEYS):
+                raise ValueError("Invalid terminal attribute keys: %s" % terminal_attrib_keys)
+            data = np.frombuffer(buffer, dtype=np.uint8, offset=start)  # viewed as each array, which is faster
+            arrays = {name: data[offset:offset + length * _NUMPY_DTYPES[dtype].itemsize].view(_NUMPY_DTYPES[dtype])
+                      for name, (dtype, length, offset) in specs.items()}
+            return cls(header["ID"], dict(header["attrib"]), dict(header["extra"]), classes,
+                       header["strings"], [(layer_id, class_code, dict(attrib), dict(extra))
+                                           for layer_id, class_code, attrib, extra in header["layer_specs"]],
+                       header["node_ids"], header["texts"], arrays,
+                       node_attribs=_from_indexed_pairs(header["node_attribs"]),
+                       node_extras=_from_indexed_pairs(header["node_extras"]),
+                       edge_attribs=_from_indexed_pairs(header["edge_attribs"]),
+                       edge_extras=_from_indexed_pairs(header["edge_extras"]),
+                       terminal_attrib_keys=terminal_attrib_keys)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("Invalid frozen passage: %s" % e) from e
+
+    def _node_id(self, i):
+        return self.node_ids[self.node_id_offsets[i]:self.node_id_offsets[i + 1]]
+
+    def _node_attrib(self, i):
+        attrib = self.node_attribs.get(i)
+        if attrib is not None:
+            return dict(attrib)
+        if self.node_paragraph[i]:  # a Terminal
+            return dict(zip(self.terminal_attrib_keys, self._terminal_attrib_values((
+                self.texts[self.node_text_offsets[i]:self.node_text_offsets[i + 1]],
+                int(self.node_paragraph[i]), int(self.node_para_pos[i])))))
+        return {"implicit": True} if self.node_implicit[i] else {}
+
+    @property
+    def _terminal_attrib_values(self):
+        """Function from the values of TERMINAL_ATTRIB_KEYS to the values of terminal_attrib_keys."""
+        return operator.itemgetter(*map(TERMINAL_ATTRIB_KEYS.index, self.terminal_attrib_keys))
+
+    def _edge_attrib(self, e):
+        attrib = self.edge_attribs.get(e)
+        if attrib is not None:
+            return dict(attrib)
+        return {"remote": True} if self.edge_remote[e] else {}
+
+    def _categories(self, e):
+        return [(self.strings[self.category_tag[c]], self.strings[self.category_slot[c]],
+                 self.strings[self.category_layer[c]], self.strings[self.category_parent[c]])
+                for c in range(self.category_offsets[e], self.category_offsets[e + 1])]
+
+    def __str__(self):
+        return self.ID
+
+
+class FrozenLayer:
+    """View of a Layer of a :class:`FrozenPassage`.
+
+    Attributes:
+        ID, root, attrib, extra, all, heads: as in :class:`core`.Layer
+        start, stop: the range of node indices of the Layer in the arrays
+        words: (for the Terminals Layer) the word Terminals, without punctuation
+
+    """
+
+    __slots__ = ("_root", "_index")
+
+    def __init__(self, root, index):
+        self._root = root
+        self._index = index
+
+    @property
+    def ID(self):
+        return self._root.layer_specs[self._index][0]
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def attrib(self):
+        return MappingProxyType(self._root.layer_specs[self._index][2])
+
+    @property
+    def extra(self):
+        return self._root.layer_specs[self._index][3]
+
+    @property
+    def start(self):
+        return int(self._root.layer_offsets[self._index])
+
+    @property
+    def stop(self):
+        return int(self._root.layer_offsets[self._index + 1])
+
+    @property
+    def all(self):
+        return tuple(FrozenNode(self._root, i) for i in range(self.start, self.stop))
+
+    @property
+    def heads(self):
+        """The nodes of the Layer without parents in the Layer."""
+        root = self._root
+        node_layer = root.node_layer
+        edge_parent = root.edge_parent
+        has_parent = np.zeros(len(node_layer), dtype=bool)
+        has_parent[root.edge_child[node_layer[edge_parent] == node_layer[root.edge_child]]] = True
+        return tuple(FrozenNode(root, i) for i in range(self.start, self.stop) if not has_parent[i])
+
+    @property
+    def words(self):
+        punct = self._root.code(layer0.NodeTags.Punct)
+        return tuple(FrozenNode(self._root, i) for i in range(self.start, self.stop)
+                     if self._root.node_tag[i] != punct)
+
+    def by_position(self, pos):
+        """Returns the Terminal at the position given, if this is the Terminals Layer.
+
+        :param pos: the position of the Terminal object
+        :return: the Terminal in this position
+        :raise IndexError: if the position is out of bounds
+        """
+        if not 0 < pos <= self.stop - self.start:
+            raise IndexError("Position %d out of bounds in layer '%s'" % (pos, self.ID))
+        return FrozenNode(self._root, self.start + pos - 1)  # positions start at 1, not 0
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenLayer) and self._root is other._root and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._root), self._index))
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, self.ID)
+
+
+class FrozenEdge:
+    """View of an Edge of a :class:`FrozenPassage`.
+
+    Attributes:
+        ID, root, attrib, extra, tag, tags, categories, parent, child: as in :class:`core`.Edge
+
+    """
+
+    __slots__ = ("_root", "_index")
+
+    def __init__(self, root, index):
+        self._root = root
+        self._index = index
+
+    @property
+    def ID(self):
+        return core.Edge.ID_FORMAT.format(self.parent.ID, self.child.ID)
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def attrib(self):
+        return MappingProxyType(self._root._edge_attrib(self._index))
+
+    @property
+    def extra(self):
+        return MappingProxyType(self._root.edge_extras.get(self._index, {}))
+
+    @property
+    def tag(self):
+        code = self._root.edge_tag[self._index]
+        if code < 0:
+            raise IndexError("Edge %s has no categories" % self.ID)
+        return self._root.strings[code]
+
+    @property
+    def tags(self):
+        root = self._root
+        return tuple(root.strings[c] for c in
+                     root.category_tag[root.category_offsets[self._index]:root.category_offsets[self._index + 1]])
+
+    @property
+    def categories(self):
+        return [core.Category(*c) for c in self._root._categories(self._index)]
+
+    @property
+    def parent(self):
+        return FrozenNode(self._root, int(np.searchsorted(self._root.child_offsets, self._index, side="right")) - 1)
+
+    @property
+    def child(self):
+        return FrozenNode(self._root, int(self._root.edge_child[self._index]))
+
+    def __getitem__(self, index):
+        return self.categories[index]
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenEdge) and self._root is other._root and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._root), self._index))
+
+    def __repr__(self):
+        return self.ID
+
+
+class FrozenNode:
+    """View of a Node of a :class:`FrozenPassage`.
+
+    Supports the read side of :class:`core`.Node, :class:`layer0`.Terminal,
+    :class:`layer1`.FoundationalNode and :class:`layer1`.Linkage, according to its layer and tag.
+
+    """
+
+    __slots__ = ("_root", "_index")
+
+    def __init__(self, root, index):
+        self._root = root
+        self._index = index
+
+    @property
+    def ID(self):
+        return self._root._node_id(self._index)
+
+    @property
+    def tag(self):
+        return self._root.strings[self._root.node_tag[self._index]]
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def layer(self):
+        return self._root.layers[int(np.searchsorted(self._root.layer_offsets, self._index, side="right")) - 1]
+
+    @property
+    def attrib(self):
+        return MappingProxyType(self._root._node_attrib(self._index))
+
+    @property
+    def extra(self):
+        return MappingProxyType(self._root.node_extras.get(self._index, {}))
+
+    @property
+    def _outgoing(self):
+        root = self._root
+        offsets = root.child_offsets
+        return [FrozenEdge(root, e) for e in range(offsets[self._index], offsets[self._index + 1])]
+
+    @property
+    def outgoing(self):
+        return tuple(self._outgoing)
+
+    @property
+    def incoming(self):
+        root = self._root
+        return tuple(FrozenEdge(root, int(e)) for e in
+                     root.parent_edges[root.parent_offsets[self._index]:root.parent_offsets[self._index + 1]])
+
+    @property
+    def parents(self):
+        return [edge.parent for edge in self.incoming]
+
+    @property
+    def children(self):
+        return [edge.child for edge in self._outgoing]
+
+    def __bool__(self):
+        return True
+
+    def __len__(self):
+        return int(self._root.child_offsets[self._index + 1] - self._root.child_offsets[self._index])
+
+    def __getitem__(self, index):
+        return self._outgoing[index]
+
+    def __iter__(self):
+        return iter(self._outgoing)
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenNode) and self._root is other._root and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._root), self._index))
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, self.ID)
+
+    iter = core.Node.iter  # relies only on _outgoing, children and iteration over the outgoing edges
+
+    def _edges_by_tag(self):
+        edges_by_tag = {}
+        for edge in self._outgoing:
+            for tag in edge.tags:
+                edges_by_tag.setdefault(tag, []).append(edge)
+        return edges_by_tag
+
+    # Terminal attributes
+    @property
+    def text(self):
+        return self._root.texts[self._root.node_text_offsets[self._index]:self._root.node_text_offsets[self._index + 1]]
+
+    @property
+    def position(self):
+        return int(self._root.span_start[self._index])
+
+    @property
+    def paragraph(self):
+        return int(self._root.node_paragraph[self._index])
+
+    @property
+    def para_pos(self):
+        return int(self._root.node_para_pos[self._index])
+
+    @property
+    def punct(self):
+        return self.tag == layer0.NodeTags.Punct
+
+    # FoundationalNode and Linkage attributes, which only use _edges_by_tag, _fedge and _get_terminals
+    participants = layer1.FoundationalNode.participants
+    adverbials = layer1.FoundationalNode.adverbials
+    times = layer1.FoundationalNode.times
+    quantifiers = layer1.FoundationalNode.quantifiers
+    grounds = layer1.FoundationalNode.grounds
+    centers = layer1.FoundationalNode.centers
+    elaborators = layer1.FoundationalNode.elaborators
+    linkers = layer1.FoundationalNode.linkers
+    parallel_scenes = layer1.FoundationalNode.parallel_scenes
+    functions = layer1.FoundationalNode.functions
+    punctuation = layer1.FoundationalNode.punctuation
+    process = layer1.FoundationalNode.process
+    state = layer1.FoundationalNode.state
+    connector = layer1.FoundationalNode.connector
+    relator = layer1.FoundationalNode.relator
+    is_scene = layer1.FoundationalNode.is_scene
+    fparent = layer1.FoundationalNode.fparent
+    ftag = layer1.FoundationalNode.ftag
+    ftags = layer1.FoundationalNode.ftags
+    relation = layer1.Linkage.relation
+    arguments = layer1.Linkage.arguments
+
+    @property
+    def terminals(self):
+        if self.tag == layer1.NodeTags.Punctuation:
+            return self.children
+        return layer1.FoundationalNode.terminals.fget(self)
+
+    def _fedge(self):
+        for edge in self.incoming:
+            if (edge.parent.layer.ID == layer1.LAYER_ID and edge.parent.tag == layer1.NodeTags.Foundational and
+                    not edge._root.edge_remote[edge._index]):
+                return edge
+        return None
+
+    def get_terminals(self, punct=True, remotes=False):
+        """Returns a list of all Terminals under the span of this node.
+
+        :param punct: whether to include punctuation Terminals, defaults to True
+        :param remotes: whether to include Terminals from remote FoundationalNodes, defaults to false
+
+        :return: a list of FrozenNode views of Terminals, sorted by position for FoundationalNodes
+        """
+        return list(self._get_terminals(punct=punct, remotes=remotes))
+
+    def _get_terminals(self, punct=True, remotes=False):
+        if self.layer.ID == layer0.LAYER_ID:
+            return () if self.punct and not punct else (self,)
+        if self.tag == layer1.NodeTags.Punctuation:
+            return tuple(self.children) if punct else ()
+        return tuple(sorted(self._span(punct, remotes, {self._index}), key=operator.attrgetter("position")))
+
+    def _span(self, punct, remotes, in_progress):
+        """Returns the unsorted Terminals under a FoundationalNode, like :meth:`layer1.Layer1._get_terminals`."""
+        terminals = []
+        for edge in self._outgoing:
+            if remotes or not self._root.edge_remote[edge._index]:
+                child = edge.child
+                if child.layer.ID == layer1.LAYER_ID and child.tag != layer1.NodeTags.Punctuation:
+                    if child._index not in in_progress:  # otherwise there is a cycle
+                        in_progress.add(child._index)
+                        terminals += child._span(punct, remotes, in_progress)
+                        in_progress.discard(child._index)
+                else:
+                    terminals += child._get_terminals(punct=punct, remotes=remotes)
+        return terminals
+
+    @property
+    def start_position(self):
+        return int(self._root.span_start[self._index])
+
+    @property
+    def end_position(self):
+        return int(self._root.span_end[self._index])
+
+    @property
+    def discontiguous(self):
+        root, i = self._root, self._index
+        return bool(root.span_size[i] and root.span_end[i] - root.span_start[i] + 1 != root.span_size[i])
+
+
+def save(passage, filename):
+    """Writes a passage to a file in the binary format.
+
+    :param passage: :class:`core`.Passage or :class:`FrozenPassage` to write
+    :param filename: file name to write to, usually with the SUFFIX extension
+    """
+    with open(filename, "wb") as f:
+        f.write((passage if isinstance(passage, FrozenPassage) else freeze(passage)).to_bytes())
+
+
+def load(filename):
+    """Reads a FrozenPassage from a file in the binary format.
+
+    The file is memory-mapped, so only the header is actually read until the arrays are accessed.
+
+    :param filename: file name to read from
+
+    :return: a new FrozenPassage
+    """
+    with open(filename, "rb") as f:
+        return FrozenPassage.from_buffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load_passage(filename):
+    """Reads a regular :class:`core`.Passage from a file in the binary format.
+
+    Unlike :func:`load`, the file is read whole rather than memory-mapped, since all of it is needed,
+    so it is not kept open or mapped once the Passage is read.
+
+    :param filename: file name to read from
+
+    :return: a new Passage
+    """
+    with open(filename, "rb") as f:
+        return FrozenPassage.from_buffer(f.read()).thaw()
+
+
+def is_frozen(buffer):
+    """Returns whether a buffer (e.g. the beginning of a file) starts like the binary format of a FrozenPassage.
+
+    :param buffer: bytes-like object
+    """
+    return bytes(buffer[:len(MAGIC)]) == MAGIC
+
+
+def _pairs(d):
+    return [[k, v] for k, v in d.items()]
+
+
+def _indexed_pairs(d):
+    return [[i, _pairs(v)] for i, v in sorted(d.items())]
+
+
+def _from_indexed_pairs(pairs):
+    return {i: dict(v) for i, v in pairs}
+
+
+def freeze(passage):
+    """Creates a :class:`FrozenPassage` with the same annotation as a Passage.
+
+    :param passage: the :class:`core`.Passage to freeze, which is not changed
+
+    :return: a new FrozenPassage
+    """
+    classes = {}
+    codes = {}
+
+    def _code(value, table):
+        return table.setdefault(value, len(table))
+
+    layer_specs = []
+    layer_offsets = [0]
+    nodes = []
+    for layer in passage.layers:
+        layer_specs.append((layer.ID, _code(type(layer), classes), layer.attrib.copy(), dict(layer.extra)))
+        nodes += layer.all
+        layer_offsets.append(len(nodes))
+    index = {id(node): i for i, node in enumerate(nodes)}
+    edges = [edge for node in nodes for edge in node]
+    terminal_attrib_keys = next((tuple(node.attrib) for node in nodes if isinstance(node, layer0.Terminal)
+                                 and sorted(node.attrib) == sorted(TERMINAL_ATTRIB_KEYS)), TERMINAL_ATTRIB_KEYS)
+    edge_index = {id(edge): e for e, edge in enumerate(edges)}
+
+    node_columns = {name: [] for name in ("node_class", "node_tag", "node_paragraph", "node_para_pos",
+                                          "node_implicit", "span_start", "span_end", "span_size")}
+    node_ids, texts, node_attribs, node_extras = [], [], {}, {}
+    child_offsets, parent_offsets, parent_edges = [0], [0], []
+    for i, node in enumerate(nodes):
+        attrib = node.attrib.copy()
+        node_columns["node_class"].append(_code(type(node), classes))
+        node_columns["node_tag"].append(_code(node.tag, codes))
+        node_ids.append(node.ID)
+        if isinstance(node, layer0.Terminal):
+            text, paragraph, para_pos = (attrib.get(key) for key in TERMINAL_ATTRIB_KEYS)
+            stored = {key: attrib.get(key) for key in terminal_attrib_keys}
+            if not (isinstance(text, str) and isinstance(paragraph, int) and isinstance(para_pos, int)
+                    and paragraph > 0):
+                text, paragraph, para_pos, stored = str(text), 0, 0, None
+            texts.append(text)
+            node_columns["node_paragraph"].append(paragraph)
+            node_columns["node_para_pos"].append(para_pos)
+            node_columns["node_implicit"].append(False)
+            terminals = (node,)
+        else:
+            texts.append("")
+            node_columns["node_paragraph"].append(0)
+            node_columns["node_para_pos"].append(0)
+            implicit = attrib.get("implicit") is True
+            stored = {"implicit": True} if implicit else {}
+            node_columns["node_implicit"].append(implicit)
+            terminals = node._get_terminals() if isinstance(node, layer1.FoundationalNode) else ()
+        if stored is None or list(attrib.items()) != list(stored.items()):
+            node_attribs[i] = attrib
+        if node._extra:
+            node_extras[i] = dict(node.extra)
+        node_columns["span_start"].append(terminals[0].position if terminals else -1)
+        node_columns["span_end"].append(terminals[-1].position if terminals else -1)
+        node_columns["span_size"].append(len(terminals))
+        child_offsets.append(child_offsets[-1] + len(node))
+        parent_edges += [edge_index[id(edge)] for edge in node.incoming]
+        parent_offsets.append(len(parent_edges))
+
+    edge_columns = {name: [] for name in ("edge_child", "edge_tag", "edge_remote") + CATEGORY_ARRAYS}
+    category_offsets = [0]
+    edge_attribs, edge_extras = {}, {}
+    for e, edge in enumerate(edges):
+        attrib = edge.attrib.copy()
+        edge_columns["edge_child"].append(index[id(edge.child)])
+        categories = edge.categories
+        edge_columns["edge_tag"].append(_code(categories[0].tag, codes) if categories else -1)
+        remote = attrib.get("remote") is True
+        edge_columns["edge_remote"].append(remote)
+        if attrib != ({"remote": True} if remote else {}):
+            edge_attribs[e] = attrib
+        if edge._extra:
+            edge_extras[e] = dict(edge.extra)
+        for category in categories:
+            for name, value in zip(CATEGORY_ARRAYS, category):
+                edge_columns[name].append(_code(value, codes))
+        category_offsets.append(category_offsets[-1] + len(categories))
+
+    def _offsets(strings):
+        return np.cumsum([0] + [len(s) for s in strings], dtype=np.int64)
+
+    arrays = dict(layer_offsets=np.array(layer_offsets, dtype=np.int32),
+                  node_id_offsets=_offsets(node_ids), node_text_offsets=_offsets(texts),
+                  child_offsets=np.array(child_offsets, dtype=np.int32),
+                  parent_offsets=np.array(parent_offsets, dtype=np.int32),
+                  parent_edges=np.array(parent_edges, dtype=np.int32),
+                  category_offsets=np.array(category_offsets, dtype=np.int32))
+    for columns in (node_columns, edge_columns):
+        for name, values in columns.items():
+            arrays[name] = np.array(values, dtype=bool if name in ("node_implicit", "edge_remote") else np.int32)
+    return FrozenPassage(passage.ID, passage.attrib.copy(), dict(passage.extra), classes, codes, layer_specs,
+                         "".join(node_ids), "".join(texts), arrays, node_attribs=node_attribs,
+                         node_extras=node_extras, edge_attribs=edge_attribs, edge_extras=edge_extras,
+                         terminal_attrib_keys=terminal_attrib_keys)
@@ -1,17 +1,22 @@
 """Input/output utility functions for UCCA scripts."""
+import mmap
 import os
 import sys
+import tempfile
 import time
 from collections import defaultdict
 from contextlib import contextmanager
 from glob import glob
 from itertools import filterfalse, chain
+from multiprocessing import Pool
 from xml.etree.ElementTree import ParseError
 
 from tqdm import tqdm
 
+from ucca.archive import Archive, is_archive_file
 from ucca.convert import file2passage, passage2file, from_text, to_text, split2segments
 from ucca.core import Passage
+from ucca.frozen import ALIGNMENT, FrozenPassage, freeze
 
 DEFAULT_LANG = "en"
 DEFAULT_ATTEMPTS = 3
@@ -23,7 +28,7 @@ class LazyLoadedPassages:
     Iterable interface to Passage objects that loads files on-the-go and can be iterated more than once
     """
     def __init__(self, files, sentences=False, paragraphs=False, converters=None, lang=DEFAULT_LANG,
-                 attempts=DEFAULT_ATTEMPTS, delay=DEFAULT_DELAY):
+                 attempts=DEFAULT_ATTEMPTS, delay=DEFAULT_DELAY, cache_dir=None):
         self.files = files
         self.sentences = sentences
         self.paragraphs = paragraphs
@@ -32,6 +37,7 @@ class LazyLoadedPassages:
         self.lang = lang
         self.attempts = attempts
         self.delay = delay
+        self.cache_dir = cache_dir
         self._files_iter = None
         self._split_iter = None
         self._file_handle = None
@@ -67,17 +73,21 @@ class LazyLoadedPassages:
                         print("Failed reading %s, trying %d more times..." % (file, attempts), file=sys.stderr)
                     time.sleep(self.delay)
                     attempts -= 1
-                try:
-                    passage = file2passage(file)  # XML or binary format
-                except (IOError, ParseError) as e:  # Failed to read as passage file
-                    base, ext = os.path.splitext(os.path.basename(file))
-                    converter = self.converters.get(ext.lstrip("."))
-                    if converter is None:
-                        raise IOError("Could not read %s file. See error message above. "
-                                      "If this file's format is not %s, try adding '.txt' suffix to read as plain text:"
-                                      " '%s'" % (ext, ext, file)) from e
-                    self._file_handle = open(file, encoding="utf-8")
-                    self._split_iter = iter(converter(chain(self._file_handle, [""]), passage_id=base, lang=self.lang))
+                if is_archive_file(file):  # Many passages in one file
+                    self._split_iter = _read_archive(file)
+                else:
+                    try:
+                        passage = file2passage(file, cache_dir=self.cache_dir)  # XML or binary format
+                    except (IOError, ParseError) as e:  # Failed to read as passage file
+                        base, ext = os.path.splitext(os.path.basename(file))
+                        converter = self.converters.get(ext.lstrip("."))
+                        if converter is None:
+                            raise IOError("Could not read %s file. See error message above. If this file's format "
+                                          "is not %s, try adding '.txt' suffix to read as plain text: '%s'" % (
+                                              ext, ext, file)) from e
+                        self._file_handle = open(file, encoding="utf-8")
+                        self._split_iter = iter(converter(chain(self._file_handle, [""]), passage_id=base,
+                                                          lang=self.lang))
             if self.split:
                 if self._split_iter is None:
                     self._split_iter = (passage,)
@@ -110,6 +120,11 @@ class LazyLoadedPassages:
         return bool(self.files)
 
 
+def _read_archive(filename):
+    with Archive(filename) as archive:
+        yield from archive.passages()
+
+
 def resolve_patterns(filename_patterns):
     for pattern in [filename_patterns] if isinstance(filename_patterns, str) else filename_patterns:
         yield from sorted(glob(pattern)) or [pattern]
@@ -142,7 +157,7 @@ def gen_files(files_and_dirs):
 
 
 def read_files_and_dirs(files_and_dirs, sentences=False, paragraphs=False, converters=None, lang=DEFAULT_LANG,
-                        attempts=DEFAULT_ATTEMPTS, delay=DEFAULT_DELAY):
+                        attempts=DEFAULT_ATTEMPTS, delay=DEFAULT_DELAY, cache_dir=None):
     """
     :param files_and_dirs: iterable of files and/or directories to look in
     :param sentences: whether to split to sentences
@@ -151,10 +166,13 @@ def read_files_and_dirs(files_and_dirs, sentences=False, paragraphs=False, conve
     :param lang: language to use for tokenization model
     :param attempts: number of times to try reading a file before giving up
     :param delay: number of seconds to wait before subsequent attempts to read a file
-    :return: lazy-loaded passages from all files given, plus any files directly under any directory given
+    :param cache_dir: directory of parsed passages to read unchanged XML files from and to add newly parsed ones to
+                      (see `ucca.cache'), defaults to the directory set by the UCCA_CACHE_DIR environment variable
+    :return: lazy-loaded passages from all files given, plus any files directly under any directory given,
+             where each archive file (see `ucca.archive') gives all passages in it
     """
     return LazyLoadedPassages(list(gen_files(files_and_dirs)), sentences=sentences, paragraphs=paragraphs,
-                              converters=converters, lang=lang, attempts=attempts, delay=delay)
+                              converters=converters, lang=lang, attempts=attempts, delay=delay, cache_dir=cache_dir)
 
 
 def write_passage(passage, output_format=None, binary=False, outdir=".", prefix="", converter=None, verbose=True,
@@ -162,12 +180,13 @@ def write_passage(passage, output_format=None, binary=False, outdir=".", prefix=
     """
     Write a given UCCA passage in any format.
     :param passage: Passage object to write
-    :param output_format: filename suffix (if given "ucca", suffix will be ".pickle" or ".xml" depending on `binary')
+    :param output_format: filename suffix (if given "ucca", suffix will be ".pickle" or ".xml" depending on `binary';
+                          if given "frozen", the compact binary format is used)
     :param binary: save in pickle format with ".pickle" suffix
     :param outdir: output directory, should exist already
     :param prefix: string to prepend to output filename
-    :param converter: function to apply to passage before saving (if output_format is not "ucca"/"pickle"/"xml"),
-                      returning iterable of strings, each corresponding to an output line
+    :param converter: function to apply to passage before saving (if output_format is not "ucca"/"pickle"/"xml"/
+                      "frozen"), returning iterable of strings, each corresponding to an output line
     :param verbose: print "Writing passage" message
     :param append: if using converter, append to output file rather than creating a new file
     :param basename: use this instead of `passage.ID' for the output filename
@@ -179,14 +198,63 @@ def write_passage(passage, output_format=None, binary=False, outdir=".", prefix=
     if verbose:
         with external_write_mode():
             print("%s '%s'..." % ("Appending to" if append else "Writing passage", outfile))
-    if output_format is None or output_format in ("ucca", "pickle", "xml"):
-        passage2file(passage, outfile, binary=binary)
+    if output_format is None or output_format in ("ucca", "pickle", "xml", "frozen"):
+        passage2file(passage, outfile, binary=binary, compact=output_format == "frozen")
     else:
         with open(outfile, "a" if append else "w", encoding="utf-8") as f:
             f.writelines(map("{}\n".format, (converter or to_text)(passage)))
     return outfile
 
 
+def map_passages(function, passages, processes=None, chunksize=1, thaw=False, directory=None):
+    """
+    Apply a function to passages in a pool of worker processes, without pickling the passages.
+    Each passage is frozen (see `ucca.frozen') and written to a temporary file, which each worker memory-maps whole and
+    reads without copying, so only the file offsets and the return values of the function are sent between processes.
+    :param function: function to apply to each passage, must be picklable (e.g., defined at module level)
+    :param passages: iterable of Passage or FrozenPassage objects, consumed while the workers are running
+    :param processes: number of worker processes, defaults to the number of CPUs
+    :param chunksize: number of passages to send to a worker at once
+    :param thaw: pass a regular Passage to the function, created by FrozenPassage.thaw, rather than a FrozenPassage
+    :param directory: where to create the temporary file, e.g. "/dev/shm" to keep it in shared memory
+    :return: generator of the return values of the function, in the order of the passages
+    """
+    fd, filename = tempfile.mkstemp(suffix=".frozen", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f, Pool(processes, initializer=_init_passage_worker,
+                                             initargs=(filename, function, thaw)) as pool:
+            yield from pool.imap(_apply_to_passage, _write_frozen_passages(f, passages), chunksize=chunksize)
+    finally:
+        os.remove(filename)
+
+
+def _write_frozen_passages(f, passages):
+    for passage in passages:
+        data = (passage if isinstance(passage, FrozenPassage) else freeze(passage)).to_bytes()
+        offset = f.tell()
+        f.write(data + bytes(-len(data) % ALIGNMENT))  # as in an archive, see `ucca.archive.write_archive'
+        f.flush()
+        yield offset, len(data)
+
+
+_passage_worker = {}
+
+
+def _init_passage_worker(filename, function, thaw):
+    _passage_worker.update(file=open(filename, "rb"), buffer=memoryview(b""), function=function, thaw=thaw)
+
+
+def _apply_to_passage(location):
+    offset, length = location
+    buffer = _passage_worker["buffer"]
+    if offset + length > len(buffer):  # written after the file was last mapped, since it grows while workers run
+        # a replaced mapping is closed once the passages read from it are no longer referenced
+        buffer = _passage_worker["buffer"] = memoryview(mmap.mmap(_passage_worker["file"].fileno(), 0,
+                                                                  access=mmap.ACCESS_READ))
+    passage = FrozenPassage.from_buffer(buffer[offset:offset + length])
+    return _passage_worker["function"](passage.thaw() if _passage_worker["thaw"] else passage)
+
+
 @contextmanager
 def external_write_mode(*args, **kwargs):
     try:
@@ -8,6 +8,8 @@ Layer 0 has only one type of node, :class:`Terminal`. This is a subtype of
 
 """
 
+from itertools import count
+
 from ucca import core
 
 LAYER_ID = '0'
@@ -35,8 +37,7 @@ class Terminal(core.Node):
         Passage, e.g. ID=0.4 is the 4th Terminal in the :class:`Passage`.
         tag: from NodeTags
         layer: '0' (LAYER_ID)
-        attrib: returns a copy of the attribute dictionary, so changing it
-            will not affect the Terminal object
+        attrib: returns a read-only view of the attribute dictionary
         text: text of the Terminal, whether punctuation or a word
         position: global position of the Terminal in the passage, starting at 1
         paragraph: which paragraph the Terminal belongs to, starting at 1
@@ -46,22 +47,24 @@ class Terminal(core.Node):
 
     """
 
+    __slots__ = ()
+
     @property
     def text(self):
-        return self.attrib['text']
+        return self._attrib['text']
 
     @property
     def position(self):
-        # the format of ID is LAYER_ID + ID separator + position
-        return int(self.ID[len(LAYER_ID) + len(core.Node.ID_SEPARATOR):])
+        # the format of ID is LAYER_ID + ID separator + position, parsed once to the Node's sort key
+        return self._sortkey[1]
 
     @property
     def para_pos(self):
-        return self.attrib['paragraph_position']
+        return self._attrib['paragraph_position']
 
     @property
     def paragraph(self):
-        return self.attrib['paragraph']
+        return self._attrib['paragraph']
 
     @property
     def tok(self):
@@ -75,7 +78,7 @@ class Terminal(core.Node):
 
     @property
     def attrib(self):
-        return self._attrib.copy()
+        return self._attrib.view()
 
     @property
     def punct(self):
@@ -104,18 +107,21 @@ class Terminal(core.Node):
                 and self.paragraph == other.paragraph
                 and self.para_pos == other.para_pos)
 
+    def _digest_key(self):
+        return repr((self.layer.ID, self.text, self.position, self.tag, self.paragraph, self.para_pos))
+
     def __eq__(self, other):
         """Equals if both of the same Passage, Layer, position, tag & text."""
-        return (isinstance(other, Terminal) and other.layer.ID == LAYER_ID
-                and self.root == other.root and self.layer.ID == other.layer.ID
-                and self.position == other.position
-                and self.text == other.text and self.tag == other.tag
-                and self.paragraph == other.paragraph
-                and self.para_pos == other.para_pos)
+        # the sort keys consist of the layer ID and the position
+        return self is other or (isinstance(other, Terminal) and other._sortkey[0] == LAYER_ID
+                                 and self._root is other._root and self._sortkey == other._sortkey
+                                 and self.text == other.text and self._tag == other._tag
+                                 and self.paragraph == other.paragraph
+                                 and self.para_pos == other.para_pos)
 
     def __hash__(self):
-        """Hashes the Terminals according to its ID and text."""
-        return hash(self.ID + str(self.text))
+        """Hashes the Terminals according to its Passage and position, which cannot change, unlike its text."""
+        return hash((id(self._root), self._sortkey))
 
     def __str__(self):
         return self.text
@@ -143,10 +149,12 @@ class Layer0(core.Layer):
 
     @property
     def words(self):
+        self._sort()
         return tuple(x for x in self._all if not x.punct)
 
     @property
     def pairs(self):
+        self._sort()
         return tuple(enumerate(self._all, start=1))
 
     def by_position(self, pos):
@@ -156,6 +164,7 @@ class Layer0(core.Layer):
         :return: the Terminal in this position
         :raise IndexError: if the position is out of bounds
         """
+        self._sort()
         return self._all[pos - 1]  # positions start at 1, not 0
 
     def add_terminal(self, text, punct, paragraph=1):
@@ -173,14 +182,43 @@ class Layer0(core.Layer):
         :raise DuplicateIdError: if trying to add an already existing Terminal,
                 caused by un-ordered Terminal positions in the layer
         """
-        position = len(self._all) + 1  # we want positions to start with 1
-        para_pos = self._all[-1].para_pos + 1 if position > 1 and paragraph == self._all[-1].paragraph else 1
-        tag = NodeTags.Punct if punct else NodeTags.Word
-        return Terminal(ID="{}{}{}".format(LAYER_ID, core.Node.ID_SEPARATOR, position),
-                        root=self.root, tag=tag,
-                        attrib={'text': text,
-                                'paragraph': paragraph,
-                                'paragraph_position': para_pos})
+        return self.add_terminals((text,), (punct,), (paragraph,))[0]
+
+    def add_terminals(self, texts, puncts, paragraphs=None):
+        """Adds Terminals at the next available positions, in order.
+
+        Equivalent to calling :meth:`add_terminal` for each text, but the
+        positions and paragraph positions are all computed in one pass, so this
+        is the preferred way to create all Terminals of a passage at once.
+
+        :param texts: iterable of the texts of the Terminals
+        :param puncts: iterable of booleans, whether each is a punctuation mark
+        :param paragraphs: iterable of paragraph numbers, defaults to 1 for all
+
+        :return: list of the created Terminals
+
+        :raise ValueError: if the iterables are not all of the same length
+        :raise DuplicateIdError: if trying to add an already existing Terminal,
+                caused by un-ordered Terminal positions in the layer
+        """
+        texts, puncts = list(texts), list(puncts)
+        paragraphs = [1] * len(texts) if paragraphs is None else list(paragraphs)
+        if not len(texts) == len(puncts) == len(paragraphs):
+            raise ValueError("Different numbers of texts (%d), punctuation flags (%d) and paragraphs (%d)" % (
+                len(texts), len(puncts), len(paragraphs)))
+        self._sort()
+        last_paragraph, para_pos = (self._all[-1].paragraph, self._all[-1].para_pos) if self._all else (None, 0)
+        prefix = LAYER_ID + core.Node.ID_SEPARATOR
+        terminals = []
+        for position, text, punct, paragraph in zip(count(len(self._all) + 1), texts, puncts, paragraphs):
+            para_pos = para_pos + 1 if paragraph == last_paragraph else 1
+            last_paragraph = paragraph
+            terminals.append(Terminal(ID=prefix + str(position), root=self.root,
+                                      tag=NodeTags.Punct if punct else NodeTags.Word,
+                                      attrib={'text': text,
+                                              'paragraph': paragraph,
+                                              'paragraph_position': para_pos}))
+        return terminals
 
     def copy(self, other_passage):
         """Creates a copied Layer0 object and Terminals in other_passage.
@@ -190,8 +228,10 @@ class Layer0(core.Layer):
         """
         other = Layer0(root=other_passage, attrib=self.attrib.copy())
         other.extra = self.extra.copy()
-        for t in self._all:
-            copied = other.add_terminal(t.text, t.punct, t.paragraph)
+        self._sort()
+        terminals = other.add_terminals([t.text for t in self._all], [t.punct for t in self._all],
+                                        [t.paragraph for t in self._all])
+        for t, copied in zip(self._all, terminals):
             copied.extra = t.extra.copy()
 
     def docs(self, num_paragraphs=1):
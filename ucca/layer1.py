@@ -9,6 +9,7 @@ the type of relation between the Nodes.
 """
 
 import itertools
+import math
 import operator
 
 from ucca import core, layer0
@@ -76,9 +77,9 @@ def _single_child_by_tag(node, tag, must=True):
         MissingRelationError if Node not found and must is set to True
 
     """
-    for edge in node:
-        if tag in edge.tags:
-            return edge.child
+    edges = node._edges_by_tag().get(tag)
+    if edges:
+        return edges[0].child
     if must:
         raise MissingRelationError(node.ID, tag)
     return None
@@ -95,7 +96,7 @@ def _multiple_children_by_tag(node, tag):
         A list of connected Nodes, can be empty
 
     """
-    return [edge.child for edge in node if tag in edge.tags]
+    return [edge.child for edge in node._edges_by_tag().get(tag, ())]
 
 
 class Linkage(core.Node):
@@ -115,6 +116,8 @@ class Linkage(core.Node):
 
     """
 
+    __slots__ = ()
+
     @property
     def relation(self):
         return _single_child_by_tag(self, EdgeTags.LinkRelation)
@@ -182,6 +185,8 @@ class FoundationalNode(core.Node):
 
     """
 
+    __slots__ = ("_fedge_cache",)
+
     @property
     def participants(self):
         return _multiple_children_by_tag(self, EdgeTags.Participant)
@@ -247,13 +252,29 @@ class FoundationalNode(core.Node):
         return _single_child_by_tag(self, EdgeTags.Relator, False)
 
     def _fedge(self):
-        """Returns the Edge of the fparent, or None."""
-        for edge in self.incoming:
+        """Returns the Edge of the fparent, or None.
+
+        The Edge is found once and kept until the incoming Edges change.
+        """
+        try:
+            return self._fedge_cache
+        except AttributeError:  # not found yet, or the incoming Edges changed since
+            pass
+        for edge in self._incoming:
             if (edge.parent.layer.ID == LAYER_ID and
                 edge.parent.tag == NodeTags.Foundational and
                     not edge.attrib.get('remote')):
-                return edge
-        return None
+                break
+        else:
+            edge = None
+        self._fedge_cache = edge
+        return edge
+
+    def _parents_changed(self):
+        try:
+            del self._fedge_cache
+        except AttributeError:
+            pass
 
     @property
     def fparent(self):
@@ -278,36 +299,47 @@ class FoundationalNode(core.Node):
         :return: a list of :class:`layer0`.Terminal objects
         """
         if visited is None:
-            return sorted(self.get_terminals(punct=punct, remotes=remotes, visited=set()),
-                          key=operator.attrgetter("position"))
+            return list(self._get_terminals(punct=punct, remotes=remotes))
         outgoing = {e for e in set(self) - visited if remotes or not e.attrib.get("remote")}
         return [t for e in outgoing for t in e.child.get_terminals(
             punct=punct, remotes=remotes, visited=visited | outgoing)]
 
+    def _get_terminals(self, punct=True, remotes=False):
+        """Returns a tuple of all terminals under the span of this FoundationalNode, cached by the Layer.
+        :param punct: whether to include punctuation Terminals, defaults to True
+        :param remotes: whether to include Terminals from remote FoundationalNodes, defaults to false
+        :return: a tuple of :class:`layer0`.Terminal objects, sorted by position
+        """
+        terminals = self.layer._get_terminals(self, punct, remotes)
+        if terminals is None:  # there is a cycle, so the span depends on the path taken
+            terminals = tuple(sorted(self.get_terminals(punct=punct, remotes=remotes, visited=set()),
+                                     key=operator.attrgetter("position")))
+        return terminals
+
     @property
     def start_position(self):
         try:
-            return self.get_terminals()[0].position
+            return self._get_terminals()[0].position
         except IndexError:  # implicit unit or having no Terminals
             return -1
 
     @property
     def end_position(self):
         try:
-            return self.get_terminals()[-1].position
+            return self._get_terminals()[-1].position
         except IndexError:  # implicit unit or having no Terminals
             return -1
 
     @property
     def discontiguous(self):
-        terms = self.get_terminals()
+        terms = self._get_terminals()
         return any(terms[i].position + 1 != terms[i + 1].position
                    for i in range(len(terms) - 1))
 
     def get_sequences(self):
         if self.attrib.get('implicit'):
             return []
-        pos = sorted([x.position for x in self.get_terminals()])
+        pos = [x.position for x in self._get_terminals()]
 
         # all terminals which end a sequence, including the last one
         seq_closers = [pos[i] for i in range(len(pos) - 1)
@@ -320,7 +352,7 @@ class FoundationalNode(core.Node):
 
     def to_text(self):
         """Returns the text in the span of self, separated by spaces."""
-        return ' '.join(t.text for t in self.get_terminals())
+        return ' '.join(t.text for t in self._get_terminals())
 
     def is_scene(self):
         return self.state is not None or self.process is not None
@@ -376,6 +408,8 @@ class PunctNode(FoundationalNode):
 
     """
 
+    __slots__ = ()
+
     def add(self, edge_tag, node, *, edge_attrib=None):
         if node.layer.ID != layer0.LAYER_ID:
             raise ValueError("Non-terminal child (%s) for %s node (%s)" % (node.ID, NodeTags.Punctuation, self.ID))
@@ -398,6 +432,9 @@ class PunctNode(FoundationalNode):
         """
         return self.children if punct else ()
 
+    def _get_terminals(self, punct=True, remotes=False):
+        return tuple(self.get_terminals(punct=punct, remotes=remotes))
+
     def __str__(self):
         return self.to_text()
 
@@ -410,29 +447,43 @@ class Layer1(core.Layer):
     def __init__(self, root, attrib=None, *, orderkey=core.id_orderkey):
         super().__init__(ID=LAYER_ID, root=root, attrib=attrib,
                          orderkey=orderkey)
-        self._scenes = []
-        self._linkages = []
+        self._scenes = None  # top-level scenes, computed lazily, see _update_scenes
+        self._linkages = None
+        self._max_id = 0  # largest numeric unique ID of a node in the layer, for next_id
+        self._terminals = {}  # node -> (punct, remotes) -> sorted terminals, see _get_terminals
         self._head_fnode = FoundationalNode(root=root,
                                             tag=NodeTags.Foundational,
                                             ID=self.next_id())
-        self._all = [self._head_fnode]
-        self._heads = [self._head_fnode]
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state["_terminals"]  # cache, not pickled
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._terminals = {}
+        if "_max_id" not in state:  # Layers pickled before IDs were allocated by a counter
+            self._max_id = max((n for _, n, *_ in map(core.id_orderkey, self._all) if n != math.inf), default=0)
 
     @property
     def top_scenes(self):
+        self._update_scenes()
         return self._scenes[:]
 
     @property
     def top_linkages(self):
+        self._update_scenes()
         return self._linkages[:]
 
     def next_id(self):
-        """Returns the next available ID string for this layer."""
-        for n in itertools.count(start=len(self._all) + 1):
+        """Returns the next available ID string for this layer.
+
+        IDs are allocated after the largest numeric ID in the layer, so IDs of removed nodes are not reused.
+        """
+        for n in itertools.count(start=self._max_id + 1):
             id_str = "{}{}{}".format(LAYER_ID, core.Node.ID_SEPARATOR, n)
-            try:
-                self._root.by_id(id_str)
-            except KeyError:
+            if id_str not in self._root._nodes:
                 return id_str
 
     def add_fnode_multiple(self, parent, edge_categories, *, implicit=False, edge_attrib=None):
@@ -522,66 +573,145 @@ class Layer1(core.Layer):
             linkage.add(EdgeTags.LinkArgument, arg)
         return linkage
 
-    def _check_top_scene(self, node):
-        """Checks whether a node is a scene, and a top-level one.
+    def copy(self, other_passage):
+        """Creates a copied Layer1 object and Nodes in other_passage, with the same IDs.
 
-        A top level scene is one which is not embedded in any other scene.
+        Assumes the Terminals were already copied (see :meth:`layer0.Layer0.copy`).
+        Edges (including remote ones), categories, attributes and extra data are all copied,
+        and the top scenes and linkages are computed once when done. Edges to Nodes of Layers
+        that were not copied to other_passage are skipped.
 
-        :param node: the FNode to check.
+        :param other_passage: the Passage to copy self to
 
-        :return: True iff node is a top-level scenes.
+        """
+        other = Layer1(root=other_passage, attrib=self.attrib.copy(), orderkey=self._orderkey)
+        other.extra = self.extra.copy()
+        self._sort()
+        copied = {self._head_fnode: other._head_fnode}
+        with other_passage.bulk_build():
+            for node in self._all:
+                other_node = copied.get(node)
+                if other_node is None:
+                    other_node = copied[node] = type(node)(root=other_passage, ID=node.ID, tag=node.tag,
+                                                           attrib=node.attrib.copy(), orderkey=node.orderkey)
+                elif node.attrib:
+                    other_node.attrib.update(node.attrib.copy())
+                if node._extra:  # not creating empty extra dictionaries
+                    other_node.extra = node.extra.copy()
+            for node in self._all:
+                for edge in node:
+                    other_child = other_passage.nodes.get(edge.child.ID)
+                    if other_child is None:  # in a Layer that was not copied
+                        continue
+                    other_edge = copied[node].add_multiple([tuple(c) for c in edge.categories], other_child,
+                                                           edge_attrib=edge.attrib.copy())
+                    if edge._extra:
+                        other_edge.extra = edge.extra.copy()
+
+    def _update_scenes(self):
+        """Recomputes the top-level scenes and linkages if the Layer changed since they were last computed.
+
+        A top level scene is one which is not embedded in any other scene, and
+        a top level linkage is one whose arguments are all top level scenes.
+        Scenes are found in linear time by determining for each FNode, from
+        the top down, whether it is embedded in another scene.
 
         """
-        if not node.is_scene():
-            return False
-        while node.fparent not in (None, self._head_fnode):
-            node = node.fparent
-            if node.is_scene():
-                return False
-        return True
-
-    def _update_top_scene(self, node):
-        """Adds/removes the node if it's a top-level scene."""
-        if node.tag != NodeTags.Foundational:
+        if self._scenes is not None:
             return
-        if node in self._scenes and not self._check_top_scene(node):
-            self._scenes.remove(node)
-        elif node not in self._scenes and self._check_top_scene(node):
-            self._scenes.append(node)
-            # Other scenes may now become not top-level, check it
-            for ts in self._scenes[:-1]:
-                if not self._check_top_scene(ts):
-                    self._scenes.remove(ts)
-            self._scenes.sort(key=self.orderkey)
-
-    def _update_top_linkage(self, linkage):
-        """Adds/removes the linkage if it's a top level linkage."""
-        if all(fnode in self._scenes for fnode in linkage.arguments):
-            if linkage not in self._linkages:
-                self._linkages.append(linkage)
-                self._linkages.sort(key=self.orderkey)
-        elif linkage in self._linkages:
-            self._linkages.remove(linkage)
-
-    def _update_edge(self, edge):
-        """Adds the Edge to the Layer, and updates top scenes and linkers."""
-        self._update_top_scene(edge.parent)
-        self._update_top_scene(edge.child)
-        for lkg in [x for x in edge.parent.parents
-                    if x.tag == NodeTags.Linkage]:
-            self._update_top_linkage(lkg)
-        for lkg in [x for x in edge.child.parents
-                    if x.tag == NodeTags.Linkage]:
-            self._update_top_linkage(lkg)
+        self._sort()
+        embedded = {None: False, self._head_fnode: False}  # whether an FNode is within a scene
+        fnodes = [node for node in self._all if node.tag == NodeTags.Foundational]
+        for node in fnodes:
+            path = []
+            while node not in embedded:
+                path.append(node)
+                node = node.fparent
+            for child in reversed(path):  # node is now the fparent of child
+                embedded[child] = embedded[node] or (node not in (None, self._head_fnode) and node.is_scene())
+                node = child
+        self._scenes = [node for node in fnodes if not embedded[node] and node.is_scene()]
+        scenes = set(self._scenes)
+        self._linkages = [node for node in self._all if node.tag == NodeTags.Linkage and
+                          all(fnode in scenes for fnode in node.arguments)]
+
+    def _scenes_changed(self):
+        """Marks the top-level scenes and linkages for recomputation, after the Layer has changed."""
+        self._scenes = self._linkages = None
+
+    def _rebuild(self):
+        super()._rebuild()
+        self._scenes_changed()
+
+    def _get_terminals(self, node, punct, remotes):
+        """Returns the terminals under the span of an FNode, caching them for it and for its descendants.
+
+        :param node: the FNode whose terminals to return
+        :param punct: whether to include punctuation Terminals
+        :param remotes: whether to include Terminals from remote FNodes
+
+        :return: a tuple of :class:`layer0`.Terminal objects, sorted by position, or None if there is a cycle
+        """
+        cached = self._terminals.setdefault(node, {})
+        key = (punct, remotes)
+        try:
+            return cached[key]
+        except KeyError:
+            pass
+        cached[key] = None  # in progress, so that cycles are detected
+        terminals = []
+        for edge in node:
+            if remotes or not edge.attrib.get("remote"):
+                child = edge.child
+                if isinstance(child, FoundationalNode) and not isinstance(child, PunctNode):
+                    child_terminals = self._get_terminals(child, punct, remotes)
+                    if child_terminals is None:
+                        del cached[key]
+                        return None
+                    terminals += child_terminals
+                else:
+                    terminals += child.get_terminals(punct=punct, remotes=remotes)
+        terminals = cached[key] = tuple(sorted(terminals, key=operator.attrgetter("position")))
+        return terminals
+
+    def _invalidate(self, node):
+        self._scenes_changed()  # edges or attributes changed, so the scene structure may have too
+        stack = [node]
+        while stack:  # the cached terminals of ancestors depend on those of the node, so they are cached too
+            node = stack.pop()
+            # PunctNodes are not cached, but the terminals of their parents are, so the parents are invalidated too
+            if self._terminals.pop(node, None) is not None or isinstance(node, PunctNode):
+                stack += [edge.parent for edge in node.incoming]
+
+    def _add_node(self, node):
+        super()._add_node(node)
+        self._scenes_changed()
+        n = core.id_orderkey(node)[1]
+        if self._max_id < n < math.inf:
+            self._max_id = n
+
+    def _add_nodes(self, nodes):
+        super()._add_nodes(nodes)
+        self._scenes_changed()
+        self._max_id = max([self._max_id] + [n for _, n, *_ in map(core.id_orderkey, nodes) if n != math.inf])
+
+    def _remove_node(self, node):
+        super()._remove_node(node)
+        self._terminals.pop(node, None)
+        self._scenes_changed()
 
     def _add_edge(self, edge):
         super()._add_edge(edge)
-        self._update_edge(edge)
+        self._scenes_changed()
 
     def _remove_edge(self, edge):
         super()._remove_edge(edge)
-        self._update_edge(edge)
+        self._scenes_changed()
 
     def _change_edge_tag(self, edge, old_tag):
         super()._change_edge_tag(edge, old_tag)
-        self._update_edge(edge)
+        self._scenes_changed()
+
+    def _change_node_tag(self, node, old_tag):
+        super()._change_node_tag(node, old_tag)
+        self._scenes_changed()
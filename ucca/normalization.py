@@ -140,7 +140,7 @@ def lowest_common_ancestor(*nodes):
     while parents:
         for parent in parents:
             if parent.tag == L1Tags.Foundational and (not parent.terminals or nodes[1:]) \
-                    and all(n in parent.iter() for n in nodes[1:]):
+                    and set(parent.iter()).issuperset(nodes[1:]):
                 return parent
         parents = [p for n in parents for p in n.parents]
     return None
@@ -0,0 +1,62 @@
+"""Tests the archive module functionality and correctness."""
+
+import os
+
+import pytest
+
+from ucca import archive, convert, frozen, ioutil
+from .conftest import loaded, multi_sent, l1_passage
+
+
+def _passages():
+    return [loaded(), l1_passage()] + convert.split2sentences(multi_sent())
+
+
+def test_archive(tmp_path):
+    passages = _passages()
+    filename = str(tmp_path / ("passages" + archive.SUFFIX))
+    assert archive.write_archive(passages[:1] + [frozen.freeze(p) for p in passages[1:]], filename) == \
+        [p.ID for p in passages]
+    assert archive.is_archive_file(filename)
+    assert not frozen.is_frozen(open(filename, "rb").read())
+    with archive.Archive(filename) as a:
+        assert len(a) == len(passages)
+        assert list(a) == [p.ID for p in passages]
+        assert "1001" in a and "2" not in a
+        for passage in reversed(passages):  # random access
+            assert a[passage.ID].equals(passage, ordered=True)
+            assert a.frozen(passage.ID).thaw().equals(passage, ordered=True)
+        with pytest.raises(KeyError):
+            a["2"]
+        assert [p.ID for p in a.passages(thaw=False)] == [p.ID for p in passages]
+        f = a.frozen("1")
+    assert not list(a.passages())
+    assert f.thaw().equals(passages[1])  # still readable after closing
+
+
+def test_archive_errors(tmp_path):
+    filename = str(tmp_path / ("passages" + archive.SUFFIX))
+    with pytest.raises(ValueError):
+        archive.write_archive([l1_passage(), multi_sent()], filename)
+    assert not os.path.exists(filename)
+    archive.write_archive([l1_passage()], filename)
+    with open(filename, "rb") as f:
+        data = f.read()
+    for invalid in (b"", data[:len(archive.MAGIC)], data[:-1], b"x" + data[1:]):
+        with open(filename, "wb") as f:
+            f.write(invalid)
+        with pytest.raises(ValueError):
+            archive.Archive(filename)
+        assert not archive.is_archive_file(filename) or invalid.startswith(archive.MAGIC)
+
+
+def test_read_archive(tmp_path):
+    passages = _passages()
+    filename = str(tmp_path / ("passages" + archive.SUFFIX))
+    archive.write_archive(passages, filename)
+    read = list(ioutil.read_files_and_dirs([filename, "test_files/standard3.xml", str(tmp_path)]))
+    ids = [p.ID for p in passages]
+    assert [p.ID for p in read] == ids + ["120"] + ids  # the directory holds just the archive
+    assert all(p.equals(q) for p, q in zip(read, passages))
+    assert [p.ID for p in ioutil.read_files_and_dirs(filename, sentences=True)] == \
+        [s.ID for p in passages for s in convert.split2sentences(p)]
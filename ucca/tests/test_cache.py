@@ -0,0 +1,113 @@
+"""Tests the cache module functionality and correctness."""
+
+import os
+import shutil
+from multiprocessing import Pool
+
+import pytest
+
+from ucca import cache, convert, frozen, ioutil
+
+FILENAME = "test_files/standard3.xml"
+
+
+def _entries(directory):
+    return sorted(f for f in os.listdir(directory) if f.endswith(frozen.SUFFIX))
+
+
+@pytest.fixture
+def xml_file(tmp_path):
+    filename = str(tmp_path / "passage.xml")
+    shutil.copy(FILENAME, filename)
+    return filename
+
+
+def test_file2passage(xml_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    passage = convert.file2passage(xml_file)
+    assert convert.file2passage(xml_file, cache_dir=cache_dir).equals(passage, ordered=True)
+    entries = _entries(cache_dir)
+    assert len(entries) == 1
+    assert convert.file2passage(xml_file, cache_dir=cache_dir).equals(passage, ordered=True)
+    assert _entries(cache_dir) == entries
+    stat = os.stat(xml_file)
+    os.utime(xml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))  # modified: parsed again
+    convert.file2passage(xml_file, cache_dir=cache_dir)
+    assert len(_entries(cache_dir)) == 2
+
+
+def test_environment(xml_file, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VAR, cache_dir)
+    assert cache.get_cache() is cache.get_cache(cache_dir)
+    assert [p.ID for p in ioutil.read_files_and_dirs(xml_file)] == ["120"]
+    assert len(_entries(cache_dir)) == 1
+    monkeypatch.delenv(cache.CACHE_DIR_ENV_VAR)
+    assert cache.get_cache() is None
+
+
+def test_invalid_directory(xml_file, tmp_path, monkeypatch, caplog):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV_VAR, os.path.join(xml_file, "cache"))  # under a file: cannot be created
+    passage = convert.file2passage(xml_file)
+    assert convert.file2passage(xml_file).equals(passage, ordered=True)
+    assert cache.get_cache() is None
+    assert len(caplog.records) == 1
+
+
+def test_invalid_size(xml_file, tmp_path, monkeypatch, caplog):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv(cache.CACHE_SIZE_ENV_VAR, "1G")
+    passage = convert.file2passage(xml_file)
+    assert convert.file2passage(xml_file, cache_dir=cache_dir).equals(passage, ordered=True)
+    assert cache.get_cache(cache_dir) is None
+    assert len(caplog.records) == 1
+    monkeypatch.setenv(cache.CACHE_SIZE_ENV_VAR, str(cache.DEFAULT_MAX_SIZE))
+    assert convert.file2passage(xml_file, cache_dir=cache_dir).equals(passage, ordered=True)
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_eviction(tmp_path):
+    passage = convert.file2passage(FILENAME)
+    passage_cache = cache.PassageCache(str(tmp_path / "cache"))
+    filenames = []
+    for i in range(4):
+        filenames.append(str(tmp_path / ("%d.xml" % i)))
+        shutil.copy(FILENAME, filenames[-1])
+        assert passage_cache.put(filenames[-1], passage)
+        os.utime(passage_cache._entry(filenames[-1]), (i, i))
+    size = os.path.getsize(passage_cache._entry(filenames[0]))
+    assert passage_cache.get(filenames[0]).equals(passage)  # now the most recently used
+    passage_cache.evict(max_size=3 * size)
+    assert [passage_cache.get(filename) is not None for filename in filenames] == [True, False, True, True]
+    passage_cache.max_size = int(2.5 * size)  # adding another entry evicts down to 2.25 entries
+    filenames.append(str(tmp_path / "4.xml"))
+    shutil.copy(FILENAME, filenames[-1])
+    assert passage_cache.put(filenames[-1], passage)
+    assert len(_entries(passage_cache.directory)) == 2
+    assert passage_cache.get(filenames[-1]) is not None
+    passage_cache.clear()
+    assert not _entries(passage_cache.directory)
+
+
+def test_invalid_entry(xml_file, tmp_path):
+    passage_cache = cache.PassageCache(str(tmp_path / "cache"))
+    assert passage_cache.get(xml_file) is None
+    assert passage_cache.get(str(tmp_path / "missing.xml")) is None
+    with open(passage_cache._entry(xml_file), "wb") as f:
+        f.write(b"not a passage")
+    assert passage_cache.get(xml_file) is None
+    assert not _entries(passage_cache.directory)
+    assert not passage_cache.put(xml_file, convert.file2passage(xml_file), key="changed")
+
+
+def _read_terminals(args):
+    filename, cache_dir = args
+    return [t.text for t in convert.file2passage(filename, cache_dir=cache_dir).layer("0").all]
+
+
+def test_concurrent(xml_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    expected = _read_terminals((xml_file, None))
+    with Pool(2) as pool:
+        assert pool.map(_read_terminals, 8 * [(xml_file, cache_dir)]) == 8 * [expected]
+    assert os.listdir(cache_dir) == _entries(cache_dir) and len(_entries(cache_dir)) == 1
@@ -1,6 +1,9 @@
+import io
 import xml.etree.ElementTree as ETree
 
-from ucca import layer0, layer1, convert, textutil
+import pytest
+
+from ucca import core, layer0, layer1, convert, textutil
 from .conftest import loaded, load_xml
 
 """Tests convert module correctness and API."""
@@ -165,6 +168,83 @@ def test_from_standard():
     assert passage.equals(ref, ordered=True)
 
 
+@pytest.mark.parametrize("filename", ("test_files/standard3.xml", "test_files/120_parsed.xml",
+                                      "test_files/implicit1.xml"))
+def test_from_standard_file(filename):
+    passage = convert.from_standard(load_xml(filename))
+    with open(filename, encoding="utf-8") as f:
+        streamed = convert.from_standard_file(f)
+    assert streamed.equals(passage, ordered=True)
+    assert ETree.tostring(convert.to_standard(streamed)) == ETree.tostring(convert.to_standard(passage))
+    assert {n.ID: n.extra for n in streamed.nodes.values()} == {n.ID: n.extra for n in passage.nodes.values()}
+
+
+def test_from_standard_file_element_order():
+    passage = loaded()
+    root = convert.to_standard(passage)
+    for elem in root.iter():  # attributes after the other children, and unknown elements with their descendants
+        attributes = elem.find("attributes")
+        if attributes is not None:
+            elem.remove(attributes)
+            elem.append(attributes)
+            elem.insert(0, ETree.fromstring('<unknown><layer layerID="2" /><node ID="2.1" /><edge /></unknown>'))
+    streamed = convert.from_standard_file(io.StringIO(ETree.tostring(root).decode()))
+    assert streamed.equals(passage, ordered=True)
+    assert ETree.tostring(convert.to_standard(streamed)) == ETree.tostring(convert.to_standard(passage))
+    assert convert.from_standard(root).equals(passage, ordered=True)
+
+
+@pytest.mark.parametrize("xml, message", (
+        ('<root passageID="1"><layer layerID="0"><attributes /></layer></root>',
+         'Element root passageID="1" has no attributes'),
+        ('<root passageID="1"><attributes /><layer layerID="0"><node ID="0.1" type="Word" /><attributes /></layer>'
+         '</root>', 'Element node ID="0.1" has no attributes'),
+        ('<root passageID="1"><attributes /><node ID="0.1" type="Word"><attributes /></node></root>',
+         'Element node ID="0.1" must be directly in a layer element, not in root passageID="1"'),
+        ('<root passageID="1"><attributes /><layer layerID="1"><attributes /><edge toID="1.1" /></layer></root>',
+         'Element edge toID="1.1" must be directly in a node element, not in layer layerID="1"'),
+        ('<root passageID="1"><attributes /><layer layerID="1"><attributes /><node ID="1.1" type="FN">'
+         '<attributes /><layer layerID="0" /></node></layer></root>',
+         'Element layer layerID="0" must be directly in a root element, not in node ID="1.1"'),
+))
+def test_from_standard_file_errors(xml, message):
+    with pytest.raises(core.UCCAError, match=message):
+        convert.from_standard_file(io.StringIO(xml))
+    with pytest.raises(core.UCCAError, match=message):
+        convert.from_standard(ETree.fromstring(xml))
+
+
+def test_from_standard_file_site():
+    with pytest.raises(core.UCCAError):
+        convert.from_standard_file("test_files/site3.xml")
+
+
+def test_from_standard_file_finishes_bulk_build(monkeypatch):
+    passages = []
+    bulk_build = core.Passage.bulk_build
+    monkeypatch.setattr(core.Passage, "bulk_build", lambda self: passages.append(self) or bulk_build(self))
+    misplaced = '<root passageID="1"><attributes /><node ID="0.1" type="Word"><attributes /></node></root>'
+    with pytest.raises(core.UCCAError):  # a node not in a layer
+        convert.from_standard_file(io.StringIO(misplaced))
+    with pytest.raises(core.UCCAError):
+        convert.from_standard(ETree.fromstring(misplaced))
+    with pytest.raises(ETree.ParseError):  # truncated XML
+        convert.from_standard_file(io.StringIO('<root passageID="1"><attributes /><layer layerID="0"><attributes />'))
+    assert len(passages) == 3 and not any(passage._bulk for passage in passages)
+
+
+@pytest.mark.parametrize("indent", (True, False))
+def test_write_standard(indent):
+    passage = loaded()
+    passage.attrib["quote"] = 'a "b" <c>\n\r\t&'
+    passage.layer(layer0.LAYER_ID).all[0].extra["x"] = "\u05d0"
+    passage.layer(layer1.LAYER_ID).heads[0][0].categories[0].extra["y"] = [1]
+    xml_string = ETree.tostring(convert.to_standard(passage)).decode()
+    f = io.StringIO()
+    convert.write_standard(passage, f, indent=indent)
+    assert f.getvalue() == (textutil.indent_xml(xml_string) if indent else xml_string)
+
+
 def test_from_text():
     sample = ["Hello . again", "nice", " ? ! end", ""]
     passage = next(convert.from_text(sample))
@@ -1,5 +1,7 @@
 """Testing code for the ucca package, unit-testing only."""
 
+import pickle
+
 import pytest
 
 from ucca import core, layer0, layer1
@@ -32,6 +34,7 @@ def test_creation():
     assert node11.ID == "1.1"
     assert node11.root == p
     assert node11.layer.ID == "1"
+    assert node11.layer is l1
     assert node11.tag == "1"
     assert len(node11) == 0
     assert node11.parents == [node12, node21, node22]
@@ -89,6 +92,106 @@ def test_modifying():
     assert node22[0].tag == "testx"
 
 
+def test_categories():
+    p = basic()
+    node11, node12, node13 = p.layer("1").all
+    edge = node12.add("test", node11)
+    assert edge.tags == ("test",)
+    edge.add("refined", layer="2", parent="test")
+    assert edge.tags == ("test", "refined")
+    assert [e.child for e in node12._edges_by_tag()["refined"]] == [node11]
+    edge.categories[1].tag = "other"
+    assert edge.tags == ("test", "other")
+    assert "refined" not in node12._edges_by_tag()
+    edge.tag = "x"
+    assert edge.tags == ("x", "other")
+    edge.categories = [core.Category("y")]
+    assert edge.tags == ("y",)
+    assert [e.child for e in node12._edges_by_tag()["y"]] == [node11]
+    node12.remove(edge)
+    assert "y" not in node12._edges_by_tag()
+
+
+class _EventRecorder(core.PassageListener):
+    def __init__(self):
+        self.events = []
+
+    def node_added(self, node):
+        self.events.append(("node_added", node.ID))
+
+    def node_removed(self, node):
+        self.events.append(("node_removed", node.ID))
+
+    def edge_added(self, edge):
+        self.events.append(("edge_added", edge.ID, edge.tags))
+
+    def edge_removed(self, edge):
+        self.events.append(("edge_removed", edge.ID))
+
+    def node_tag_changed(self, node, old_tag):
+        self.events.append(("node_tag_changed", node.ID, old_tag, node.tag))
+
+    def edge_tag_changed(self, edge, old_tag):
+        self.events.append(("edge_tag_changed", edge.ID, old_tag, edge.tag))
+
+    def attrib_changed(self, element):
+        self.events.append(("attrib_changed", element.ID))
+
+
+def test_listeners():
+    p = basic()
+    node11, node12, node13 = p.layer("1").all
+    recorder = _EventRecorder()
+    p.add_listener(recorder)
+    p.add_listener(core.PassageListener())
+    node14 = core.Node(ID="1.4", root=p, tag="4")
+    node14.add("test", node11, edge_attrib={"remote": True})
+    node14.tag = "x"
+    node14[0].tag = "y"
+    node14[0].attrib["remote"] = False
+    node11.attrib["a"] = 1
+    p.attrib["b"] = 2
+    node14.destroy()
+    assert recorder.events == [
+        ("node_added", "1.4"),
+        ("edge_added", "1.4->1.1", ("test",)),
+        ("node_tag_changed", "1.4", "4", "x"),
+        ("edge_tag_changed", "1.4->1.1", "test", "y"),
+        ("attrib_changed", "1.4->1.1"),
+        ("attrib_changed", "1.1"),
+        ("attrib_changed", p.ID),
+        ("edge_removed", "1.4->1.1"),
+        ("node_removed", "1.4"),
+    ]
+    p2 = PASSAGES[0]()
+    p2.add_listener(recorder)
+    assert not pickle.loads(pickle.dumps(p2))._listeners
+    assert not p2.copy()._listeners
+    p.remove_listener(recorder)
+    node11.attrib["a"] = 2
+    assert len(recorder.events) == 9
+    with pytest.raises(ValueError):
+        p.remove_listener(recorder)
+
+
+def test_listeners_categories():
+    p = basic()
+    _, node12, node13 = p.layer("1").all
+    edge = node12.add("a", node13)
+    recorder = _EventRecorder()
+    p.add_listener(recorder)
+    edge.add("b")  # the tag is still "a", but the categories change
+    edge.categories[0].tag = "c"
+    edge.categories = [core.Category("d")]
+    assert recorder.events == [
+        ("edge_tag_changed", "1.2->1.3", "a", "a"),
+        ("edge_tag_changed", "1.2->1.3", "a", "c"),
+        ("edge_tag_changed", "1.2->1.3", "c", "d"),
+    ]
+    assert edge.tags == ("d",)
+    assert [e.child for e in node12._edges_by_tag()["d"]] == [node13]
+
+
 def test_equals():
     p1 = core.Passage("1")
     p2 = core.Passage("2")
@@ -147,6 +250,23 @@ def test_equals():
     assert not (p1.equals(p2) or p2.equals(p1))
 
 
+@pytest.mark.parametrize("create", PASSAGES)
+def test_digest(create):
+    p1 = create()
+    p2 = create()
+    assert {n.ID: n.digest() for n in p1.nodes.values()} == {n.ID: n.digest() for n in p2.nodes.values()}
+    assert not p1.missing_nodes(p2)
+    head1, head2 = [p.layer(layer1.LAYER_ID).heads[0] for p in (p1, p2)]
+    p2.layer(layer1.LAYER_ID).add_fnode(head2, layer1.EdgeTags.Linker)
+    assert head1.digest() != head2.digest()
+    assert head2 in p2.missing_nodes(p1)
+    assert head1.equals(head2, ignore_edge=lambda e: e.tag == layer1.EdgeTags.Linker)
+    assert head1.digest(ignore_edge=lambda e: e.tag == layer1.EdgeTags.Linker) != head2.digest()
+    for _ in range(3):
+        assert not p1.missing_nodes(p1, ignore_edge=lambda e: e.tag == layer1.EdgeTags.Linker)
+    assert len(p1._digest_cache) <= 2  # digests without ignore functions, and for the last ones only
+
+
 @pytest.mark.parametrize("create", PASSAGES)
 def test_copying(create):
     # we don't need such a complex passage, but it will work anyway
@@ -162,6 +282,26 @@ def test_copying(create):
     p2 = p1.copy([l0id])
     assert (p1.layer(l0id).equals(p2.layer(l0id)))
 
+    p2 = p1.copy()
+    assert p1.equals(p2, ordered=True)
+    l1, l2 = p1.layer(layer1.LAYER_ID), p2.layer(layer1.LAYER_ID)
+    assert [n.ID for n in l1.top_scenes] == [n.ID for n in l2.top_scenes]
+    assert [n.ID for n in l1.top_linkages] == [n.ID for n in l2.top_linkages]
+    assert {n.ID: n.extra for n in p1.nodes.values()} == {n.ID: n.extra for n in p2.nodes.values()}
+    assert l1.next_id() == l2.next_id()
+
+
+
+def test_copying_some_layers():
+    p1 = PASSAGES[0]()
+    l1 = p1.layer(layer1.LAYER_ID)
+    core.Layer("2", p1)
+    node = l1.heads[0]
+    node.add("X", core.Node(ID="2.1", root=p1, tag="2"))  # into a Layer that is not copied
+    p2 = p1.copy([layer0.LAYER_ID, layer1.LAYER_ID])
+    assert [l.ID for l in p2.layers] == [layer0.LAYER_ID, layer1.LAYER_ID]
+    assert [e.child.ID for e in p2.by_id(node.ID)] == [e.child.ID for e in node if e.tag != "X"]
+    assert not p1.missing_nodes(p2, ignore_node=lambda n: n.layer.ID == "2")
 
 def test_iteration():
     p = basic()
@@ -177,3 +317,68 @@ def test_iteration():
     assert list(node21.iter(duplicates=True)) == [node21, node11, node12, node13, node11]
     assert list(node21.iter()) == [node21, node11, node12, node13]
     assert list(node22.iter(method="bfs", duplicates=True)) == [node22, node11, node12, node13, node13, node11]
+
+
+def test_ordering():
+    p = core.Passage("1")
+    l1 = core.Layer("1", p)
+    nodes = [core.Node(ID="1.%d" % i, root=p, tag=str(i)) for i in (3, 1, 2, 10)]
+    node3, node1, node2, node10 = nodes
+    assert l1.all == [node1, node2, node3, node10]
+    assert l1.heads == [node1, node2, node3, node10]
+    node10.add("test", node1)
+    node2.add("test", node3)
+    assert l1.heads == [node2, node10]
+    l1.orderkey = lambda x: -int(x.ID.split(".")[1])
+    assert l1.all == [node10, node3, node2, node1]
+    assert l1.heads == [node10, node2]
+    node2.remove(node3)
+    assert l1.heads == [node10, node3, node2]
+
+
+def test_id_orderkey():
+    p = core.Passage("1")
+    core.Layer("1", p)
+    core.Layer("10", p)
+    nodes = [core.Node(ID=ID, root=p, tag="x") for ID in ("1.100000", "10.1", "1.99999", "1.2")]
+    assert [n.ID for n in sorted(nodes, key=core.id_orderkey)] == ["1.2", "1.99999", "1.100000", "10.1"]
+    with pytest.raises(ValueError):
+        core.Node(ID="2.1", root=p, tag="x")
+    assert "2.1" not in p.nodes
+    edges = [nodes[0].add("test", nodes[2]), nodes[3].add("test", nodes[2]), nodes[3].add("test", nodes[0])]
+    assert [e.ID for e in sorted(edges, key=core.edge_id_orderkey)] == ["1.2->1.99999", "1.2->1.100000",
+                                                                          "1.100000->1.99999"]
+
+
+@pytest.mark.parametrize("create", PASSAGES)
+def test_pickle(create):
+    p1 = create()
+    p2 = pickle.loads(pickle.dumps(p1))
+    assert p1.equals(p2)
+    assert p1.ID == p2.ID
+    for node in p2.nodes.values():
+        assert not hasattr(node, "__dict__")
+        assert node.layer.ID == node.ID.split(core.Node.ID_SEPARATOR)[0]
+        assert node.extra == p1.by_id(node.ID).extra
+        for edge in node:
+            assert all(category._edge is edge for category in edge.categories)
+
+
+def test_frozen():
+    p = basic()
+    l1 = p.layer("1")
+    node11, node12, node13 = l1.all
+    p.frozen = True
+    with pytest.raises(core.FrozenPassageError):
+        node12.add("test", node11)
+    with pytest.raises(core.FrozenPassageError):
+        node13.attrib["node"] = False
+    with pytest.raises(core.FrozenPassageError):
+        node12[0].tag = "test3"
+    with p.trusted():
+        assert not p.frozen
+        node13.attrib["node"] = False
+        node12.remove(node13)
+    assert p.frozen
+    assert node13.attrib.copy() == {"node": False}
+    assert node12.children == [node11]
@@ -0,0 +1,139 @@
+"""Tests the frozen module functionality and correctness."""
+
+import pytest
+
+from ucca import convert, core, frozen, layer0, layer1
+from .conftest import PASSAGES, basic, l1_passage
+
+
+@pytest.mark.parametrize("create", PASSAGES)
+def test_thaw(create):
+    p = create()
+    f = frozen.freeze(p)
+    assert f.frozen
+    p2 = f.thaw()
+    assert p.equals(p2, ordered=True)
+    assert convert.to_text(p) == convert.to_text(p2)
+    assert {n.ID: n.extra for n in p.nodes.values()} == {n.ID: n.extra for n in p2.nodes.values()}
+
+
+def test_thaw_custom_layers():
+    p = basic()
+    assert frozen.freeze(p).thaw().equals(p)
+
+
+@pytest.mark.parametrize("create", PASSAGES)
+def test_views(create):
+    p = create()
+    f = frozen.freeze(p)
+    assert [l.ID for l in f.layers] == [l.ID for l in p.layers]
+    for layer in p.layers:
+        assert [n.ID for n in f.layer(layer.ID).all] == [n.ID for n in layer.all]
+        assert [n.ID for n in f.layer(layer.ID).heads] == [n.ID for n in layer.heads]
+    for node in p.nodes.values():
+        fnode = f.by_id(node.ID)
+        assert fnode.tag == node.tag
+        assert dict(fnode.attrib) == node.attrib.copy()
+        assert fnode.layer.ID == node.layer.ID
+        assert [x.ID for x in fnode.iter()] == [x.ID for x in node.iter()]
+        assert [e.ID for e in fnode.incoming] == [e.ID for e in node.incoming]
+        for edge, fedge in zip(node, fnode):
+            assert fedge.ID == edge.ID
+            assert fedge.tags == edge.tags
+            assert dict(fedge.attrib) == edge.attrib.copy()
+            assert fedge.parent == fnode
+        if node.layer.ID == layer0.LAYER_ID:
+            assert (fnode.text, fnode.position, fnode.paragraph, fnode.para_pos, fnode.punct) == \
+                   (node.text, node.position, node.paragraph, node.para_pos, node.punct)
+        elif isinstance(node, layer1.FoundationalNode):
+            assert [x.ID for x in fnode.participants] == [x.ID for x in node.participants]
+            assert fnode.is_scene() == node.is_scene()
+            assert getattr(fnode.fparent, "ID", None) == getattr(node.fparent, "ID", None)
+            assert fnode.ftag == node.ftag
+            assert (fnode.start_position, fnode.end_position, fnode.discontiguous) == \
+                   (node.start_position, node.end_position, node.discontiguous)
+            assert [t.ID for t in fnode.get_terminals(punct=False, remotes=True)] == \
+                   [t.ID for t in node.get_terminals(punct=False, remotes=True)]
+    with pytest.raises(KeyError):
+        f.by_id("1.1000")
+
+
+def test_arrays():
+    p = l1_passage()
+    f = frozen.freeze(p)
+    l1 = f.layer(layer1.LAYER_ID)
+    num_edges = sum(len(n) for n in p.nodes.values())
+    assert len(f.node_tag) == len(p.nodes)
+    assert len(f.edge_child) == len(f.edge_parent) == len(f.parent_edges) == num_edges
+    assert f.edge_remote.sum() == sum(bool(e.attrib.get("remote")) for n in p.nodes.values() for e in n)
+    scenes = (f.edge_tag == f.code(layer1.EdgeTags.ParallelScene)).sum()
+    assert scenes == len(p.layer(layer1.LAYER_ID).heads[0].parallel_scenes)
+    assert f.code("no such tag") == -1
+    assert (f.node_layer[l1.start:l1.stop] == f.layers.index(l1)).all()
+
+
+@pytest.mark.parametrize("create", PASSAGES)
+def test_save_load(create, tmp_path):
+    p = create()
+    filename = str(tmp_path / ("passage" + frozen.SUFFIX))
+    frozen.save(p, filename)
+    f = frozen.load(filename)
+    assert f.ID == p.ID
+    assert (f.edge_child == frozen.freeze(p).edge_child).all()
+    assert f.thaw().equals(p, ordered=True)
+
+
+def test_terminal_attrib_keys(tmp_path):
+    p = convert.file2passage("test_files/standard3.xml")  # attributes read in the order of the XML file
+    f = frozen.freeze(p)
+    terminals = p.layer(layer0.LAYER_ID).all
+    assert f.terminal_attrib_keys == tuple(terminals[0].attrib) != frozen.TERMINAL_ATTRIB_KEYS
+    assert not any(f.node_layer[i] == 0 for i in f.node_attribs)  # all stored in the arrays
+    filename = str(tmp_path / ("passage" + frozen.SUFFIX))
+    frozen.save(f, filename)
+    p2 = frozen.load_passage(filename)
+    assert p2.equals(p, ordered=True)
+    assert [list(t.attrib.items()) for t in p2.layer(layer0.LAYER_ID).all] == \
+           [list(t.attrib.items()) for t in terminals]
+    data = f.to_bytes()
+    keys = data[data.index(b'"terminal_attrib_keys"'):data.index(b'"arrays"')]
+    old = frozen.FrozenPassage.from_buffer(data.replace(keys, b" " * len(keys)))  # written before it was added
+    assert old.terminal_attrib_keys == frozen.TERMINAL_ATTRIB_KEYS
+    assert dict(old.by_id(terminals[0].ID).attrib) == terminals[0].attrib.copy()
+    with pytest.raises(ValueError):
+        frozen.FrozenPassage.from_buffer(data.replace(b'"paragraph_position"', b'"paragraph_positio" '))
+
+
+def test_compact_files(tmp_path):
+    p = l1_passage()
+    for suffix in (frozen.SUFFIX, ".pickle"):  # compact files are recognized by content, not only by extension
+        filename = str(tmp_path / ("passage" + suffix))
+        convert.passage2file(p, filename, compact=True)
+        with open(filename, "rb") as f:
+            assert frozen.is_frozen(f.read(len(frozen.MAGIC)))
+        p2 = convert.file2passage(filename)
+        assert p.equals(p2, ordered=True)
+        assert {n.ID: n.extra for n in p.nodes.values()} == {n.ID: n.extra for n in p2.nodes.values()}
+
+
+def test_from_buffer_errors():
+    data = frozen.freeze(l1_passage()).to_bytes()
+    assert frozen.is_frozen(data)
+    for invalid in (b"", b"<root/>", data[:len(frozen.MAGIC) + 4], data[:frozen.PREAMBLE.size + 10],
+                    data.replace(b'"arrays"', b'"arrayz"')):
+        with pytest.raises(ValueError):
+            frozen.FrozenPassage.from_buffer(invalid)
+    newer = frozen.PREAMBLE.pack(frozen.MAGIC, frozen.VERSION + 1, 0, 0)
+    with pytest.raises(ValueError, match="version"):
+        frozen.FrozenPassage.from_buffer(newer + data[frozen.PREAMBLE.size:])
+
+
+def test_to_bytes_unknown_class():
+    class CustomNode(core.Node):
+        __slots__ = ()
+
+    p = core.Passage("1")
+    core.Layer("1", p)
+    CustomNode("1.1", p, tag="X")  # cannot be read back by name without importing arbitrary code
+    with pytest.raises(ValueError):
+        frozen.freeze(p).to_bytes()
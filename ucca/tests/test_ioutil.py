@@ -1,9 +1,10 @@
+import io
 import os
 import pytest
 import random
 from glob import glob
 
-from ucca import layer0, layer1, convert, ioutil, diffutil
+from ucca import layer0, layer1, convert, ioutil, diffutil, frozen
 from .conftest import loaded, multi_sent, discontiguous, l1_passage
 
 """Tests the ioutil module functions and classes."""
@@ -88,3 +89,22 @@ def test_shuffle_passages():
     random.shuffle(passages)
     assert len(files) == len(passages)
     _test_passages(passages)
+
+
+def _terminal_texts(passage):
+    return [t.text for t in passage.layer(layer0.LAYER_ID).all], passage.frozen
+
+
+@pytest.mark.parametrize("thaw", (False, True))
+def test_map_passages(thaw):
+    passages = [loaded(), multi_sent(), discontiguous(), l1_passage()]
+    results = list(ioutil.map_passages(_terminal_texts, passages, processes=2, thaw=thaw))
+    assert results == [([t.text for t in p.layer(layer0.LAYER_ID).all], not thaw) for p in passages]
+
+
+def test_write_frozen_passages():
+    f = io.BytesIO()
+    locations = list(ioutil._write_frozen_passages(f, [loaded(), multi_sent(), l1_passage()]))
+    assert locations[0][0] == 0
+    for (offset, length), (next_offset, _) in zip(locations, locations[1:]):
+        assert next_offset == offset + length + (-length % frozen.ALIGNMENT)  # no more padding than needed
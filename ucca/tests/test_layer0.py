@@ -1,3 +1,5 @@
+import pytest
+
 from ucca import core, layer0
 
 """Tests module layer0 functionality."""
@@ -47,7 +49,9 @@ def test_terminals():
     assert not (terms[0] == terms[2])
     assert not (terms[1] == terms[2])
     assert terms[0] == terms[0]
+    assert not (terms[0] == equal_term)  # not in the same passage
     assert terms[0].equals(equal_term)
+    assert len({terms[0], terms[1], terms[0]}) == 2
     assert not (terms[1].equals(unequal_term))
     assert p.copy(layer0.LAYER_ID).equals(p)
     assert p_copy.copy(layer0.LAYER_ID).equals(p_copy)
@@ -63,3 +67,23 @@ def test_layer0():
     assert [t.para_pos for t in l0.all] == [1, 1, 2]
     assert l0.words == (t1, t3)
     assert p.copy(layer0.LAYER_ID).equals(p)
+    t1._attrib["text"] = "one"  # changing the text does not change the hash, so the Terminal is still found
+    assert t1 in l0._head_set
+
+
+def test_add_terminals():
+    p = core.Passage("1")
+    l0 = layer0.Layer0(p)
+    t1 = l0.add_terminal(text="1", punct=False)
+    terms = l0.add_terminals(["2", "3", "4", "5"], [False, True, False, False], [1, 1, 2, 2])
+    assert l0.all == [t1] + terms
+    assert [t.ID for t in terms] == ["0.2", "0.3", "0.4", "0.5"]
+    assert [t.para_pos for t in l0.all] == [1, 2, 3, 1, 2]
+    assert [t.paragraph for t in l0.all] == [1, 1, 1, 2, 2]
+    assert l0.words == (t1, terms[0], terms[2], terms[3])
+    assert l0.add_terminals(["6"], [True])[0].para_pos == 1
+    for texts, puncts, paragraphs in ((["7", "8"], [False], None), (["7"], [False, True], None),
+                                      (iter(["7", "8"]), iter([False, False]), [1])):
+        with pytest.raises(ValueError):  # rather than adding only as many Terminals as the shortest
+            l0.add_terminals(texts, puncts, paragraphs)
+    assert len(l0.all) == 6
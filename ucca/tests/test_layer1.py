@@ -1,4 +1,6 @@
-from ucca import layer1
+import pickle
+
+from ucca import convert, layer0, layer1
 from .conftest import l1_passage, discontiguous
 
 """Tests layer1 module functionality and correctness."""
@@ -43,6 +45,22 @@ def test_fnodes():
 
     assert ps1.fparent == head
     assert d2.fparent == ps2
+    assert d2.ftag == layer1.EdgeTags.Adverbial
+
+    # The fparent follows changes to the incoming edges, their attributes and the parents' tags
+    primary, remote = [e for e in d2.incoming if e.parent == ps2][0], [e for e in d2.incoming if e.parent == ps1][0]
+    primary.attrib["remote"] = True
+    assert d2.fparent is None
+    remote.attrib["remote"] = False
+    assert d2.fparent == ps1
+    assert d2.ftag == layer1.EdgeTags.Participant
+    ps1.tag = layer1.NodeTags.Linkage
+    assert d2.fparent is None
+    ps1.tag = layer1.NodeTags.Foundational
+    ps1.remove(d2)
+    assert d2.fparent is None
+    ps2.add(layer1.EdgeTags.Adverbial, d2)
+    assert d2.fparent == ps2
 
 
 def test_layer1():
@@ -65,6 +83,15 @@ def test_layer1():
     assert l1.top_scenes == [ps1, ps2, ps3]
     assert l1.top_linkages == [lkg1, lkg2]
 
+    # A scene embedded in scene #1 becomes a top scene once scene #1 is not a scene
+    embedded = l1.add_fnode(ps1, layer1.EdgeTags.Participant)
+    l1.add_fnode(embedded, layer1.EdgeTags.Process)
+    assert l1.top_scenes == [ps1, ps2, ps3]
+    p_edge.tag = layer1.EdgeTags.Participant
+    assert l1.top_scenes == [ps2, ps3, embedded]
+    embedded.destroy()
+    assert l1.top_scenes == [ps2, ps3]
+
 
 def test_str():
     p = l1_passage()
@@ -135,3 +162,75 @@ def test_discontiguous():
     assert ps3.get_sequences() == [(15, 17)]
     assert a3.get_sequences() == [(16, 17)]
     assert not p3.get_sequences()
+
+
+def test_bulk_build():
+    """Tests that a Passage built in bulk ends up with the same derived data as one built incrementally"""
+    p = l1_passage()
+    p1 = convert.from_standard(convert.to_standard(p))
+    for l, l1 in ((p.layer(ID), p1.layer(ID)) for ID in ("0", "1")):
+        assert [x.ID for x in l.heads] == [x.ID for x in l1.heads]
+        assert [x.ID for x in l.all] == [x.ID for x in l1.all]
+    l, l1 = p.layer("1"), p1.layer("1")
+    assert [x.ID for x in l.top_scenes] == [x.ID for x in l1.top_scenes]
+    assert [x.ID for x in l.top_linkages] == [x.ID for x in l1.top_linkages]
+    ps = l1.top_scenes[0]
+    p_edge = [e for e in ps if e.tag == layer1.EdgeTags.Process][0]
+    p_edge.tag = layer1.EdgeTags.Participant  # Incremental updates still work after the bulk build
+    assert ps not in l1.top_scenes
+    assert p.equals(convert.from_standard(convert.to_standard(p)))
+
+
+def test_next_id():
+    p = l1_passage()
+    l1 = p.layer("1")
+    ids = {x.ID for x in l1.all}
+    next_id = l1.next_id()
+    assert next_id not in ids
+    assert next_id == l1.next_id()  # Not allocated until a node is added
+    node = l1.add_fnode(None, layer1.EdgeTags.Participant)
+    assert node.ID == next_id
+    node.destroy()
+    assert l1.add_fnode(None, layer1.EdgeTags.Participant).ID not in ids | {next_id}  # IDs are not reused
+    assert pickle.loads(pickle.dumps(p)).layer("1").next_id() == l1.next_id()
+
+
+def test_terminals_cache():
+    """Tests that the cached terminals of FNodes are updated when the passage changes"""
+    p = l1_passage()
+    l0 = p.layer("0")
+    l1 = p.layer("1")
+    terms = l0.all
+    head = l1.heads[0]
+    link1, ps1, ps2, link2, ps3, punct2 = head.children
+    p1, a1, punct1 = [x.child for x in ps1 if not x.attrib.get("remote")]
+    assert ps1.get_terminals() == terms[1:10]
+    assert ps1.get_terminals(punct=False, remotes=True) == terms[1:9] + terms[14:15]
+
+    a1.remove(terms[8])  # Changes propagate to ancestors
+    assert ps1.get_terminals() == terms[1:8] + terms[9:10]
+    assert ps1.end_position == 10
+    assert head.get_terminals(punct=False) == terms[:8] + terms[10:19]
+    a1.add(layer1.EdgeTags.Terminal, terms[8])
+    assert ps1.get_terminals() == terms[1:10]
+
+    remote = [e for e in ps1 if e.attrib.get("remote")][0]
+    remote.attrib["remote"] = False
+    assert ps1.get_terminals() == terms[1:10] + terms[14:15]
+    assert ps1.discontiguous
+    remote.attrib["remote"] = True
+    assert not ps1.discontiguous
+
+    assert ps1.get_terminals(punct=False) == terms[1:9]
+    terms[1].tag = layer0.NodeTags.Punct  # Changing terminal tags affects which terminals count as punctuation
+    assert ps1.get_terminals(punct=False) == terms[2:9]
+    terms[1].tag = layer0.NodeTags.Word
+
+    punct_term = punct1.children[0]  # Changes to PunctNodes propagate to their ancestors too
+    assert ps1.get_terminals() == terms[1:10]
+    punct1.remove(punct_term)
+    assert ps1.get_terminals() == terms[1:9]
+    assert ps1.end_position == 9
+    punct1.add(layer1.EdgeTags.Terminal, punct_term)
+    assert ps1.get_terminals() == terms[1:10]
+    assert [t.ID for t in pickle.loads(pickle.dumps(p)).layer("1").heads[0].get_terminals()] == [t.ID for t in terms]
@@ -91,7 +91,7 @@ class NodeValidator:
             yield "Unit (%s) with remote parents but no primary parents" % self.node_id
         for edge in self.node:
             if (ETags.Punctuation in edge.tags) != (edge.child.tag == L1Tags.Punctuation):
-                yield "%s edge (%s) with %s child" % (edge.tags, edge, edge.child.tag)
+                yield "%s edge (%s) with %s child" % (list(edge.tags), edge, edge.child.tag)
             # FN parent of Punctuation is disallowed unless the FN is unanalyzable
             if (self.node.tag == L1Tags.Foundational) and (edge.child.tag == L0Tags.Punct) and \
                     not len(self.node.terminals) + len(self.node.punctuation) == len(self.node.children) > 1 or \